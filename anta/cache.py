@@ -0,0 +1,465 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""Backends of the device command cache: a bounded memory cache and a disk cache persisting the command outputs across ANTA runs."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cache
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from aiocache.base import BaseCache
+from aiocache.serializers import JsonSerializer, NullSerializer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Name of the SQLite database file in the cache directory
+CACHE_FILENAME = "anta-cache.sqlite3"
+# Default maximum size in bytes of the command outputs stored in the disk cache
+DEFAULT_CACHE_MAX_SIZE = 100 * 1024 * 1024
+
+
+@dataclass
+class _Database:
+    """SQLite database of a disk cache, shared by all the devices of the current process."""
+
+    connection: sqlite3.Connection
+    # Serialize the accesses to the connection from the threads running the queries
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # Total size in bytes of the values, computed on first use then updated by the caches of the current process
+    size: int | None = None
+
+
+@cache
+def _connect(path: Path, pid: int) -> _Database:  # noqa: ARG001  pid is part of the cache key, a connection must not be shared with a forked process
+    """Return the SQLite database of a disk cache, shared by all the devices of the current process."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Autocommit mode, the database can be shared with other ANTA processes
+    db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, expires REAL, accessed REAL NOT NULL)")
+    return _Database(db)
+
+
+class SQLiteCache(BaseCache):
+    """aiocache backend storing the values in a SQLite database, to keep the command outputs across ANTA runs.
+
+    The values are serialized in JSON. When the total size of the values exceeds `max_size`,
+    the expired values then the least recently used values are evicted.
+    The database can be shared by several devices, with their own namespace, and by several ANTA processes.
+    The queries run in a thread to not block the event loop.
+    Raw commands are methods of the `sqlite3.Connection` of the database, e.g. `await cache.raw("execute", "SELECT key FROM cache")`.
+
+    Attributes
+    ----------
+    path : Path
+        Path of the SQLite database.
+    max_size : int | None
+        Maximum size in bytes of the values stored in the database. None means no limit.
+    evictions : int
+        Number of values evicted by this cache to honor `max_size`.
+    """
+
+    NAME = "sqlite"
+
+    def __init__(self, path: Path, max_size: int | None = DEFAULT_CACHE_MAX_SIZE, **kwargs: Any) -> None:  # noqa: ANN401
+        """Initialize a SQLiteCache.
+
+        Parameters
+        ----------
+        path
+            Path of the SQLite database, created if it does not exist.
+        max_size
+            Maximum size in bytes of the values stored in the database. None means no limit.
+        **kwargs
+            Keyword arguments of `aiocache.base.BaseCache`, the serializer is always a `JsonSerializer`.
+        """
+        kwargs["serializer"] = JsonSerializer()
+        super().__init__(**kwargs)
+        self.path = path
+        self.max_size = max_size
+        self.evictions = 0
+
+    async def _run(self, query: Callable[..., T], *args: Any) -> T:  # noqa: ANN401
+        """Run a query function with the database and the given arguments in a thread."""
+        db = _connect(self.path, os.getpid())
+
+        def run() -> T:
+            with db.lock:
+                return query(db, *args)
+
+        return await asyncio.to_thread(run)
+
+    def _build_key(self, key: str, namespace: str | None = None) -> str:
+        namespace = namespace if namespace is not None else self.namespace
+        return f"{namespace}:{key}" if namespace is not None else key
+
+    async def _get(self, key: str, encoding: str = "utf-8", _conn: Any = None) -> str | None:  # noqa: ARG002, ANN401
+        return await self._run(self._select, key)
+
+    async def _gets(self, key: str, encoding: str = "utf-8", _conn: Any = None) -> str | None:  # noqa: ANN401
+        return await self._get(key, encoding=encoding, _conn=_conn)
+
+    async def _multi_get(self, keys: list[str], encoding: str = "utf-8", _conn: Any = None) -> list[str | None]:  # noqa: ARG002, ANN401
+        return await self._run(lambda db: [self._select(db, key) for key in keys])
+
+    async def _set(self, key: str, value: str, ttl: float | None = None, _cas_token: Any = None, _conn: Any = None) -> bool:  # noqa: ANN401
+        return await self._run(self._insert, key, value, ttl, _cas_token)
+
+    async def _multi_set(self, pairs: list[tuple[str, str]], ttl: float | None = None, _conn: Any = None) -> bool:  # noqa: ANN401
+        for key, value in pairs:
+            await self._set(key, value, ttl=ttl)
+        return True
+
+    async def _add(self, key: str, value: str, ttl: float | None = None, _conn: Any = None) -> bool:  # noqa: ANN401
+        if await self._exists(key):
+            msg = f"Key {key} already exists, use .set to update the value"
+            raise ValueError(msg)
+        return await self._set(key, value, ttl=ttl)
+
+    async def _exists(self, key: str, _conn: Any = None) -> bool:  # noqa: ANN401
+        return await self._run(lambda db: self._select(db, key, touch=False) is not None)
+
+    async def _increment(self, key: str, delta: int, _conn: Any = None) -> int:  # noqa: ANN401
+        return await self._run(self._add_delta, key, delta)
+
+    async def _expire(self, key: str, ttl: float | None, _conn: Any = None) -> bool:  # noqa: ANN401
+        def expire(db: _Database) -> bool:
+            return db.connection.execute("UPDATE cache SET expires = ? WHERE key = ?", (time.time() + ttl if ttl else None, key)).rowcount > 0
+
+        return await self._run(expire)
+
+    async def _delete(self, key: str, _conn: Any = None) -> int:  # noqa: ANN401
+        return await self._run(self._remove, key, None)
+
+    async def _clear(self, namespace: str | None = None, _conn: Any = None) -> bool:  # noqa: ANN401
+        def clear(db: _Database) -> bool:
+            if namespace is None:
+                db.connection.execute("DELETE FROM cache")
+            else:
+                prefix = f"{namespace}:"
+                db.connection.execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+            # Computed again on next use
+            db.size = None
+            return True
+
+        return await self._run(clear)
+
+    async def _raw(self, command: str, *args: Any, encoding: str = "utf-8", _conn: Any = None, **kwargs: Any) -> Any:  # noqa: ARG002, ANN401
+        def raw(db: _Database) -> Any:  # noqa: ANN401
+            # e.g. `raw("execute", "SELECT key FROM cache")`, the rows of a query are fetched before releasing the connection
+            result = getattr(db.connection, command)(*args, **kwargs)
+            return result.fetchall() if isinstance(result, sqlite3.Cursor) else result
+
+        return await self._run(raw)
+
+    async def _redlock_release(self, key: str, value: str) -> int:
+        return await self._run(self._remove, key, value)
+
+    def _select(self, db: _Database, key: str, *, touch: bool = True) -> str | None:
+        """Return the value of a key if it has not expired, marking it as the most recently used value if `touch` is set."""
+        now = time.time()
+        row = db.connection.execute("SELECT value FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)", (key, now)).fetchone()
+        if row is None:
+            return None
+        if touch:
+            db.connection.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        return str(row[0])
+
+    def _insert(self, db: _Database, key: str, value: str, ttl: float | None, cas_token: Any) -> bool:  # noqa: ANN401
+        """Store the value of a key, then evict values if the total size of the values exceeds `max_size`."""
+        if cas_token is not None and cas_token != self._select(db, key):
+            return False
+        now = time.time()
+        size = len(value.encode())
+        previous = db.connection.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+        db.connection.execute(
+            "INSERT OR REPLACE INTO cache (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+            (key, value, size, now + ttl if ttl else None, now),
+        )
+        if db.size is not None:
+            db.size += size - (previous[0] if previous is not None else 0)
+        self._evict(db)
+        return True
+
+    def _add_delta(self, db: _Database, key: str, delta: int) -> int:
+        """Increment the integer value of a key by `delta`, a missing key is created with `delta` as value."""
+        value = self._select(db, key)
+        try:
+            number = delta if value is None else int(json.loads(value)) + delta
+        except (TypeError, ValueError):
+            msg = "Value is not an integer"
+            raise TypeError(msg) from None
+        row = db.connection.execute("SELECT expires FROM cache WHERE key = ?", (key,)).fetchone()
+        expires = row[0] if value is not None and row is not None else None
+        self._insert(db, key, json.dumps(number), expires - time.time() if expires is not None else None, None)
+        return number
+
+    def _remove(self, db: _Database, key: str, value: str | None) -> int:
+        """Remove a key, only if its value is `value` when set, returning the number of removed keys."""
+        row = db.connection.execute("SELECT value, size FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or (value is not None and row[0] != value):
+            return 0
+        db.connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+        if db.size is not None:
+            db.size -= row[1]
+        return 1
+
+    def _evict(self, db: _Database) -> None:
+        """Evict the expired values then the least recently used values until the total size of the values is lower than `max_size`."""
+        if self.max_size is None:
+            return
+        if db.size is None:
+            (db.size,) = db.connection.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()
+        if db.size <= self.max_size:
+            return
+        db.connection.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+        keys = []
+        # The database can be shared with other ANTA processes, the total size is computed again before evicting
+        (total,) = db.connection.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()
+        for key, size in db.connection.execute("SELECT key, size FROM cache ORDER BY accessed").fetchall():
+            if total <= self.max_size:
+                break
+            keys.append((key,))
+            total -= size
+        db.connection.executemany("DELETE FROM cache WHERE key = ?", keys)
+        db.size = total
+        self.evictions += len(keys)
+        logger.debug("Evicted %s value(s) from the disk cache %s", len(keys), self.path)
+
+
+class CacheBudget:
+    """Limits shared by several `LRUMemoryCache`, typically the memory caches of all the devices of an inventory.
+
+    When a limit is exceeded, the least recently used values of all the caches sharing the budget are evicted.
+
+    Attributes
+    ----------
+    max_entries : int | None
+        Maximum number of values stored in the caches. None means no limit.
+    max_size : int | None
+        Maximum size in bytes of the values stored in the caches. None means no limit.
+    size : int
+        Size in bytes of the values stored in the caches, only computed when `max_size` is set.
+    """
+
+    def __init__(self, max_entries: int | None = None, max_size: int | None = None) -> None:
+        """Initialize a CacheBudget.
+
+        Parameters
+        ----------
+        max_entries
+            Maximum number of values stored in the caches. None means no limit.
+        max_size
+            Maximum size in bytes of the values stored in the caches. None means no limit.
+        """
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+        self._lru: OrderedDict[tuple[int, str], tuple[LRUMemoryCache, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of values stored in the caches."""
+        return len(self._lru)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Return the limits only, the caches sharing the budget are not pickled with it."""
+        return {"max_entries": self.max_entries, "max_size": self.max_size}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore a budget without any value."""
+        self.__init__(**state)  # type: ignore[misc]
+
+    def add(self, memory_cache: LRUMemoryCache, key: str, size: int) -> None:
+        """Account for a value stored in a cache, then evict the least recently used values if a limit is exceeded."""
+        self._lru[(id(memory_cache), key)] = (memory_cache, size)
+        self.size += size
+        while (self.max_entries is not None and len(self._lru) > self.max_entries) or (self.max_size is not None and self.size > self.max_size):
+            (_, lru_key), (lru_cache, _) = next(iter(self._lru.items()))
+            lru_cache.evict(lru_key)
+
+    def touch(self, memory_cache: LRUMemoryCache, key: str) -> None:
+        """Mark a value of a cache as the most recently used."""
+        self._lru.move_to_end((id(memory_cache), key))
+
+    def remove(self, memory_cache: LRUMemoryCache, key: str) -> None:
+        """Stop accounting for a value removed from a cache."""
+        if (entry := self._lru.pop((id(memory_cache), key), None)) is not None:
+            self.size -= entry[1]
+
+
+class LRUMemoryCache(BaseCache):
+    """aiocache backend storing the values in memory, evicting the least recently used values when a limit is exceeded.
+
+    The values are stored as is. Their size is the length of their JSON serialization,
+    only computed when a size limit is set on the cache or on its budget.
+    Raw commands are methods of the `OrderedDict` of the values and their size, e.g. `await cache.raw("get", "key")`.
+
+    Attributes
+    ----------
+    max_entries : int | None
+        Maximum number of values stored in the cache. None means no limit.
+    max_size : int | None
+        Maximum size in bytes of the values stored in the cache. None means no limit.
+    budget : CacheBudget | None
+        Limits shared with other caches.
+    size : int
+        Size in bytes of the values stored in the cache, only computed when a size limit is set.
+    evictions : int
+        Number of values evicted by this cache to honor its limits or the limits of its budget.
+    """
+
+    NAME = "lru-memory"
+
+    def __init__(self, max_entries: int | None = None, max_size: int | None = None, budget: CacheBudget | None = None, **kwargs: Any) -> None:  # noqa: ANN401
+        """Initialize a LRUMemoryCache.
+
+        Parameters
+        ----------
+        max_entries
+            Maximum number of values stored in the cache. None means no limit.
+        max_size
+            Maximum size in bytes of the values stored in the cache. None means no limit.
+        budget
+            Limits shared with other caches.
+        **kwargs
+            Keyword arguments of `aiocache.base.BaseCache`, the serializer is always a `NullSerializer`.
+        """
+        kwargs["serializer"] = NullSerializer()
+        super().__init__(**kwargs)
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.budget = budget
+        self.size = 0
+        self.evictions = 0
+        # Values and their size, from the least to the most recently used
+        self._values: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self._handlers: dict[str, asyncio.TimerHandle] = {}
+
+    def __len__(self) -> int:
+        """Return the number of values stored in the cache."""
+        return len(self._values)
+
+    def _size_of(self, value: Any) -> int:  # noqa: ANN401
+        # The size is only computed when a size limit is set
+        if self.max_size is None and (self.budget is None or self.budget.max_size is None):
+            return 0
+        return len(value) if isinstance(value, str) else len(json.dumps(value, default=str))
+
+    async def _get(self, key: str, encoding: str = "utf-8", _conn: Any = None) -> Any:  # noqa: ARG002, ANN401
+        if (entry := self._values.get(key)) is None:
+            return None
+        self._values.move_to_end(key)
+        if self.budget is not None:
+            self.budget.touch(self, key)
+        return entry[0]
+
+    async def _gets(self, key: str, encoding: str = "utf-8", _conn: Any = None) -> Any:  # noqa: ANN401
+        return await self._get(key, encoding=encoding, _conn=_conn)
+
+    async def _multi_get(self, keys: list[str], encoding: str = "utf-8", _conn: Any = None) -> list[Any]:  # noqa: ANN401
+        return [await self._get(key, encoding=encoding, _conn=_conn) for key in keys]
+
+    async def _set(self, key: str, value: Any, ttl: float | None = None, _cas_token: Any = None, _conn: Any = None) -> bool:  # noqa: ANN401
+        if _cas_token is not None and _cas_token != self._values.get(key, (None,))[0]:
+            return False
+        self._remove(key)
+        size = self._size_of(value)
+        self._values[key] = (value, size)
+        self.size += size
+        if ttl:
+            self._handlers[key] = asyncio.get_running_loop().call_later(ttl, self._remove, key)
+        while (self.max_entries is not None and len(self._values) > self.max_entries) or (self.max_size is not None and self.size > self.max_size):
+            self.evict(next(iter(self._values)))
+        if self.budget is not None and key in self._values:
+            self.budget.add(self, key, size)
+        return True
+
+    async def _multi_set(self, pairs: list[tuple[str, Any]], ttl: float | None = None, _conn: Any = None) -> bool:  # noqa: ANN401
+        for key, value in pairs:
+            await self._set(key, value, ttl=ttl)
+        return True
+
+    async def _add(self, key: str, value: Any, ttl: float | None = None, _conn: Any = None) -> bool:  # noqa: ANN401
+        if key in self._values:
+            msg = f"Key {key} already exists, use .set to update the value"
+            raise ValueError(msg)
+        return await self._set(key, value, ttl=ttl)
+
+    async def _exists(self, key: str, _conn: Any = None) -> bool:  # noqa: ANN401
+        return key in self._values
+
+    async def _expire(self, key: str, ttl: float | None, _conn: Any = None) -> bool:  # noqa: ANN401
+        if key not in self._values:
+            return False
+        if (handle := self._handlers.pop(key, None)) is not None:
+            handle.cancel()
+        if ttl:
+            self._handlers[key] = asyncio.get_running_loop().call_later(ttl, self._remove, key)
+        return True
+
+    async def _delete(self, key: str, _conn: Any = None) -> int:  # noqa: ANN401
+        return self._remove(key)
+
+    async def _clear(self, namespace: str | None = None, _conn: Any = None) -> bool:  # noqa: ANN401
+        for key in list(self._values):
+            if namespace is None or key.startswith(namespace):
+                self._remove(key)
+        return True
+
+    async def _increment(self, key: str, delta: int, _conn: Any = None) -> int:  # noqa: ANN401
+        value = await self._get(key)
+        try:
+            number = delta if value is None else int(value) + delta
+        except (TypeError, ValueError):
+            msg = "Value is not an integer"
+            raise TypeError(msg) from None
+        # The expiration of the value is kept
+        handle = self._handlers.pop(key, None)
+        await self._set(key, number)
+        if handle is not None:
+            if key in self._values:
+                self._handlers[key] = handle
+            else:
+                handle.cancel()
+        return number
+
+    async def _raw(self, command: str, *args: Any, encoding: str = "utf-8", _conn: Any = None, **kwargs: Any) -> Any:  # noqa: ARG002, ANN401
+        # Like `aiocache.SimpleMemoryCache`, the limits of the cache are not enforced for the values modified by raw commands
+        return getattr(self._values, command)(*args, **kwargs)
+
+    async def _redlock_release(self, key: str, value: Any) -> int:  # noqa: ANN401
+        if self._values.get(key, (None,))[0] != value:
+            return 0
+        return self._remove(key)
+
+    def _remove(self, key: str) -> int:
+        """Remove a value from the cache, returning the number of removed values."""
+        if (entry := self._values.pop(key, None)) is None:
+            return 0
+        self.size -= entry[1]
+        if (handle := self._handlers.pop(key, None)) is not None:
+            handle.cancel()
+        if self.budget is not None:
+            self.budget.remove(self, key)
+        return 1
+
+    def evict(self, key: str) -> None:
+        """Evict a value from the cache to honor a limit."""
+        if self._remove(key):
+            self.evictions += 1
+            logger.debug("Evicted %s from the memory cache %s", key, self.namespace)
@@ -5,27 +5,33 @@
 
 from __future__ import annotations
 
+import hashlib
 import importlib
 import logging
 import math
+import os
+import pickle
+import stat
+import sys
 from collections import defaultdict
 from inspect import isclass
 from itertools import chain
-from json import load as json_load
+from json import loads as json_loads
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal, Optional, Union
 from warnings import warn
 
+from pydantic import VERSION as PYDANTIC_VERSION
 from pydantic import BaseModel, ConfigDict, RootModel, ValidationError, ValidationInfo, field_validator, model_serializer, model_validator
 from pydantic.types import ImportString
 from pydantic_core import PydanticCustomError
 from yaml import YAMLError, safe_dump, safe_load
 
-from anta.logger import anta_log_exception
+from anta import __version__
+from anta.logger import anta_log_exception, exc_to_str
 from anta.models import AntaTest
 
 if TYPE_CHECKING:
-    import sys
     from types import ModuleType
 
     if sys.version_info >= (3, 11):
@@ -41,6 +47,106 @@ RawCatalogInput = dict[str, list[dict[str, Optional[dict[str, Any]]]]]
 # [ ( <AntaTest class>, <input_as AntaTest.Input or dict or None > ), ... ]
 ListAntaTestTuples = list[tuple[type[AntaTest], Optional[Union[AntaTest.Input, dict[str, Any]]]]]
 
+# Suffix of the compiled catalog files, see `AntaCatalog.compile()`
+COMPILED_CATALOG_SUFFIX = ".compiled"
+# Version of the compiled catalog format, to be bumped when the format changes
+COMPILED_CATALOG_VERSION = 1
+
+
+def compiled_catalog_path(filename: str | Path, compiled_dir: str | Path | None = None) -> Path:
+    """Return the path of the compiled form of a catalog file.
+
+    Parameters
+    ----------
+    filename
+        Path of the catalog file.
+    compiled_dir
+        Directory of the compiled catalogs. None means the compiled catalog is a hidden file next to the catalog file.
+
+    Returns
+    -------
+    Path
+        Path of the compiled catalog.
+    """
+    file = Path(filename)
+    if compiled_dir is None:
+        return file.with_name(f".{file.name}{COMPILED_CATALOG_SUFFIX}")
+    # Catalogs with the same name in different directories can share the directory of the compiled catalogs
+    # Ignoring S324 probable use of insecure hash function - sha1 is enough for our needs.
+    path_digest = hashlib.sha1(str(file.resolve()).encode()).hexdigest()[:16]  # noqa: S324
+    return Path(compiled_dir) / f"{file.name}-{path_digest}{COMPILED_CATALOG_SUFFIX}"
+
+
+def _compiled_header(digest: str, modules: set[str]) -> dict[str, Any]:
+    """Return the header of a compiled catalog, a compiled catalog is up to date if its header is unchanged.
+
+    The header identifies the content of the catalog file, the versions of the libraries and the modification times
+    of the Python modules of the tests: the test inputs models could have changed since the catalog has been compiled.
+    """
+    mtimes: dict[str, int | None] = {}
+    for name in sorted(modules):
+        file = getattr(importlib.import_module(name), "__file__", None)
+        mtimes[name] = Path(file).stat().st_mtime_ns if file is not None else None
+    return {
+        "version": COMPILED_CATALOG_VERSION,
+        "anta": __version__,
+        "pydantic": PYDANTIC_VERSION,
+        "python": list(sys.version_info[:2]),
+        "digest": digest,
+        "modules": mtimes,
+    }
+
+
+def _is_trusted(fd: int, directory: Path) -> bool:
+    """Return True if an open file is owned by the current user and if the file and its directory cannot be written by other users.
+
+    The directory can also be owned by root. Always True on platforms without file ownership, e.g. Windows.
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    uid = os.getuid()
+    file_stat = os.fstat(fd)
+    dir_stat = directory.stat()
+    return (
+        file_stat.st_uid == uid
+        and not file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+        and dir_stat.st_uid in (uid, 0)
+        and not dir_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    )
+
+
+def _load_compiled_catalog(path: Path, digest: str) -> list[AntaTestDefinition] | None:
+    """Load the tests of a compiled catalog, None if the compiled catalog does not exist, is not up to date or is not trusted.
+
+    Loading a compiled catalog can execute arbitrary code: it is only loaded if it is owned by the current user
+    and if neither the compiled catalog nor its directory can be written by other users.
+    """
+    try:
+        with path.open("rb") as f:
+            if not _is_trusted(f.fileno(), path.parent):
+                logger.warning(
+                    "Ignoring compiled catalog %s: it must be owned by the current user and its directory by the current user or root, "
+                    "both writable only by their owner",
+                    path,
+                )
+                return None
+            # Ignoring S301 pickle load of untrusted data - the compiled catalog is written by ANTA, owned by the current user and its use is opt-in.
+            header = pickle.load(f)  # noqa: S301
+            if not isinstance(header, dict) or header.get("digest") != digest or header != _compiled_header(digest, set(header["modules"])):
+                logger.info("Compiled catalog %s is not up to date", path)
+                return None
+            tests = pickle.load(f)  # noqa: S301
+    except FileNotFoundError:
+        logger.debug("Compiled catalog %s does not exist", path)
+        return None
+    except Exception as e:  # noqa: BLE001
+        # The Python modules of the tests may not be importable anymore or the compiled catalog may be corrupted.
+        # The catalog file is parsed instead.
+        logger.warning("Ignoring compiled catalog %s: %s", path, exc_to_str(e))
+        return None
+    logger.debug("Loaded %s tests from compiled catalog %s", len(tests), path)
+    return tests
+
 
 class AntaTestDefinition(BaseModel):
     """Define a test with its associated inputs.
@@ -269,6 +375,13 @@ class AntaCatalog:
     """Class representing an ANTA Catalog.
 
     It can be instantiated using its constructor or one of the static methods: `parse()`, `from_list()` or `from_dict()`
+
+    Attributes
+    ----------
+    digest : str | None
+        SHA-256 digest of the content of the catalog file. None if the catalog has not been parsed from a file.
+    compiled_path : Path | None
+        Path of the compiled form of the catalog file, see `compile()`. None if the catalog has not been parsed from a file.
     """
 
     def __init__(
@@ -296,6 +409,10 @@ class AntaCatalog:
             else:
                 self._filename = Path(filename)
 
+        # Set by `parse()`, see `compile()`
+        self.digest: str | None = None
+        self.compiled_path: Path | None = None
+
         self.indexes_built: bool
         self.tag_to_tests: defaultdict[str | None, set[AntaTestDefinition]]
         self._init_indexes()
@@ -327,7 +444,7 @@ class AntaCatalog:
         self._tests = value
 
     @staticmethod
-    def parse(filename: str | Path, file_format: Literal["yaml", "json"] = "yaml") -> AntaCatalog:
+    def parse(filename: str | Path, file_format: Literal["yaml", "json"] = "yaml", *, compiled: bool = False, compiled_dir: str | Path | None = None) -> AntaCatalog:
         """Create an AntaCatalog instance from a test catalog file.
 
         Parameters
@@ -336,6 +453,11 @@ class AntaCatalog:
             Path to test catalog YAML or JSON file.
         file_format
             Format of the file, either 'yaml' or 'json'.
+        compiled
+            Load the catalog from its compiled form if it is up to date, skipping the parsing and the validation of the catalog file.
+            Otherwise, the catalog file is parsed and compiled. See `compile()`.
+        compiled_dir
+            Directory of the compiled catalogs. None means the compiled catalog is a hidden file next to the catalog file.
 
         Returns
         -------
@@ -346,16 +468,75 @@ class AntaCatalog:
             message = f"'{file_format}' is not a valid format for an AntaCatalog file. Only 'yaml' and 'json' are supported."
             raise ValueError(message)
 
+        file: Path = filename if isinstance(filename, Path) else Path(filename)
         try:
-            file: Path = filename if isinstance(filename, Path) else Path(filename)
-            with file.open(encoding="UTF-8") as f:
-                data = safe_load(f) if file_format == "yaml" else json_load(f)
-        except (TypeError, YAMLError, OSError, ValueError) as e:
+            content = file.read_bytes()
+        except (TypeError, OSError) as e:
             message = f"Unable to parse ANTA Test Catalog file '{filename}'"
             anta_log_exception(e, message, logger)
             raise
+        digest = hashlib.sha256(f"{file_format}:".encode() + content).hexdigest()
+        compiled_path = compiled_catalog_path(file, compiled_dir)
 
-        return AntaCatalog.from_dict(data, filename=filename)
+        tests = _load_compiled_catalog(compiled_path, digest) if compiled else None
+        if tests is not None:
+            catalog = AntaCatalog(tests, filename=filename)
+        else:
+            try:
+                text = content.decode(encoding="UTF-8")
+                data = safe_load(text) if file_format == "yaml" else json_loads(text)
+            except (TypeError, YAMLError, ValueError) as e:
+                message = f"Unable to parse ANTA Test Catalog file '{filename}'"
+                anta_log_exception(e, message, logger)
+                raise
+            catalog = AntaCatalog.from_dict(data, filename=filename)
+        catalog.digest = digest
+        catalog.compiled_path = compiled_path
+        if compiled and tests is None:
+            try:
+                catalog.compile()
+            except OSError as e:
+                anta_log_exception(e, f"Unable to write the compiled catalog {compiled_path}", logger)
+        return catalog
+
+    def compile(self) -> Path:
+        """Write the compiled form of this catalog, a binary serialization of the validated tests.
+
+        While the catalog file, ANTA and the Python modules of the tests are unchanged, `AntaCatalog.parse()` loads the compiled catalog
+        instead of parsing and validating the catalog file. Loading a compiled catalog can execute arbitrary code, the compiled catalog is
+        only writable by its owner and `AntaCatalog.parse()` ignores the compiled catalogs not owned by the current user or writable by other users,
+        or in a directory writable by other users.
+
+        Returns
+        -------
+        Path
+            Path of the compiled catalog.
+
+        Raises
+        ------
+        ValueError
+            If this catalog has not been parsed from a file.
+        """
+        if self.digest is None or self.compiled_path is None:
+            msg = "Only a catalog parsed from a file can be compiled"
+            raise ValueError(msg)
+        path = self.compiled_path
+        # Only the owner can write a new directory of compiled catalogs, see `_load_compiled_catalog()`
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        header = _compiled_header(self.digest, {definition.test.__module__ for definition in self.tests})
+        # Write the compiled catalog atomically, it can be loaded by another ANTA process
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            # Only the owner can write the compiled catalog, see `_load_compiled_catalog()`
+            tmp_path.touch(mode=0o600)
+            with tmp_path.open("wb") as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(self.tests, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        logger.info("Compiled catalog %s in %s", self.filename, path)
+        return path
 
     @staticmethod
     def from_dict(data: RawCatalogInput, filename: str | Path | None = None) -> AntaCatalog:
@@ -18,6 +18,7 @@ from anta.cli.exec import _exec as exec_command
 from anta.cli.get import get as get_command
 from anta.cli.nrfu import nrfu as nrfu_command
 from anta.cli.utils import AliasedGroup, ExitCode
+from anta.cli.worker import worker as worker_command
 from anta.logger import Log, LogLevel, anta_log_exception, setup_logging
 
 logger = logging.getLogger(__name__)
@@ -56,6 +57,7 @@ anta.add_command(check_command)
 anta.add_command(exec_command)
 anta.add_command(get_command)
 anta.add_command(debug_command)
+anta.add_command(worker_command)
 
 
 def cli() -> None:
@@ -13,7 +13,8 @@ import click
 from rich.pretty import pretty_repr
 
 from anta.cli.console import console
-from anta.cli.utils import catalog_options
+from anta.cli.utils import ExitCode, catalog_options
+from anta.logger import anta_log_exception
 
 if TYPE_CHECKING:
     from anta.catalog import AntaCatalog
@@ -22,8 +23,23 @@ logger = logging.getLogger(__name__)
 
 
 @click.command
+@click.pass_context
 @catalog_options
-def catalog(catalog: AntaCatalog) -> None:
+@click.option(
+    "--compile",
+    "compile_catalog",
+    help="Compile the catalog, the compiled catalog is loaded instead of the catalog file by the commands run with `--catalog-compiled`.",
+    is_flag=True,
+    default=False,
+)
+def catalog(ctx: click.Context, catalog: AntaCatalog, *, compile_catalog: bool) -> None:
     """Check that the catalog is valid."""
     console.print(f"[bold][green]Catalog is valid: {catalog.filename}")
     console.print(pretty_repr(catalog.tests))
+    if compile_catalog:
+        try:
+            path = catalog.compile()
+        except OSError as e:
+            anta_log_exception(e, f"Unable to write the compiled catalog {catalog.compiled_path}", logger)
+            ctx.exit(ExitCode.USAGE_ERROR)
+        console.print(f"[bold][green]Catalog is compiled: {path}")
@@ -5,14 +5,22 @@
 
 from __future__ import annotations
 
+import tarfile
+import zipfile
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import click
 
 from anta.cli.nrfu import commands
-from anta.cli.utils import AliasedGroup, catalog_options, inventory_options
+from anta.cli.nrfu.utils import replay_inventory
+from anta.cli.utils import AliasedGroup, catalog_options, check_address, inventory_options
+from anta.distributed import DEFAULT_SHARD_SIZE, DEFAULT_WORKER_TIMEOUT, parse_address
+from anta.inventory import DEFAULT_CONNECT_CONCURRENCY
 from anta.result_manager import ResultManager
 from anta.result_manager.models import AntaTestStatus
+from anta.runner import DEFAULT_MAX_CONCURRENCY
+from anta.snapshot import Snapshot
 
 if TYPE_CHECKING:
     from anta.catalog import AntaCatalog
@@ -53,6 +61,35 @@ HIDE_STATUS: list[str] = list(AntaTestStatus)
 HIDE_STATUS.remove("unset")
 
 
+def _check_run_options(
+    ctx: click.Context, *, process_pool_size: int | None, workers: int, coordinator: str | None, token: str | None, record: Path | None, replay: Path | None
+) -> None:
+    """Check that the options of `anta nrfu` running the tests can be used together."""
+    if workers > 1 and process_pool_size is not None:
+        msg = "'--workers' cannot be used with '--process-pool-size'"
+        raise click.BadParameter(msg, ctx=ctx, param_hint="'--workers'")
+    if coordinator is not None and (workers > 1 or process_pool_size is not None):
+        msg = "'--coordinator' cannot be used with '--workers' or '--process-pool-size'"
+        raise click.BadParameter(msg, ctx=ctx, param_hint="'--coordinator'")
+    if coordinator is not None and not token and not isinstance(parse_address(coordinator), str):
+        msg = "'--token' is required to listen for workers on a TCP address"
+        raise click.BadParameter(msg, ctx=ctx, param_hint="'--token'")
+    if record is not None and (workers > 1 or coordinator is not None):
+        msg = "'--record' cannot be used with '--workers' or '--coordinator'"
+        raise click.BadParameter(msg, ctx=ctx, param_hint="'--record'")
+    if replay is not None and coordinator is not None:
+        msg = "'--replay' cannot be used with '--coordinator'"
+        raise click.BadParameter(msg, ctx=ctx, param_hint="'--replay'")
+
+
+def _open_snapshot(ctx: click.Context, replay: Path) -> Snapshot:
+    """Open the snapshot of the '--replay' option, closed when the command completes."""
+    try:
+        return ctx.with_resource(Snapshot(replay))
+    except (ValueError, OSError, tarfile.TarError, zipfile.BadZipFile) as e:
+        raise click.BadParameter(str(e), ctx=ctx, param_hint="'--replay'") from e
+
+
 @click.group(invoke_without_command=True, cls=IgnoreRequiredWithHelp)
 @click.pass_context
 @inventory_options
@@ -103,6 +140,106 @@ HIDE_STATUS.remove("unset")
     is_flag=True,
     default=False,
 )
+@click.option(
+    "--max-concurrency",
+    help="Maximum number of tests to run concurrently.",
+    type=click.IntRange(min=1),
+    show_envvar=True,
+    show_default=True,
+    default=DEFAULT_MAX_CONCURRENCY,
+)
+@click.option(
+    "--connect-concurrency",
+    help="Maximum number of devices connected concurrently before running the tests.",
+    type=click.IntRange(min=1),
+    show_envvar=True,
+    show_default=True,
+    default=DEFAULT_CONNECT_CONCURRENCY,
+)
+@click.option(
+    "--preload",
+    help="EOS command of the tests collected on each device when connecting to it, its output is cached and shared by all the tests using it. "
+    "Requires the cache. Can be provided multiple times.",
+    type=str,
+    show_envvar=True,
+    multiple=True,
+)
+@click.option(
+    "--process-pool-size",
+    help="Evaluate the test results in a pool of worker processes of this size, the commands are still collected by the main process. "
+    "Useful when the evaluation of large command outputs is CPU bound. By default, the test results are evaluated in the main process.",
+    type=click.IntRange(min=1),
+    show_envvar=True,
+    default=None,
+)
+@click.option(
+    "--workers",
+    help="Run the tests in this number of worker processes, the devices of the inventory being sharded across the workers. "
+    "Each worker collects the commands and evaluates the test results of its devices with its own event loop.",
+    type=click.IntRange(min=1),
+    show_envvar=True,
+    show_default=True,
+    default=1,
+)
+@click.option(
+    "--coordinator",
+    help="Distribute the tests to the workers started with 'anta worker': listen for workers on this address, either 'unix:<path>' or '<host>:<port>', "
+    "and send them shards of devices with their tests. The devices are connected by the workers and the test results are reported by this command.",
+    type=str,
+    show_envvar=True,
+    default=None,
+    callback=check_address,
+)
+@click.option(
+    "--shard-size",
+    help="Maximum number of devices in a shard sent to a worker by the coordinator.",
+    type=click.IntRange(min=1),
+    show_envvar=True,
+    show_default=True,
+    default=DEFAULT_SHARD_SIZE,
+)
+@click.option(
+    "--worker-timeout",
+    help="Time in seconds the coordinator waits for a message of a worker running a shard before sending the shard to another worker. "
+    "If no worker makes progress during this time, e.g. no worker is connected, the remaining tests fail with an error result.",
+    type=click.FloatRange(min=0, min_open=True),
+    show_envvar=True,
+    show_default=True,
+    default=DEFAULT_WORKER_TIMEOUT,
+)
+@click.option(
+    "--token",
+    help="Shared token the workers must send to the coordinator, required to listen on a TCP address. "
+    "The workers load the catalog sent by the coordinator: only run the coordinator and the workers on a trusted network.",
+    type=str,
+    envvar="ANTA_DISTRIBUTED_TOKEN",
+    show_envvar=True,
+    default=None,
+)
+@click.option(
+    "--replay",
+    help="Run the tests against the command outputs collected by 'anta exec snapshot' instead of the devices: the snapshot directory, "
+    "a ZIP or tar archive of this directory or a recording of '--record'. The devices of the inventory are looked up by name in the snapshot "
+    "and are never connected.",
+    type=click.Path(exists=True, path_type=Path),
+    show_envvar=True,
+    default=None,
+)
+@click.option(
+    "--record",
+    help="Record the outputs of the commands collected on the devices in this gzip-compressed JSON lines archive, appended if it exists. "
+    "The recording can be replayed with '--replay'.",
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=Path),
+    show_envvar=True,
+    default=None,
+)
+@click.option(
+    "--record-max-size",
+    help="Maximum size in MiB of the '--record' archive, the next command outputs are not recorded once it is reached.",
+    type=click.IntRange(min=1),
+    show_envvar=True,
+    default=None,
+)
 def nrfu(
     ctx: click.Context,
     inventory: AntaInventory,
@@ -115,6 +252,18 @@ def nrfu(
     ignore_status: bool,
     ignore_error: bool,
     dry_run: bool,
+    max_concurrency: int,
+    connect_concurrency: int,
+    preload: tuple[str, ...],
+    process_pool_size: int | None,
+    workers: int,
+    coordinator: str | None,
+    shard_size: int,
+    worker_timeout: float,
+    token: str | None,
+    replay: Path | None,
+    record: Path | None,
+    record_max_size: int | None,
     catalog_format: str = "yaml",
 ) -> None:
     """Run ANTA tests on selected inventory devices."""
@@ -122,6 +271,10 @@ def nrfu(
     if ctx.obj.get("_anta_help"):
         return
 
+    _check_run_options(ctx, process_pool_size=process_pool_size, workers=workers, coordinator=coordinator, token=token, record=record, replay=replay)
+    if replay is not None:
+        inventory = replay_inventory(inventory, _open_snapshot(ctx, replay))
+
     # We use ctx.obj to pass stuff to the next Click functions
     ctx.ensure_object(dict)
     ctx.obj["result_manager"] = ResultManager()
@@ -135,6 +288,17 @@ def nrfu(
     ctx.obj["device"] = device
     ctx.obj["test"] = test
     ctx.obj["dry_run"] = dry_run
+    ctx.obj["max_concurrency"] = max_concurrency
+    ctx.obj["connect_concurrency"] = connect_concurrency
+    ctx.obj["preload"] = preload
+    ctx.obj["process_pool_size"] = process_pool_size
+    ctx.obj["workers"] = workers
+    ctx.obj["coordinator"] = coordinator
+    ctx.obj["shard_size"] = shard_size
+    ctx.obj["worker_timeout"] = worker_timeout
+    ctx.obj["token"] = token
+    ctx.obj["record"] = record
+    ctx.obj["record_max_size"] = record_max_size
 
     # Invoke `anta nrfu table` if no command is passed
     if not ctx.invoked_subcommand:
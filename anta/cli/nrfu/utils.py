@@ -6,6 +6,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import json
 import logging
 from typing import TYPE_CHECKING, Literal
@@ -15,8 +16,12 @@ from rich.panel import Panel
 from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
 
 from anta.cli.console import console
-from anta.cli.utils import ExitCode
+from anta.cli.utils import MIB, ExitCode
+from anta.device import ReplayDevice
+from anta.distributed import coordinate
+from anta.inventory import AntaInventory
 from anta.models import AntaTest
+from anta.recorder import Recorder
 from anta.reporter import ReportJinja, ReportTable
 from anta.reporter.csv_reporter import ReportCsv
 from anta.reporter.md_reporter import MDReportGenerator
@@ -28,8 +33,8 @@ if TYPE_CHECKING:
     import click
 
     from anta.catalog import AntaCatalog
-    from anta.inventory import AntaInventory
     from anta.result_manager import ResultManager
+    from anta.snapshot import Snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -44,27 +49,76 @@ def run_tests(ctx: click.Context) -> None:
     device = nrfu_ctx_params["device"] or None
     test = nrfu_ctx_params["test"] or None
     dry_run = nrfu_ctx_params["dry_run"]
+    max_concurrency = nrfu_ctx_params["max_concurrency"]
+    connect_concurrency = nrfu_ctx_params["connect_concurrency"]
+    preload = nrfu_ctx_params["preload"]
+    process_pool_size = nrfu_ctx_params["process_pool_size"]
+    workers = nrfu_ctx_params["workers"]
+    coordinator = nrfu_ctx_params["coordinator"]
+    shard_size = nrfu_ctx_params["shard_size"]
+    worker_timeout = nrfu_ctx_params["worker_timeout"]
+    token = nrfu_ctx_params["token"]
+    record = nrfu_ctx_params["record"]
+    record_max_size = nrfu_ctx_params["record_max_size"]
 
     catalog = ctx.obj["catalog"]
     inventory = ctx.obj["inventory"]
 
     print_settings(inventory, catalog)
-    with anta_progress_bar() as AntaTest.progress:
-        asyncio.run(
-            main(
-                ctx.obj["result_manager"],
-                inventory,
-                catalog,
-                tags=tags,
-                devices=set(device) if device else None,
-                tests=set(test) if test else None,
-                dry_run=dry_run,
-            )
+    with anta_progress_bar() as AntaTest.progress, contextlib.ExitStack() as stack:
+        recorder = (
+            stack.enter_context(Recorder(record, max_size=record_max_size * MIB if record_max_size is not None else None))
+            if record is not None and not dry_run
+            else None
         )
+        if coordinator is not None and not dry_run:
+            asyncio.run(
+                coordinate(
+                    ctx.obj["result_manager"],
+                    inventory,
+                    catalog,
+                    coordinator,
+                    shard_size=shard_size,
+                    worker_timeout=worker_timeout,
+                    token=token,
+                    tags=tags,
+                    devices=set(device) if device else None,
+                    tests=set(test) if test else None,
+                )
+            )
+        else:
+            asyncio.run(
+                main(
+                    ctx.obj["result_manager"],
+                    inventory,
+                    catalog,
+                    tags=tags,
+                    devices=set(device) if device else None,
+                    tests=set(test) if test else None,
+                    dry_run=dry_run,
+                    max_concurrency=max_concurrency,
+                    process_pool_size=process_pool_size,
+                    workers=workers,
+                    connect_concurrency=connect_concurrency,
+                    preload=set(preload) if preload else None,
+                    recorder=recorder,
+                )
+            )
     if dry_run:
         ctx.exit()
 
 
+def replay_inventory(inventory: AntaInventory, snapshot: Snapshot) -> AntaInventory:
+    """Return an inventory of ReplayDevice replaying the snapshot for the devices of the given inventory, with the same tags."""
+    replay = AntaInventory()
+    for device in inventory.devices:
+        replay.add_device(ReplayDevice(device.name, snapshot, tags=device.tags, disable_cache=device.cache is None))
+    missing = sorted(device.name for device in inventory.devices if device.name not in snapshot.devices)
+    if missing:
+        logger.warning("Device(s) not in the snapshot %s: %s", snapshot.path, ", ".join(missing))
+    return replay
+
+
 def _get_result_manager(ctx: click.Context) -> ResultManager:
     """Get a ResultManager instance based on Click context."""
     return ctx.obj["result_manager"].filter(ctx.obj.get("hide")) if ctx.obj.get("hide") is not None else ctx.obj["result_manager"]
@@ -14,7 +14,18 @@ from typing import TYPE_CHECKING, Any, Callable
 import click
 from yaml import YAMLError
 
+from anta.cache import DEFAULT_CACHE_MAX_SIZE
 from anta.catalog import AntaCatalog
+from anta.device import (
+    ADAPTIVE_TIMEOUT_MAX_FACTOR,
+    DEFAULT_BATCH_WINDOW,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_PROBE_TIMEOUT,
+    RetryPolicy,
+)
+from anta.distributed import parse_address
 from anta.inventory import AntaInventory
 from anta.inventory.exceptions import InventoryIncorrectSchemaError, InventoryRootKeyError
 
@@ -23,6 +34,32 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Number of bytes in a MiB, the unit of the size options
+MIB = 1024 * 1024
+
+
+# Click options of `core_options` passed to `AntaInventory.parse()` to configure the devices
+DEVICE_OPTIONS = (
+    "timeout",
+    "insecure",
+    "disable_cache",
+    "cache_dir",
+    "cache_ttl",
+    "cache_max_size",
+    "cache_max_entries",
+    "cache_max_total_size",
+    "max_concurrent_requests",
+    "max_batch_size",
+    "batch_window",
+    "retries",
+    "adaptive_timeout",
+    "max_connections",
+    "keepalive_expiry",
+    "http2",
+    "probe",
+    "probe_timeout",
+)
+
 
 class ExitCode(enum.IntEnum):
     """Encodes the valid exit codes by anta inspired from pytest."""
@@ -47,6 +84,38 @@ def parse_tags(ctx: click.Context, param: Option, value: str | None) -> set[str]
     return None
 
 
+def check_address(ctx: click.Context, param: Option, value: str | None) -> str | None:
+    """Click option callback to check the address of a distributed ANTA coordinator."""
+    if value is not None:
+        try:
+            parse_address(value)
+        except ValueError as e:
+            raise click.BadParameter(str(e)) from e
+    return value
+
+
+def pop_device_options(kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Pop the device options from the keyword arguments of a Click command and convert them to `AntaInventory.parse()` keyword arguments.
+
+    Parameters
+    ----------
+    kwargs
+        The keyword arguments of the Click command, the device options are removed.
+
+    Returns
+    -------
+    dict[str, Any]
+        The keyword arguments to pass to `AntaInventory.parse()`.
+    """
+    options = {name: kwargs.pop(name) for name in DEVICE_OPTIONS}
+    # The size options are given in MiB
+    for name in ("cache_max_size", "cache_max_total_size"):
+        if options[name] is not None:
+            options[name] *= MIB
+    options["retry_policy"] = RetryPolicy(max_attempts=options.pop("retries") + 1)
+    return options
+
+
 def exit_with_code(ctx: click.Context) -> None:
     """Exit the Click application with an exit code.
 
@@ -181,6 +250,138 @@ def core_options(f: Callable[..., Any]) -> Callable[..., Any]:
         is_flag=True,
         default=False,
     )
+    @click.option(
+        "--cache-dir",
+        help="Directory of a disk cache persisting the command outputs across runs, e.g. to run several reports or rerun a test "
+        "without collecting the commands again. By default, the cache is in memory and only lasts for the current run.",
+        show_envvar=True,
+        envvar="ANTA_CACHE_DIR",
+        type=click.Path(file_okay=False, dir_okay=True, writable=True, path_type=Path),
+        default=None,
+    )
+    @click.option(
+        "--cache-ttl",
+        help="Time in seconds a command output is kept in the cache.",
+        show_envvar=True,
+        envvar="ANTA_CACHE_TTL",
+        type=click.FloatRange(min=0, min_open=True),
+        default=DEFAULT_CACHE_TTL,
+        show_default=True,
+    )
+    @click.option(
+        "--cache-max-size",
+        help="Maximum size in MiB of the command outputs stored in the cache of each device, the least recently used outputs are evicted. "
+        f"Defaults to {DEFAULT_CACHE_MAX_SIZE // MIB} MiB for the disk cache and no limit for the memory cache.",
+        show_envvar=True,
+        envvar="ANTA_CACHE_MAX_SIZE",
+        type=click.IntRange(min=1),
+        default=None,
+    )
+    @click.option(
+        "--cache-max-entries",
+        help="Maximum number of command outputs stored in the memory cache of each device, the least recently used outputs are evicted.",
+        show_envvar=True,
+        envvar="ANTA_CACHE_MAX_ENTRIES",
+        type=click.IntRange(min=1),
+        default=None,
+    )
+    @click.option(
+        "--cache-max-total-size",
+        help="Maximum size in MiB of the command outputs stored in the memory caches of all the devices, "
+        "the least recently used outputs of all the devices are evicted.",
+        show_envvar=True,
+        envvar="ANTA_CACHE_MAX_TOTAL_SIZE",
+        type=click.IntRange(min=1),
+        default=None,
+    )
+    @click.option(
+        "--max-concurrent-requests",
+        help="Maximum number of concurrent eAPI requests per device. Can be overridden per device in the inventory.",
+        show_envvar=True,
+        envvar="ANTA_MAX_CONCURRENT_REQUESTS",
+        type=click.IntRange(min=1),
+        default=None,
+    )
+    @click.option(
+        "--max-batch-size",
+        help="Maximum number of commands sent to a device in a single eAPI request. 1 disables batching.",
+        show_envvar=True,
+        envvar="ANTA_MAX_BATCH_SIZE",
+        type=click.IntRange(min=1),
+        default=1,
+        show_default=True,
+    )
+    @click.option(
+        "--batch-window",
+        help="Time in seconds during which commands are coalesced in a single eAPI request when batching is enabled.",
+        show_envvar=True,
+        envvar="ANTA_BATCH_WINDOW",
+        type=click.FloatRange(min=0),
+        default=DEFAULT_BATCH_WINDOW,
+        show_default=True,
+    )
+    @click.option(
+        "--retries",
+        help="Number of retries of the eAPI requests failing with a timeout or a connection error, with an exponential backoff between the retries.",
+        show_envvar=True,
+        envvar="ANTA_RETRIES",
+        type=click.IntRange(min=0),
+        default=0,
+        show_default=True,
+    )
+    @click.option(
+        "--adaptive-timeout",
+        help=f"Adapt the timeout of the eAPI requests to the latency of each device, up to {ADAPTIVE_TIMEOUT_MAX_FACTOR} times the '--timeout' value.",
+        show_envvar=True,
+        envvar="ANTA_ADAPTIVE_TIMEOUT",
+        is_flag=True,
+        default=False,
+        show_default=True,
+    )
+    @click.option(
+        "--max-connections",
+        help=f"Maximum number of connections to a device. Defaults to '--max-concurrent-requests' if set, {DEFAULT_MAX_CONNECTIONS} otherwise.",
+        show_envvar=True,
+        envvar="ANTA_MAX_CONNECTIONS",
+        type=click.IntRange(min=1),
+        default=None,
+    )
+    @click.option(
+        "--keepalive-expiry",
+        help="Time in seconds an idle connection to a device is kept open to be reused.",
+        show_envvar=True,
+        envvar="ANTA_KEEPALIVE_EXPIRY",
+        type=click.FloatRange(min=0),
+        default=DEFAULT_KEEPALIVE_EXPIRY,
+        show_default=True,
+    )
+    @click.option(
+        "--http2",
+        help="Multiplex the eAPI requests on HTTP/2 connections. Requires the 'h2' package.",
+        show_envvar=True,
+        envvar="ANTA_HTTP2",
+        is_flag=True,
+        default=False,
+        show_default=True,
+    )
+    @click.option(
+        "--probe/--no-probe",
+        help="Probe the eAPI port of the devices before connecting to them. "
+        "With '--no-probe', the reachability of the devices is inferred from the first eAPI request.",
+        show_envvar=True,
+        envvar="ANTA_PROBE",
+        default=True,
+        show_default=True,
+    )
+    @click.option(
+        "--probe-timeout",
+        help="Time in seconds to wait for the eAPI port of a device to open when probing the device.",
+        show_envvar=True,
+        envvar="ANTA_PROBE_TIMEOUT",
+        type=click.FloatRange(min=0, min_open=True),
+        default=DEFAULT_PROBE_TIMEOUT,
+        show_default=True,
+    )
     @click.option(
         "--inventory",
         "-i",
@@ -201,11 +402,9 @@ def core_options(f: Callable[..., Any]) -> Callable[..., Any]:
         enable_password: str | None,
         enable: bool,
         prompt: bool,
-        timeout: float,
-        insecure: bool,
-        disable_cache: bool,
         **kwargs: dict[str, Any],
     ) -> Any:
+        device_options = pop_device_options(kwargs)
         # If help is invoke somewhere, do not parse inventory
         if ctx.obj.get("_anta_help"):
             return f(*args, inventory=None, **kwargs)
@@ -238,9 +437,7 @@ def core_options(f: Callable[..., Any]) -> Callable[..., Any]:
                 password=password,
                 enable=enable,
                 enable_password=enable_password,
-                timeout=timeout,
-                insecure=insecure,
-                disable_cache=disable_cache,
+                **device_options,
             )
         except (TypeError, ValueError, YAMLError, OSError, InventoryIncorrectSchemaError, InventoryRootKeyError):
             ctx.exit(ExitCode.USAGE_ERROR)
@@ -304,6 +501,24 @@ def catalog_options(f: Callable[..., Any]) -> Callable[..., Any]:
         default="yaml",
         type=click.Choice(["yaml", "json"], case_sensitive=False),
     )
+    @click.option(
+        "--catalog-compiled",
+        help="Load the compiled catalog if the catalog file is unchanged, skipping the parsing and the validation of the catalog. "
+        "Otherwise, the catalog is compiled for the next runs. See `anta check catalog --compile`. "
+        "Loading a compiled catalog can execute arbitrary code: only compiled catalogs owned by the current user and not writable by other users are loaded.",
+        show_envvar=True,
+        envvar="ANTA_CATALOG_COMPILED",
+        is_flag=True,
+        default=False,
+    )
+    @click.option(
+        "--catalog-compiled-dir",
+        help="Directory of the compiled catalogs. By default, the compiled catalog is a hidden file next to the catalog file.",
+        show_envvar=True,
+        envvar="ANTA_CATALOG_COMPILED_DIR",
+        type=click.Path(file_okay=False, dir_okay=True, writable=True, path_type=Path),
+        default=None,
+    )
     @click.pass_context
     @functools.wraps(f)
     def wrapper(
@@ -311,6 +526,8 @@ def catalog_options(f: Callable[..., Any]) -> Callable[..., Any]:
         *args: tuple[Any],
         catalog: Path,
         catalog_format: str,
+        catalog_compiled: bool,
+        catalog_compiled_dir: Path | None,
         **kwargs: dict[str, Any],
     ) -> Any:
         # If help is invoke somewhere, do not parse catalog
@@ -318,7 +535,7 @@ def catalog_options(f: Callable[..., Any]) -> Callable[..., Any]:
             return f(*args, catalog=None, **kwargs)
         try:
             file_format = catalog_format.lower()
-            c = AntaCatalog.parse(catalog, file_format=file_format)  # type: ignore[arg-type]
+            c = AntaCatalog.parse(catalog, file_format=file_format, compiled=catalog_compiled, compiled_dir=catalog_compiled_dir)  # type: ignore[arg-type]
         except (TypeError, ValueError, YAMLError, OSError):
             ctx.exit(ExitCode.USAGE_ERROR)
         return f(*args, catalog=c, **kwargs)
@@ -0,0 +1,69 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""Click command to run ANTA tests distributed by a coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+import click
+
+from anta.cli.utils import ExitCode, check_address, core_options
+from anta.distributed import DEFAULT_CONNECT_TIMEOUT, work
+from anta.logger import exc_to_str
+from anta.runner import DEFAULT_MAX_CONCURRENCY
+
+if TYPE_CHECKING:
+    from anta.inventory import AntaInventory
+
+logger = logging.getLogger(__name__)
+
+
+@click.command
+@click.pass_context
+@core_options
+@click.option(
+    "--coordinator",
+    help="Address of the coordinator started with 'anta nrfu --coordinator', either 'unix:<path>' or '<host>:<port>'.",
+    type=str,
+    show_envvar=True,
+    required=True,
+    callback=check_address,
+)
+@click.option(
+    "--max-concurrency",
+    help="Maximum number of tests to run concurrently.",
+    type=click.IntRange(min=1),
+    show_envvar=True,
+    show_default=True,
+    default=DEFAULT_MAX_CONCURRENCY,
+)
+@click.option(
+    "--connect-timeout",
+    help="Time in seconds to wait for the coordinator to be listening.",
+    type=click.FloatRange(min=0),
+    show_envvar=True,
+    show_default=True,
+    default=DEFAULT_CONNECT_TIMEOUT,
+)
+@click.option(
+    "--token",
+    help="Shared token of the coordinator. The worker loads the catalog sent by the coordinator: only connect to a trusted coordinator.",
+    type=str,
+    envvar="ANTA_DISTRIBUTED_TOKEN",
+    show_envvar=True,
+    default=None,
+)
+def worker(ctx: click.Context, inventory: AntaInventory, coordinator: str, max_concurrency: int, connect_timeout: float, token: str | None) -> None:
+    """Run the ANTA tests sent by a coordinator.
+
+    The inventory must include the devices of the coordinator inventory.
+    """
+    try:
+        asyncio.run(work(inventory, coordinator, max_concurrency=max_concurrency, connect_timeout=connect_timeout, token=token))
+    except OSError as e:
+        logger.error("Cannot connect to coordinator %s: %s", coordinator, exc_to_str(e))
+        ctx.exit(ExitCode.INTERNAL_ERROR)
@@ -6,9 +6,18 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import importlib.util
+import json
 import logging
+import os
+import random
+import time
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from functools import cache
+from socket import getservbyname
 from typing import TYPE_CHECKING, Any, Literal
 
 import asyncssh
@@ -16,25 +25,123 @@ import httpcore
 from aiocache import Cache
 from aiocache.plugins import HitMissRatioPlugin
 from asyncssh import SSHClientConnection, SSHClientConnectionOptions
-from httpx import ConnectError, HTTPError, TimeoutException
+from httpx import ConnectError, ConnectTimeout, HTTPError, Limits, NetworkError, RemoteProtocolError, TimeoutException
 
 import asynceapi
 from anta import __DEBUG__
+from anta.cache import CACHE_FILENAME, DEFAULT_CACHE_MAX_SIZE, CacheBudget, LRUMemoryCache, SQLiteCache
 from anta.logger import anta_log_exception, exc_to_str
 from anta.models import AntaCommand
+from asynceapi.json_stream import select_paths
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Generator, Iterable, Iterator
     from pathlib import Path
 
+    from anta.recorder import Recorder
+    from anta.snapshot import Snapshot
+
 logger = logging.getLogger(__name__)
 
 # Do not load the default keypairs multiple times due to a performance issue introduced in cryptography 37.0
 # https://github.com/pyca/cryptography/issues/7236#issuecomment-1131908472
 CLIENT_KEYS = asyncssh.public_key.load_default_keypairs()
 
+# Default time in seconds a command output is kept in the device cache
+DEFAULT_CACHE_TTL = 60
+
+# Default time in seconds during which commands are coalesced in a single eAPI request when batching is enabled
+DEFAULT_BATCH_WINDOW = 0.01
+
+# Default maximum number of connections of the eAPI connection pool of a device, when not bounded by max_concurrent_requests
+DEFAULT_MAX_CONNECTIONS = 100
+# Default time in seconds an idle eAPI connection is kept open to be reused
+DEFAULT_KEEPALIVE_EXPIRY = 5.0
+# Default time in seconds to wait for the eAPI port of a device to open when probing the device
+DEFAULT_PROBE_TIMEOUT = 5.0
+
+# The adaptive timeout of a device cannot exceed this factor of its configured timeout
+ADAPTIVE_TIMEOUT_MAX_FACTOR = 4
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Policy to retry the eAPI requests failing with a transient error.
+
+    The delay before a retry grows exponentially from `backoff` up to `max_backoff` and is randomized
+    by `jitter` so that the requests failing at the same time are not retried at the same time.
+
+    Attributes
+    ----------
+    max_attempts
+        Maximum number of attempts of an eAPI request. 1 disables the retries.
+        Can be overridden for a command with `AntaCommand.max_attempts`.
+    backoff
+        Delay in seconds before the first retry, doubled at each retry.
+    max_backoff
+        Maximum delay in seconds before a retry.
+    jitter
+        Fraction of the delay that is randomized, between 0 and 1.
+    retry_on
+        Exception classes of the errors to retry. EOS errors returned by eAPI are never retried.
+    """
+
+    max_attempts: int = 1
+    backoff: float = 0.5
+    max_backoff: float = 10.0
+    jitter: float = 0.5
+    retry_on: tuple[type[Exception], ...] = (TimeoutException, NetworkError, RemoteProtocolError)
+
+    def __post_init__(self) -> None:
+        """Validate the policy."""
+        if self.max_attempts < 1:
+            msg = f"'max_attempts' must be a positive integer, got {self.max_attempts}"
+            raise ValueError(msg)
+        if self.backoff < 0 or self.max_backoff < 0:
+            msg = "'backoff' and 'max_backoff' must be positive numbers"
+            raise ValueError(msg)
+        if not 0 <= self.jitter <= 1:
+            msg = f"'jitter' must be between 0 and 1, got {self.jitter}"
+            raise ValueError(msg)
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay in seconds before retrying a request that failed at the given attempt (starting at 1)."""
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())  # noqa: S311  not used for cryptographic purposes
+
+
+class _LatencyEstimator:
+    """Estimate the latency of the eAPI requests of a device to compute an adaptive timeout.
+
+    The smoothed latency and its variation are computed like the TCP retransmission timeout (RFC 6298).
+    """
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+
+    def __init__(self) -> None:
+        """Initialize the estimator without any sample."""
+        self.smoothed: float | None = None
+        self.variation = 0.0
 
-class AntaDevice(ABC):
+    def update(self, latency: float) -> None:
+        """Update the estimation with the latency of a successful request."""
+        if self.smoothed is None:
+            self.smoothed = latency
+            self.variation = latency / 2
+        else:
+            self.variation = (1 - self.BETA) * self.variation + self.BETA * abs(self.smoothed - latency)
+            self.smoothed = (1 - self.ALPHA) * self.smoothed + self.ALPHA * latency
+
+    def timeout(self, base: float) -> float:
+        """Return the adaptive timeout, never lower than the configured `base` timeout and at most `ADAPTIVE_TIMEOUT_MAX_FACTOR` times higher."""
+        if self.smoothed is None:
+            return base
+        return min(base * ADAPTIVE_TIMEOUT_MAX_FACTOR, max(base, self.smoothed + self.K * self.variation))
+
+
+class AntaDevice(ABC):  # pylint: disable=too-many-instance-attributes
     """Abstract class representing a device in ANTA.
 
     An implementation of this class must override the abstract coroutines `_collect()` and
@@ -55,11 +162,41 @@ class AntaDevice(ABC):
     cache : Cache | None
         In-memory cache from aiocache library for this device (None if cache is disabled).
     cache_locks : dict
-        Dictionary mapping keys to asyncio locks to guarantee exclusive access to the cache if not disabled.
+        Dictionary mapping the command unique identifiers to asyncio locks to guarantee exclusive access to the cache if not disabled.
+        A lock is removed when no command is waiting for it.
+    recorder : Recorder | None
+        Recorder of the outputs of the commands collected on this device (None if the commands are not recorded).
+    max_concurrent_requests : int | None
+        Maximum number of requests sent concurrently to the device (None means no limit).
+    cache_dir : Path | None
+        Directory of the disk cache persisting the command outputs across runs (None means the cache is in memory).
+    cache_ttl : float
+        Time in seconds a command output is kept in the cache.
+    cache_max_size : int | None
+        Maximum size in bytes of the command outputs stored in the cache
+        (None means `DEFAULT_CACHE_MAX_SIZE` for the disk cache and no limit for the memory cache).
+    cache_max_entries : int | None
+        Maximum number of command outputs stored in the memory cache (None means no limit).
+    cache_budget : CacheBudget | None
+        Limits of the memory cache shared with other devices (None means the memory cache only has its own limits).
+    connect_timings : dict[str, float]
+        Time in seconds spent in each phase of the last `refresh()`, e.g. probing the device then getting its hardware model.
 
     """
 
-    def __init__(self, name: str, tags: set[str] | None = None, *, disable_cache: bool = False) -> None:
+    def __init__(
+        self,
+        name: str,
+        tags: set[str] | None = None,
+        *,
+        disable_cache: bool = False,
+        max_concurrent_requests: int | None = None,
+        cache_dir: Path | None = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_max_size: int | None = None,
+        cache_max_entries: int | None = None,
+        cache_budget: CacheBudget | None = None,
+    ) -> None:
         """Initialize an AntaDevice.
 
         Parameters
@@ -70,6 +207,21 @@ class AntaDevice(ABC):
             Tags for this device.
         disable_cache
             Disable caching for all commands for this device.
+        max_concurrent_requests
+            Maximum number of requests sent concurrently to the device. None means no limit.
+        cache_dir
+            Directory of the disk cache persisting the command outputs across runs, shared by all the devices using it.
+            None means the cache is in memory and only lasts for the current run.
+        cache_ttl
+            Time in seconds a command output is kept in the cache.
+        cache_max_size
+            Maximum size in bytes of the command outputs stored in the cache, the least recently used outputs are evicted.
+            None means `DEFAULT_CACHE_MAX_SIZE` for the disk cache and no limit for the memory cache.
+        cache_max_entries
+            Maximum number of command outputs stored in the memory cache, the least recently used outputs are evicted. None means no limit.
+        cache_budget
+            Limits of the memory cache shared with other devices, e.g. all the devices of an inventory.
+            The least recently used outputs of all these devices are evicted when a limit is exceeded. Ignored by the disk cache.
 
         """
         self.name: str = name
@@ -79,13 +231,58 @@ class AntaDevice(ABC):
         self.tags.add(self.name)
         self.is_online: bool = False
         self.established: bool = False
+        self.max_concurrent_requests: int | None = max_concurrent_requests
+        self.connect_timings: dict[str, float] = {}
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.cache_max_size = cache_max_size
+        self.cache_max_entries = cache_max_entries
+        self.cache_budget = cache_budget
         self.cache: Cache | None = None
+        # The locks and the command plan are keyed by the command unique identifiers
         self.cache_locks: defaultdict[str, asyncio.Lock] | None = None
+        # Number of commands holding or waiting for each cache lock
+        self._cache_lock_users: Counter[str] = Counter()
+        self.recorder: Recorder | None = None
+        # The semaphore is created on first use to be bound to the running event loop
+        self._requests_semaphore: asyncio.Semaphore | None = None
+        # Command plan of the current run, see `plan_commands()`
+        self._command_plan: Counter[str] = Counter()
+        self._planned_commands: dict[str, AntaCommand] = {}
+        self._plan_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
 
         # Initialize cache if not disabled
         if not disable_cache:
             self._init_cache()
 
+    def __getstate__(self) -> dict[str, Any]:
+        """Return the state of the device to pickle, e.g. to send the device to another process.
+
+        The cache, the locks, the recorder and the command plan are local to the current process and are not pickled:
+        a device unpickled in another process starts with an empty cache, no recorder and no command plan.
+        """
+        state = self.__dict__.copy()
+        state.update(
+            cache=None,
+            cache_locks=None,
+            _cache_lock_users=Counter(),
+            recorder=None,
+            _requests_semaphore=None,
+            _command_plan=Counter(),
+            _planned_commands={},
+            _plan_locks=defaultdict(asyncio.Lock),
+        )
+        state["_disable_cache"] = self.cache is None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the state of an unpickled device, creating a new cache if caching is enabled."""
+        state = state.copy()
+        disable_cache = state.pop("_disable_cache")
+        self.__dict__.update(state)
+        if not disable_cache:
+            self._init_cache()
+
     @property
     @abstractmethod
     def _keys(self) -> tuple[Any, ...]:
@@ -101,9 +298,34 @@ class AntaDevice(ABC):
 
     def _init_cache(self) -> None:
         """Initialize cache for the device, can be overridden by subclasses to manipulate how it works."""
-        self.cache = Cache(cache_class=Cache.MEMORY, ttl=60, namespace=self.name, plugins=[HitMissRatioPlugin()])
+        if self.cache_dir is not None:
+            self.cache = Cache(
+                cache_class=SQLiteCache,
+                path=self.cache_dir / CACHE_FILENAME,
+                max_size=self.cache_max_size if self.cache_max_size is not None else DEFAULT_CACHE_MAX_SIZE,
+                ttl=self.cache_ttl,
+                namespace=self.name,
+                plugins=[HitMissRatioPlugin()],
+            )
+        else:
+            self.cache = Cache(
+                cache_class=LRUMemoryCache,
+                max_entries=self.cache_max_entries,
+                max_size=self.cache_max_size,
+                budget=self.cache_budget,
+                ttl=self.cache_ttl,
+                namespace=self.name,
+                plugins=[HitMissRatioPlugin()],
+            )
         self.cache_locks = defaultdict(asyncio.Lock)
 
+    @property
+    def requests_semaphore(self) -> asyncio.Semaphore | None:
+        """Semaphore limiting the number of concurrent requests to the device, None if there is no limit."""
+        if self.max_concurrent_requests is not None and self._requests_semaphore is None:
+            self._requests_semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        return self._requests_semaphore
+
     @property
     def cache_statistics(self) -> dict[str, Any] | None:
         """Return the device cache statistics for logging purposes."""
@@ -111,7 +333,17 @@ class AntaDevice(ABC):
         # https://github.com/pylint-dev/pylint/issues/7258
         if self.cache is not None:
             stats = getattr(self.cache, "hit_miss_ratio", {"total": 0, "hits": 0, "hit_ratio": 0})
-            return {"total_commands_sent": stats["total"], "cache_hits": stats["hits"], "cache_hit_ratio": f"{stats['hit_ratio'] * 100:.2f}%"}
+            return {
+                "total_commands_sent": stats["total"],
+                "cache_hits": stats["hits"],
+                "cache_hit_ratio": f"{stats['hit_ratio'] * 100:.2f}%",
+                "cache_evictions": getattr(self.cache, "evictions", 0),
+            }
+        return None
+
+    @property
+    def pool_statistics(self) -> dict[str, Any] | None:
+        """Return the statistics of the connection pool of the device for logging purposes, None if the device does not have a connection pool."""
         return None
 
     def __rich_repr__(self) -> Iterator[tuple[str, Any]]:
@@ -159,9 +391,32 @@ class AntaDevice(ABC):
             An identifier used to build the eAPI request ID.
         """
 
+    def plan_commands(self, commands: Iterable[AntaCommand]) -> None:
+        """Register the commands that will be collected on this device during a run.
+
+        The commands used by several tests are collected only once and their output is shared
+        with all the tests that need them, even if caching is disabled on the device.
+        Commands with `use_cache` set to False are always collected.
+
+        The plan is replaced on each call, calling this method with an empty iterable removes it.
+
+        Parameters
+        ----------
+        commands
+            The commands of all the tests that will run on this device.
+        """
+        counter = Counter(command.uid for command in commands if command.use_cache)
+        self._command_plan = Counter({uid: count for uid, count in counter.items() if count > 1})
+        self._planned_commands = {}
+        self._plan_locks = defaultdict(asyncio.Lock)
+
     async def collect(self, command: AntaCommand, *, collection_id: str | None = None) -> None:
         """Collect the output for a specified command.
 
+        When the command is part of the command plan of the device, it is collected only once
+        and its output and errors are shared with all the other planned occurrences of the command.
+        See `plan_commands()`.
+
         When caching is activated on both the device and the command,
         this method prioritizes retrieving the output from the cache. In cases where the output isn't cached yet,
         it will be freshly collected and then stored in the cache for future access.
@@ -170,6 +425,10 @@ class AntaDevice(ABC):
         When caching is NOT enabled, either at the device or command level, the method directly collects the output
         via the private `_collect` method without interacting with the cache.
 
+        If `max_concurrent_requests` is set, the number of `_collect` calls in flight for this device is bounded.
+
+        If the device has a `recorder`, the output of the command is recorded once collected.
+
         Parameters
         ----------
         command
@@ -177,21 +436,86 @@ class AntaDevice(ABC):
         collection_id
             An identifier used to build the eAPI request ID.
         """
+        if command.use_cache and command.uid in self._command_plan:
+            await self._planned_collect(command=command, collection_id=collection_id)
+        else:
+            await self._cached_collect(command=command, collection_id=collection_id)
+        if self.recorder is not None:
+            self.recorder.record(self.name, command)
+
+    async def _planned_collect(self, command: AntaCommand, *, collection_id: str | None = None) -> None:
+        """Collect a command of the command plan, only the first occurrence of the command is actually collected."""
+        uid = command.uid
+        async with self._plan_locks[uid]:
+            if (collected := self._planned_commands.get(uid)) is not None:
+                logger.debug("Using planned output of %s on %s", command.command, self.name)
+                command.output = collected.output
+                command.errors = list(collected.errors)
+            else:
+                await self._cached_collect(command=command, collection_id=collection_id)
+                self._planned_commands[uid] = command
+            self._command_plan[uid] -= 1
+            if self._command_plan[uid] <= 0:
+                # All the planned occurrences have been served, release the output
+                del self._command_plan[uid]
+                self._planned_commands.pop(uid, None)
+                self._plan_locks.pop(uid, None)
+
+    async def _cached_collect(self, command: AntaCommand, *, collection_id: str | None = None) -> None:
+        """Collect a command, using the device cache if enabled on both the device and the command."""
         # Need to ignore pylint no-member as Cache is a proxy class and pylint is not smart enough
         # https://github.com/pylint-dev/pylint/issues/7258
         if self.cache is not None and self.cache_locks is not None and command.use_cache:
-            async with self.cache_locks[command.uid]:
-                cached_output = await self.cache.get(command.uid)  # pylint: disable=no-member
-
-                if cached_output is not None:
-                    logger.debug("Cache hit for %s on %s", command.command, self.name)
-                    command.output = cached_output
-                else:
-                    await self._collect(command=command, collection_id=collection_id)
-                    await self.cache.set(command.uid, command.output)  # pylint: disable=no-member
+            uid = command.uid
+            self._cache_lock_users[uid] += 1
+            try:
+                async with self.cache_locks[uid]:
+                    cached_output = await self.cache.get(uid)  # pylint: disable=no-member
+
+                    if cached_output is not None:
+                        logger.debug("Cache hit for %s on %s", command.command, self.name)
+                        command.output = cached_output
+                    else:
+                        await self._limited_collect(command=command, collection_id=collection_id)
+                        await self.cache.set(uid, command.output)  # pylint: disable=no-member
+            finally:
+                self._cache_lock_users[uid] -= 1
+                if self._cache_lock_users[uid] <= 0:
+                    # No other command is waiting for the lock, release it
+                    del self._cache_lock_users[uid]
+                    self.cache_locks.pop(uid, None)
         else:
+            await self._limited_collect(command=command, collection_id=collection_id)
+
+    async def _limited_collect(self, command: AntaCommand, *, collection_id: str | None = None) -> None:
+        """Call `_collect()` while honoring the `max_concurrent_requests` limit of the device."""
+        if (semaphore := self.requests_semaphore) is None:
+            await self._collect(command=command, collection_id=collection_id)
+            return
+        async with semaphore:
             await self._collect(command=command, collection_id=collection_id)
 
+    async def _cache_output(self, command: AntaCommand) -> None:
+        """Store the output of a command collected outside of `collect()` in the device cache, if enabled on both the device and the command."""
+        if self.cache is not None and command.use_cache and command.collected:
+            await self.cache.set(command.uid, command.output)  # pylint: disable=no-member
+
+    async def preload(self, commands: Iterable[AntaCommand]) -> None:
+        """Collect commands to store their outputs in the device cache, to be shared by all the tests using them.
+
+        The commands are copied, the outputs are only available from the cache. Nothing is collected if caching is disabled on the device.
+
+        Parameters
+        ----------
+        commands
+            The commands to preload.
+        """
+        if self.cache is None:
+            logger.debug("Caching is not enabled on %s, the commands are not preloaded", self.name)
+            return
+        with self._connect_phase("preload"):
+            await self.collect_commands([command.model_copy(deep=True) for command in commands if command.use_cache], collection_id="preload")
+
     async def collect_commands(self, commands: list[AntaCommand], *, collection_id: str | None = None) -> None:
         """Collect multiple commands.
 
@@ -204,6 +528,15 @@ class AntaDevice(ABC):
         """
         await asyncio.gather(*(self.collect(command=command, collection_id=collection_id) for command in commands))
 
+    @contextlib.contextmanager
+    def _connect_phase(self, phase: str) -> Generator[None, None, None]:
+        """Record the time spent in a phase of `refresh()` in `connect_timings`."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.connect_timings[phase] = time.monotonic() - start
+
     @abstractmethod
     async def refresh(self) -> None:
         """Update attributes of an AntaDevice instance.
@@ -237,7 +570,31 @@ class AntaDevice(ABC):
         raise NotImplementedError(msg)
 
 
-class AsyncEOSDevice(AntaDevice):
+@cache
+def _json_codec() -> asynceapi.JSONCodec:
+    """Return the JSON codec of the eAPI sessions, set by the ANTA_JSON_CODEC environment variable.
+
+    If the `ANTA_JSON_CODEC` environment variable is not set or is invalid, the standard library is used.
+    """
+    try:
+        return asynceapi.get_codec(os.environ.get("ANTA_JSON_CODEC"))
+    except (ValueError, ImportError) as exception:
+        logger.warning("The ANTA_JSON_CODEC environment variable value is invalid: %s\nDefault to the standard library.", exc_to_str(exception))
+        return asynceapi.get_codec()
+
+
+@dataclass
+class _CommandBatch:
+    """Commands waiting to be sent to a device in a single eAPI request."""
+
+    commands: list[AntaCommand]
+    # Set when the batch reaches the maximum batch size
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+    # Set when the eAPI request of the batch is completed
+    sent: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class AsyncEOSDevice(AntaDevice):  # pylint: disable=too-many-instance-attributes
     """Implementation of AntaDevice for EOS using aio-eapi.
 
     Attributes
@@ -252,10 +609,24 @@ class AsyncEOSDevice(AntaDevice):
         Hardware model of the device.
     tags : set[str]
         Tags for this device.
+    max_batch_size : int
+        Maximum number of commands sent in a single eAPI request. 1 means batching is disabled.
+    batch_window : float
+        Time in seconds during which commands are coalesced in a single eAPI request when batching is enabled.
+    retry_policy : RetryPolicy
+        Policy to retry the eAPI requests failing with a transient error.
+    adaptive_timeout : bool
+        True if the timeout of the eAPI requests adapts to the latency of the device.
+    http2 : bool
+        True if the eAPI requests are multiplexed on HTTP/2 connections.
+    probe : bool
+        True if the eAPI port of the device is probed before getting its hardware model in `refresh()`.
+    probe_timeout : float
+        Time in seconds to wait for the eAPI port of the device to open when probing the device.
 
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-locals  # the arguments alone exceed the maximum number of local variables
         self,
         host: str,
         username: str,
@@ -271,6 +642,21 @@ class AsyncEOSDevice(AntaDevice):
         enable: bool = False,
         insecure: bool = False,
         disable_cache: bool = False,
+        cache_dir: Path | None = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_max_size: int | None = None,
+        cache_max_entries: int | None = None,
+        cache_budget: CacheBudget | None = None,
+        max_concurrent_requests: int | None = None,
+        max_batch_size: int = 1,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        retry_policy: RetryPolicy | None = None,
+        adaptive_timeout: bool = False,
+        max_connections: int | None = None,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        probe: bool = True,
+        probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
     ) -> None:
         """Instantiate an AsyncEOSDevice.
 
@@ -302,6 +688,40 @@ class AsyncEOSDevice(AntaDevice):
             eAPI protocol. Value can be 'http' or 'https'.
         disable_cache
             Disable caching for all commands for this device.
+        cache_dir
+            Directory of the disk cache persisting the command outputs across runs. None means the cache is in memory.
+        cache_ttl
+            Time in seconds a command output is kept in the cache.
+        cache_max_size
+            Maximum size in bytes of the command outputs stored in the cache.
+            None means `DEFAULT_CACHE_MAX_SIZE` for the disk cache and no limit for the memory cache.
+        cache_max_entries
+            Maximum number of command outputs stored in the memory cache. None means no limit.
+        cache_budget
+            Limits of the memory cache shared with other devices. Ignored by the disk cache.
+        max_concurrent_requests
+            Maximum number of eAPI requests sent concurrently to the device. None means no limit.
+        max_batch_size
+            Maximum number of commands sent in a single eAPI request. 1 disables batching.
+        batch_window
+            Time in seconds during which commands are coalesced in a single eAPI request when batching is enabled.
+        retry_policy
+            Policy to retry the eAPI requests failing with a transient error. None means the requests are not retried.
+        adaptive_timeout
+            Adapt the timeout of the eAPI requests to the latency of the device learnt from the previous requests.
+            The adaptive timeout is never lower than `timeout` and at most `ADAPTIVE_TIMEOUT_MAX_FACTOR` times higher.
+        max_connections
+            Maximum number of connections of the eAPI connection pool. All the connections are kept alive to be reused.
+            None means `max_concurrent_requests` if set, `DEFAULT_MAX_CONNECTIONS` otherwise.
+        keepalive_expiry
+            Time in seconds an idle eAPI connection is kept open to be reused.
+        http2
+            Multiplex the eAPI requests on HTTP/2 connections. Requires the `h2` package, HTTP/1.1 is used if it is not installed.
+        probe
+            Probe the eAPI port of the device before getting its hardware model in `refresh()`.
+            When False, the reachability of the device is inferred from the `show version` eAPI request.
+        probe_timeout
+            Time in seconds to wait for the eAPI port of the device to open when probing the device.
 
         """
         if host is None:
@@ -310,24 +730,106 @@ class AsyncEOSDevice(AntaDevice):
             raise ValueError(message)
         if name is None:
             name = f"{host}{f':{port}' if port else ''}"
-        super().__init__(name, tags, disable_cache=disable_cache)
+        super().__init__(
+            name,
+            tags,
+            disable_cache=disable_cache,
+            max_concurrent_requests=max_concurrent_requests,
+            cache_dir=cache_dir,
+            cache_ttl=cache_ttl,
+            cache_max_size=cache_max_size,
+            cache_max_entries=cache_max_entries,
+            cache_budget=cache_budget,
+        )
+        self._check_arguments(username=username, password=password, max_batch_size=max_batch_size, max_connections=max_connections, probe_timeout=probe_timeout)
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 is not available for device %s, the 'h2' package is not installed. Falling back to HTTP/1.1", self.name)
+            http2 = False
+        self.enable = enable
+        self._enable_password = enable_password
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.adaptive_timeout = adaptive_timeout
+        self._latency = _LatencyEstimator()
+        self.http2 = http2
+        self.probe = probe
+        self.probe_timeout = probe_timeout
+        # Set when an eAPI request cannot connect to the device, used to infer the reachability of the device when it is not probed
+        self._connect_failed = False
+        if max_connections is None:
+            max_connections = max_concurrent_requests if max_concurrent_requests is not None else DEFAULT_MAX_CONNECTIONS
+        # Keep the connection parameters to rebuild the eAPI session and the SSH options when the device is unpickled
+        self._session_params: dict[str, Any] = {
+            "host": host,
+            "port": port,
+            "username": username,
+            "password": password,
+            "proto": proto,
+            "timeout": timeout,
+            "limits": Limits(max_connections=max_connections, max_keepalive_connections=max_connections, keepalive_expiry=keepalive_expiry),
+            "http2": http2,
+        }
+        # The host and the eAPI port identify the device without creating the eAPI session, see `_keys`
+        self._eapi_address: tuple[str, int] = (host, port or getservbyname(proto))
+        self._ssh_params: dict[str, Any] = {"host": host, "port": ssh_port, "username": username, "password": password}
+        if insecure:
+            self._ssh_params["known_hosts"] = None
+        # Commands waiting to be sent in a batch, keyed by output format and version
+        self._batches: dict[tuple[str, int | str], _CommandBatch] = {}
+        # The eAPI session and the SSH options are created on first use
+        self._eapi_session: asynceapi.Device | None = None
+        self._ssh_options: SSHClientConnectionOptions | None = None
+
+    def _check_arguments(self, *, username: str, password: str, max_batch_size: int, max_connections: int | None, probe_timeout: float) -> None:
+        """Check the arguments used to instantiate the device.
+
+        Raises
+        ------
+        ValueError
+            If an argument is missing or invalid.
+        """
+        message: str | None = None
         if username is None:
             message = f"'username' is required to instantiate device '{self.name}'"
-            logger.error(message)
-            raise ValueError(message)
-        if password is None:
+        elif password is None:
             message = f"'password' is required to instantiate device '{self.name}'"
+        elif max_batch_size < 1:
+            message = f"'max_batch_size' must be a positive integer to instantiate device '{self.name}'"
+        elif max_connections is not None and max_connections < 1:
+            message = f"'max_connections' must be a positive integer to instantiate device '{self.name}'"
+        elif probe_timeout <= 0:
+            message = f"'probe_timeout' must be a positive number to instantiate device '{self.name}'"
+        if message is not None:
             logger.error(message)
             raise ValueError(message)
-        self.enable = enable
-        self._enable_password = enable_password
-        self._session: asynceapi.Device = asynceapi.Device(host=host, port=port, username=username, password=password, proto=proto, timeout=timeout)
-        ssh_params: dict[str, Any] = {}
-        if insecure:
-            ssh_params["known_hosts"] = None
-        self._ssh_opts: SSHClientConnectionOptions = SSHClientConnectionOptions(
-            host=host, port=ssh_port, username=username, password=password, client_keys=CLIENT_KEYS, **ssh_params
-        )
+
+    @property
+    def _session(self) -> asynceapi.Device:
+        """The eAPI session of the device."""
+        if self._eapi_session is None:
+            self._eapi_session = asynceapi.Device(**self._session_params, json_codec=_json_codec())
+        return self._eapi_session
+
+    @property
+    def pool_statistics(self) -> dict[str, Any] | None:
+        """Return the statistics of the eAPI connection pool of the device for logging purposes, None if no eAPI request has been sent."""
+        if self._eapi_session is None:
+            return None
+        return self._eapi_session.pool_statistics.as_dict()
+
+    @property
+    def _ssh_opts(self) -> SSHClientConnectionOptions:
+        """The SSH options of the device."""
+        if self._ssh_options is None:
+            self._ssh_options = SSHClientConnectionOptions(client_keys=CLIENT_KEYS, **self._ssh_params)
+        return self._ssh_options
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Return the state of the device to pickle, without the eAPI session and the SSH options created again on first use when unpickled."""
+        state = super().__getstate__()
+        state.update(_batches={}, _eapi_session=None, _ssh_options=None)
+        return state
 
     def __rich_repr__(self) -> Iterator[tuple[str, Any]]:
         """Implement Rich Repr Protocol.
@@ -335,11 +837,11 @@ class AsyncEOSDevice(AntaDevice):
         https://rich.readthedocs.io/en/stable/pretty.html#rich-repr-protocol.
         """
         yield from super().__rich_repr__()
-        yield ("host", self._session.host)
-        yield ("eapi_port", self._session.port)
-        yield ("username", self._ssh_opts.username)
+        yield ("host", self._eapi_address[0])
+        yield ("eapi_port", self._eapi_address[1])
+        yield ("username", self._ssh_params["username"])
         yield ("enable", self.enable)
-        yield ("insecure", self._ssh_opts.known_hosts is None)
+        yield ("insecure", "known_hosts" in self._ssh_params)
         if __DEBUG__:
             _ssh_opts = vars(self._ssh_opts).copy()
             removed_pw = "<removed>"
@@ -357,11 +859,11 @@ class AsyncEOSDevice(AntaDevice):
             f"is_online={self.is_online!r}, "
             f"established={self.established!r}, "
             f"disable_cache={self.cache is None!r}, "
-            f"host={self._session.host!r}, "
-            f"eapi_port={self._session.port!r}, "
-            f"username={self._ssh_opts.username!r}, "
+            f"host={self._eapi_address[0]!r}, "
+            f"eapi_port={self._eapi_address[1]!r}, "
+            f"username={self._ssh_params['username']!r}, "
             f"enable={self.enable!r}, "
-            f"insecure={self._ssh_opts.known_hosts is None!r})"
+            f"insecure={'known_hosts' in self._ssh_params!r})"
         )
 
     @property
@@ -370,15 +872,19 @@ class AsyncEOSDevice(AntaDevice):
 
         This covers the use case of port forwarding when the host is localhost and the devices have different ports.
         """
-        return (self._session.host, self._session.port)
+        return self._eapi_address
 
-    async def _collect(self, command: AntaCommand, *, collection_id: str | None = None) -> None:  # noqa: C901  function is too complex - because of many required except blocks
+    async def _collect(self, command: AntaCommand, *, collection_id: str | None = None) -> None:
         """Collect device command output from EOS using aio-eapi.
 
         Supports outformat `json` and `text` as output structure.
         Gain privileged access using the `enable_password` attribute
         of the `AntaDevice` instance if populated.
 
+        When `max_batch_size` is greater than 1, the command is coalesced with the other commands
+        collected concurrently on this device with the same output format and version,
+        and sent to the device in a single eAPI request.
+
         Parameters
         ----------
         command
@@ -386,41 +892,110 @@ class AsyncEOSDevice(AntaDevice):
         collection_id
             An identifier used to build the eAPI request ID.
         """
-        commands: list[dict[str, str | int]] = []
+        if self.max_batch_size > 1:
+            await self._batch_collect(command)
+        else:
+            await self._run_commands([command], req_id=f"ANTA-{collection_id}-{id(command)}" if collection_id else f"ANTA-{id(command)}")
+        logger.debug("%s: %s", self.name, command)
+
+    async def _limited_collect(self, command: AntaCommand, *, collection_id: str | None = None) -> None:
+        """Call `_collect()` while honoring the `max_concurrent_requests` limit of the device.
+
+        When batching is enabled, the limit is enforced on the batched eAPI requests instead of the individual commands.
+        """
+        if self.max_batch_size > 1:
+            await self._collect(command=command, collection_id=collection_id)
+            return
+        await super()._limited_collect(command=command, collection_id=collection_id)
+
+    async def _batch_collect(self, command: AntaCommand) -> None:
+        """Queue a command in a batch and wait for the batch to be sent to the device.
+
+        The first command of a batch waits for the coalescing window `batch_window` to expire or for the batch
+        to reach `max_batch_size` commands, then sends the whole batch in a single eAPI request.
+
+        Parameters
+        ----------
+        command
+            The command to collect.
+        """
+        key = (command.ofmt, command.version)
+        batch = self._batches.get(key)
+        if batch is not None and len(batch.commands) < self.max_batch_size:
+            batch.commands.append(command)
+            if len(batch.commands) >= self.max_batch_size:
+                batch.full.set()
+            await batch.sent.wait()
+            return
+
+        batch = _CommandBatch([command])
+        self._batches[key] = batch
+        try:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(batch.full.wait(), timeout=self.batch_window)
+            # Close the batch so that new commands are queued in a new batch
+            if self._batches.get(key) is batch:
+                del self._batches[key]
+            if (semaphore := self.requests_semaphore) is None:
+                await self._run_commands(batch.commands, req_id=f"ANTA-batch-{id(batch)}")
+            else:
+                async with semaphore:
+                    await self._run_commands(batch.commands, req_id=f"ANTA-batch-{id(batch)}")
+        except BaseException as e:
+            # The exception is only raised to the first command, the other commands of the batch would have neither output nor errors
+            for batched_command in batch.commands:
+                if batched_command.output is None and not batched_command.errors:
+                    batched_command.errors = [exc_to_str(e)]
+            raise
+        finally:
+            if self._batches.get(key) is batch:
+                del self._batches[key]
+            batch.sent.set()
+
+    @property
+    def _enable_commands(self) -> list[dict[str, str | int]]:
+        """Commands to send before the collected commands in an eAPI request to gain privileged access."""
         if self.enable and self._enable_password is not None:
-            commands.append(
+            return [
                 {
                     "cmd": "enable",
                     "input": str(self._enable_password),
                 },
-            )
-        elif self.enable:
+            ]
+        if self.enable:
             # No password
-            commands.append({"cmd": "enable"})
-        commands += [{"cmd": command.command, "revision": command.revision}] if command.revision else [{"cmd": command.command}]
+            return [{"cmd": "enable"}]
+        return []
+
+    async def _run_commands(self, commands: list[AntaCommand], *, req_id: str) -> None:  # noqa: C901  function is too complex - because of many required except blocks
+        """Send commands sharing the same output format and version to EOS in a single eAPI request.
+
+        Parameters
+        ----------
+        commands
+            The commands to collect.
+        req_id
+            The eAPI request ID.
+        """
+        eapi_commands = self._enable_commands
+        prefix_length = len(eapi_commands)
+        eapi_commands += [{"cmd": command.command, "revision": command.revision} if command.revision else {"cmd": command.command} for command in commands]
         try:
-            response: list[dict[str, Any] | str] = await self._session.cli(
-                commands=commands,
-                ofmt=command.ofmt,
-                version=command.version,
-                req_id=f"ANTA-{collection_id}-{id(command)}" if collection_id else f"ANTA-{id(command)}",
-            )  # type: ignore[assignment] # multiple commands returns a list
+            response = await self._send_commands(commands, eapi_commands, req_id=req_id)
             # Do not keep response of 'enable' command
-            command.output = response[-1]
+            for command, output in zip(commands, response[-len(commands) :]):
+                command.output = output
         except asynceapi.EapiCommandError as e:
             # This block catches exceptions related to EOS issuing an error.
-            command.errors = e.errors
-            if command.requires_privileges:
-                logger.error(
-                    "Command '%s' requires privileged mode on %s. Verify user permissions and if the `enable` option is required.", command.command, self.name
-                )
-            if command.supported:
-                logger.error("Command '%s' failed on %s: %s", command.command, self.name, e.errors[0] if len(e.errors) == 1 else e.errors)
-            else:
-                logger.debug("Command '%s' is not supported on '%s' (%s)", command.command, self.name, self.hw_model)
+            if not_executed := self._map_command_error(commands, e, prefix_length=prefix_length):
+                # EOS stops at the first failing command, send again the commands that have not been executed
+                await self._run_commands(not_executed, req_id=req_id)
         except TimeoutException as e:
             # This block catches Timeout exceptions.
-            command.errors = [exc_to_str(e)]
+            for command in commands:
+                command.errors = [exc_to_str(e)]
+            if isinstance(e, ConnectTimeout):
+                self._connect_failed = True
             timeouts = self._session.timeout.as_dict()
             logger.error(
                 "%s occurred while sending a command to %s. Consider increasing the timeout.\nCurrent timeouts: Connect: %s | Read: %s | Write: %s | Pool: %s",
@@ -433,18 +1008,129 @@ class AsyncEOSDevice(AntaDevice):
             )
         except (ConnectError, OSError) as e:
             # This block catches OSError and socket issues related exceptions.
-            command.errors = [exc_to_str(e)]
-            if (isinstance(exc := e.__cause__, httpcore.ConnectError) and isinstance(os_error := exc.__context__, OSError)) or isinstance(os_error := e, OSError):  # pylint: disable=no-member
-                if isinstance(os_error.__cause__, OSError):
-                    os_error = os_error.__cause__
-                logger.error("A local OS error occurred while connecting to %s: %s.", self.name, os_error)
-            else:
-                anta_log_exception(e, f"An error occurred while issuing an eAPI request to {self.name}", logger)
+            for command in commands:
+                command.errors = [exc_to_str(e)]
+            self._connect_failed = True
+            self._log_connect_error(e)
         except HTTPError as e:
             # This block catches most of the httpx Exceptions and logs a general message.
-            command.errors = [exc_to_str(e)]
+            for command in commands:
+                command.errors = [exc_to_str(e)]
             anta_log_exception(e, f"An error occurred while issuing an eAPI request to {self.name}", logger)
-        logger.debug("%s: %s", self.name, command)
+
+    def _log_connect_error(self, e: ConnectError | OSError) -> None:
+        """Log an error raised while connecting to the device, reporting the local OS error if any."""
+        if (isinstance(exc := e.__cause__, httpcore.ConnectError) and isinstance(os_error := exc.__context__, OSError)) or isinstance(os_error := e, OSError):  # pylint: disable=no-member
+            if isinstance(os_error.__cause__, OSError):
+                os_error = os_error.__cause__
+            logger.error("A local OS error occurred while connecting to %s: %s.", self.name, os_error)
+        else:
+            anta_log_exception(e, f"An error occurred while issuing an eAPI request to {self.name}", logger)
+
+    def _request_timeout(self, commands: list[AntaCommand], attempt: int) -> float | None:
+        """Return the timeout of an eAPI request, None means the timeout of the eAPI session is used.
+
+        The timeout of the commands has precedence over the adaptive timeout, which is doubled at each attempt.
+        """
+        if command_timeouts := [command.timeout for command in commands if command.timeout is not None]:
+            return max(command_timeouts)
+        if not self.adaptive_timeout or (base := self._session.timeout.read) is None:
+            return None
+        return min(base * ADAPTIVE_TIMEOUT_MAX_FACTOR, self._latency.timeout(base) * 2 ** (attempt - 1))
+
+    async def _send_commands(self, commands: list[AntaCommand], eapi_commands: list[dict[str, Any]], *, req_id: str, attempt: int = 1) -> list[dict[str, Any] | str]:
+        """Send an eAPI request, retrying it according to the retry policy of the device.
+
+        Parameters
+        ----------
+        commands
+            The commands to collect.
+        eapi_commands
+            The commands of the eAPI request, including the 'enable' command.
+        req_id
+            The eAPI request ID.
+        attempt
+            The current attempt of the request, starting at 1.
+
+        Returns
+        -------
+        list[dict[str, Any] | str]
+            The outputs of the eAPI commands.
+        """
+        json_paths: list[list[str] | None] | None = None
+        if any(command.json_paths is not None for command in commands):
+            # The outputs of the commands preceding the collected commands, e.g. 'enable', are not used
+            json_paths = [None] * (len(eapi_commands) - len(commands))
+            json_paths += [command.json_paths for command in commands]
+        start = time.monotonic()
+        try:
+            response: list[dict[str, Any] | str] = await self._session.cli(
+                commands=eapi_commands,
+                ofmt=commands[0].ofmt,
+                version=commands[0].version,
+                req_id=req_id,
+                timeout=self._request_timeout(commands, attempt),
+                json_paths=json_paths,
+            )  # type: ignore[assignment] # multiple commands returns a list
+        except Exception as e:
+            # The exception classes to retry are not known statically, the other exceptions are propagated
+            if not isinstance(e, self.retry_policy.retry_on):
+                raise
+            max_attempts = max(command.max_attempts or self.retry_policy.max_attempts for command in commands)
+            if attempt >= max_attempts:
+                raise
+            delay = self.retry_policy.delay(attempt)
+            logger.warning(
+                "%s occurred while sending a command to %s, retrying in %.2f second(s) (attempt %s of %s)",
+                exc_to_str(e),
+                self.name,
+                delay,
+                attempt + 1,
+                max_attempts,
+            )
+            await asyncio.sleep(delay)
+            return await self._send_commands(commands, eapi_commands, req_id=req_id, attempt=attempt + 1)
+        self._latency.update(time.monotonic() - start)
+        return response
+
+    def _map_command_error(self, commands: list[AntaCommand], error: asynceapi.EapiCommandError, *, prefix_length: int) -> list[AntaCommand]:
+        """Map an `EapiCommandError` raised by an eAPI request back onto its commands.
+
+        The commands executed before the failure get their output, the failed command gets the errors.
+
+        Parameters
+        ----------
+        commands
+            The commands sent in the eAPI request.
+        error
+            The error raised by the eAPI request.
+        prefix_length
+            Number of commands sent before `commands` in the eAPI request, i.e. the 'enable' command.
+
+        Returns
+        -------
+        list[AntaCommand]
+            The commands that have not been executed by the device.
+        """
+        failed_index = len(error.passed) - prefix_length
+        if failed_index < 0:
+            # The 'enable' command failed, none of the commands have been executed
+            failed_commands, not_executed = commands, []
+        else:
+            for command, output in zip(commands[:failed_index], error.passed[prefix_length:]):
+                command.output = output
+            failed_commands, not_executed = commands[failed_index : failed_index + 1], commands[failed_index + 1 :]
+        for command in failed_commands:
+            command.errors = error.errors
+            if command.requires_privileges:
+                logger.error(
+                    "Command '%s' requires privileged mode on %s. Verify user permissions and if the `enable` option is required.", command.command, self.name
+                )
+            if command.supported:
+                logger.error("Command '%s' failed on %s: %s", command.command, self.name, error.errors[0] if len(error.errors) == 1 else error.errors)
+            else:
+                logger.debug("Command '%s' is not supported on '%s' (%s)", command.command, self.name, self.hw_model)
+        return not_executed
 
     async def refresh(self) -> None:
         """Update attributes of an AsyncEOSDevice instance.
@@ -455,22 +1141,36 @@ class AsyncEOSDevice(AntaDevice):
         - hw_model: The hardware model of the device
         """
         logger.debug("Refreshing device %s", self.name)
-        self.is_online = await self._session.check_connection()
-        if self.is_online:
-            show_version = AntaCommand(command="show version")
+        self.connect_timings = {}
+        if self.probe:
+            with self._connect_phase("probe"):
+                self.is_online = await self._session.check_connection(timeout=self.probe_timeout)
+            if not self.is_online:
+                logger.warning("Could not connect to device %s: cannot open eAPI port", self.name)
+                self.established = False
+                return
+        # Same revision as the tests using 'show version' so that its output is served from the cache to these tests
+        show_version = AntaCommand(command="show version", revision=1)
+        self._connect_failed = False
+        with self._connect_phase("show version"):
             await self._collect(show_version)
-            if not show_version.collected:
+        await self._cache_output(show_version)
+        if not self.probe:
+            # The device is reachable if the eAPI request has reached the device, even if the command has failed
+            self.is_online = not self._connect_failed
+            if not self.is_online:
+                logger.warning("Could not connect to device %s: cannot open eAPI connection", self.name)
+        if not show_version.collected:
+            if self.is_online:
                 logger.warning("Cannot get hardware information from device %s", self.name)
-            else:
-                self.hw_model = show_version.json_output.get("modelName", None)
-                if self.hw_model is None:
-                    logger.critical("Cannot parse 'show version' returned by device %s", self.name)
-                # in some cases it is possible that 'modelName' comes back empty
-                # and it is nice to get a meaninfule error message
-                elif self.hw_model == "":
-                    logger.critical("Got an empty 'modelName' in the 'show version' returned by device %s", self.name)
         else:
-            logger.warning("Could not connect to device %s: cannot open eAPI port", self.name)
+            self.hw_model = show_version.json_output.get("modelName", None)
+            if self.hw_model is None:
+                logger.critical("Cannot parse 'show version' returned by device %s", self.name)
+            # in some cases it is possible that 'modelName' comes back empty
+            # and it is nice to get a meaninfule error message
+            elif self.hw_model == "":
+                logger.critical("Got an empty 'modelName' in the 'show version' returned by device %s", self.name)
 
         self.established = bool(self.is_online and self.hw_model)
 
@@ -516,3 +1216,114 @@ class AsyncEOSDevice(AntaDevice):
 
                 return
             await asyncssh.scp(src, dst)
+
+
+class ReplayDevice(AntaDevice):
+    """Implementation of AntaDevice replaying the command outputs of an `anta exec snapshot` instead of collecting them on a device.
+
+    The tests of a catalog can be evaluated against the state of the devices captured in the snapshot, without any connection to the devices.
+    The command outputs are looked up in the snapshot by device name, command and output format: the version and the revision
+    of the commands are ignored. The outputs of a recording filtered by JSON paths are only replayed for the same JSON paths.
+
+    Attributes
+    ----------
+    name : str
+        Device name, the name of the device in the snapshot.
+    is_online : bool
+        True if the device is in the snapshot.
+    established : bool
+        True if the hardware model of the device can be read from the `show version` output of the snapshot.
+    hw_model : str
+        Hardware model of the device.
+    tags : set[str]
+        Tags for this device.
+    snapshot : Snapshot
+        The snapshot replayed by the device.
+    """
+
+    def __init__(self, name: str, snapshot: Snapshot, tags: set[str] | None = None, *, disable_cache: bool = False) -> None:
+        """Instantiate a ReplayDevice.
+
+        Parameters
+        ----------
+        name
+            Device name, the name of the device in the snapshot.
+        snapshot
+            The snapshot replayed by the device.
+        tags
+            Tags for this device.
+        disable_cache
+            Disable caching for all commands for this device.
+        """
+        super().__init__(name, tags, disable_cache=disable_cache)
+        self.snapshot = snapshot
+
+    def __rich_repr__(self) -> Iterator[tuple[str, Any]]:
+        """Implement Rich Repr Protocol.
+
+        https://rich.readthedocs.io/en/stable/pretty.html#rich-repr-protocol.
+        """
+        yield from super().__rich_repr__()
+        yield ("snapshot", self.snapshot.path)
+
+    def __repr__(self) -> str:
+        """Return a printable representation of a ReplayDevice."""
+        return (
+            f"ReplayDevice({self.name!r}, "
+            f"tags={self.tags!r}, "
+            f"hw_model={self.hw_model!r}, "
+            f"is_online={self.is_online!r}, "
+            f"established={self.established!r}, "
+            f"disable_cache={self.cache is None!r}, "
+            f"snapshot={str(self.snapshot.path)!r})"
+        )
+
+    @property
+    def _keys(self) -> tuple[Any, ...]:
+        """Two ReplayDevice objects are equal if they replay the same device of the same snapshot."""
+        return (self.name, self.snapshot.path)
+
+    async def _collect(self, command: AntaCommand, *, collection_id: str | None = None) -> None:  # noqa: ARG002
+        """Read the command output from the snapshot.
+
+        The JSON paths of the command, if any, are selected in the JSON output like the eAPI responses of AsyncEOSDevice.
+
+        Parameters
+        ----------
+        command
+            The command to collect.
+        collection_id
+            An identifier used to build the eAPI request ID, not used.
+        """
+        output = self.snapshot.read(self.name, command.command, command.ofmt, command.json_paths)
+        if output is None:
+            command.errors = [f"Command '{command.command}' with output format '{command.ofmt}' is not in the snapshot {self.snapshot.path}"]
+        elif command.ofmt == "json":
+            try:
+                command.output = select_paths(json.loads(output), command.json_paths)
+            except json.JSONDecodeError as e:
+                command.errors = [f"Cannot parse the output of '{command.command}' in the snapshot {self.snapshot.path}: {e}"]
+        else:
+            command.output = output
+        logger.debug("%s: %s", self.name, command)
+
+    async def refresh(self) -> None:
+        """Update attributes of a ReplayDevice instance from the `show version` output of the snapshot."""
+        logger.debug("Refreshing device %s", self.name)
+        self.connect_timings = {}
+        self.is_online = self.name in self.snapshot.devices
+        if not self.is_online:
+            logger.warning("Device %s is not in the snapshot %s", self.name, self.snapshot.path)
+            self.established = False
+            return
+        show_version = AntaCommand(command="show version", revision=1)
+        with self._connect_phase("show version"):
+            await self._collect(show_version)
+        await self._cache_output(show_version)
+        if not show_version.collected:
+            logger.warning("Cannot get hardware information from device %s: %s", self.name, show_version.errors[0])
+        else:
+            self.hw_model = show_version.json_output.get("modelName", None)
+            if not self.hw_model:
+                logger.critical("Cannot parse 'show version' of device %s in the snapshot %s", self.name, self.snapshot.path)
+        self.established = bool(self.hw_model)
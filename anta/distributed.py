@@ -0,0 +1,516 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""Distributed ANTA runner.
+
+A coordinator partitions the inventory and the catalog into work units, i.e. shards of devices with the tests
+to run on them, and sends them to worker processes connected over TCP or a Unix socket. Each worker runs its
+work units with `anta.runner.main` and streams the test results back to the coordinator.
+
+The messages are JSON objects, one per line:
+
+| Sender      | Type     | Content                                                          |
+| ----------- | -------- | ---------------------------------------------------------------- |
+| worker      | `hello`  | Shared token of the coordinator and the workers, first message   |
+| coordinator | `unit`   | Work unit ID, device names, tags, catalog and number of tests    |
+| coordinator | `stop`   | No more work unit to run, the worker can exit                    |
+| coordinator | `error`  | Invalid `hello` message, the coordinator closes the connection   |
+| worker      | `result` | Work unit ID and a test result                                   |
+| worker      | `done`   | Work unit ID, all the test results of the work unit have been sent |
+
+If the connection to a worker is lost before a work unit is done, or the worker does not send any message for
+the worker timeout, its results are discarded and the work unit is sent to another worker. If no worker makes
+progress for the worker timeout, e.g. no worker is connected, the remaining work units fail with an error result.
+The tests of a work unit without a result from its worker, e.g. a device missing from the worker inventory, fail with an error result.
+
+Trust model: the workers load the catalog sent by the coordinator, which can reference any Python module, and the coordinator
+reports the test results sent by the workers. The coordinator only accepts the workers sending its shared token in their `hello`
+message, a token is required to listen on TCP. The Unix socket of a coordinator is only accessible to its user. The messages
+are not encrypted: over TCP, the coordinator must listen on a trusted network, e.g. on localhost with SSH tunnels to the workers.
+The workers trust the coordinator at the address they are given.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hmac
+import json
+import logging
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from anta.catalog import AntaCatalog
+from anta.logger import exc_to_str
+from anta.models import AntaTest
+from anta.result_manager import ResultManager
+from anta.result_manager.models import TestResult
+from anta.runner import DEFAULT_MAX_CONCURRENCY, _notify_result, main, prepare_tests
+from anta.tools import Catchtime
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from anta.catalog import AntaTestDefinition
+    from anta.inventory import AntaInventory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD_SIZE = 50
+DEFAULT_CONNECT_TIMEOUT = 30.0
+DEFAULT_WORKER_TIMEOUT = 300.0
+CONNECT_RETRY_INTERVAL = 0.5
+# Maximum length of a message, the work units include the catalog of their devices
+STREAM_LIMIT = 2**26
+# Keys of a work unit sent to the workers, the other keys are only used by the coordinator
+UNIT_MESSAGE_KEYS = ("devices", "tags", "count", "catalog")
+
+
+def parse_address(address: str) -> tuple[str, int] | str:
+    """Parse the address of a coordinator.
+
+    Parameters
+    ----------
+    address
+        Either `unix:<path>` for a Unix socket or `<host>:<port>` for TCP.
+
+    Returns
+    -------
+    tuple[str, int] | str
+        The path of the Unix socket or the host and port.
+    """
+    if address.startswith("unix:"):
+        return address.removeprefix("unix:")
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        msg = f"Invalid coordinator address '{address}': expecting 'unix:<path>' or '<host>:<port>'"
+        raise ValueError(msg)
+    return host.strip("[]"), int(port)
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+    """Send a message as a JSON line."""
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+async def _receive(reader: asyncio.StreamReader) -> dict[str, Any] | None:
+    """Receive a message, return None if the connection has been closed."""
+    line = await reader.readline()
+    return json.loads(line) if line else None
+
+
+def _dump_catalog(tests: list[AntaTestDefinition]) -> dict[str, list[dict[str, Any]]]:
+    """Return the catalog data of a list of tests, as loaded by `AntaCatalog.from_dict`."""
+    data: dict[str, list[dict[str, Any]]] = {}
+    for test in tests:
+        data.setdefault(test.test.__module__, []).append(test.model_dump(mode="json", serialize_as_any=True, exclude_unset=True))
+    return data
+
+
+class Coordinator:  # pylint: disable=too-many-instance-attributes
+    """Distribute work units to the connected workers and collect their results.
+
+    Parameters
+    ----------
+    units
+        The work units to run, as returned by `prepare_units`.
+    on_result
+        Function or coroutine function called with each `TestResult` once its work unit is done.
+    timeout
+        Time in seconds to wait for a message of a worker running a work unit and for any worker to make progress.
+    token
+        Shared token the workers must send in their `hello` message. None means the workers are not authenticated.
+    """
+
+    def __init__(
+        self,
+        units: list[dict[str, Any]],
+        on_result: Callable[[TestResult], Awaitable[None] | None] | None = None,
+        timeout: float = DEFAULT_WORKER_TIMEOUT,
+        token: str | None = None,
+    ) -> None:
+        """Initialize a Coordinator instance."""
+        self.units = units
+        self.results: list[TestResult] = []
+        self.on_result = on_result
+        self.timeout = timeout
+        self.token = token
+        self._pending: deque[int] = deque(range(len(units)))
+        self._running: set[int] = set()
+        self._available = asyncio.Condition()
+        self._completed: set[int] = set()
+        self._writers: set[asyncio.StreamWriter] = set()
+        # Time of the last worker connection, message or work unit handover, see `wait()`
+        self._last_activity = time.monotonic()
+
+    @property
+    def done(self) -> bool:
+        """Whether all the work units are done."""
+        return len(self._completed) == len(self.units)
+
+    async def _next_unit(self) -> int | None:
+        """Wait for a pending work unit, return None when all the work units are done."""
+        async with self._available:
+            await self._available.wait_for(lambda: self._pending or self.done)
+            if not self._pending:
+                return None
+            unit_id = self._pending.popleft()
+            self._running.add(unit_id)
+            self._last_activity = time.monotonic()
+            return unit_id
+
+    async def _requeue(self, unit_id: int) -> None:
+        """Put back a work unit in the pending work units."""
+        async with self._available:
+            self._running.discard(unit_id)
+            if unit_id not in self._completed:
+                self._pending.appendleft(unit_id)
+                self._last_activity = time.monotonic()
+                # Wake up `wait()` as well as the idle workers
+                self._available.notify_all()
+
+    async def _complete(self, unit_id: int, results: list[TestResult]) -> None:
+        """Mark a work unit as done and process its results, the results of a work unit already done are discarded."""
+        if unit_id in self._completed:
+            return
+        self._completed.add(unit_id)
+        self._running.discard(unit_id)
+        for result in results:
+            self.results.append(result)
+            AntaTest.update_progress()
+            if self.on_result is not None:
+                await _notify_result(self.on_result, result)
+        async with self._available:
+            self._available.notify_all()
+
+    async def _receive_results(self, reader: asyncio.StreamReader) -> list[TestResult]:
+        """Receive the results of a work unit until the worker sends the `done` message.
+
+        Raises
+        ------
+        ConnectionError
+            If the connection is closed by the worker.
+        asyncio.TimeoutError
+            If the worker does not send any message for `timeout` seconds.
+        """
+        results: list[TestResult] = []
+        while (message := await asyncio.wait_for(_receive(reader), timeout=self.timeout)) is not None and message["type"] == "result":
+            self._last_activity = time.monotonic()
+            results.append(TestResult.model_validate(message["result"]))
+        if message is None:
+            msg = "Connection closed by the worker"
+            raise ConnectionError(msg)
+        self._last_activity = time.monotonic()
+        return results
+
+    async def _authenticate(self, reader: asyncio.StreamReader) -> bool:
+        """Receive the `hello` message of a worker, return True if it has sent the token of the coordinator."""
+        message = await asyncio.wait_for(_receive(reader), timeout=self.timeout)
+        if message is None or message.get("type") != "hello":
+            return False
+        if self.token is None:
+            return True
+        token = message.get("token")
+        return isinstance(token, str) and hmac.compare_digest(token.encode(), self.token.encode())
+
+    async def handle_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Send work units to a connected worker until all the work units are done."""
+        peer = writer.get_extra_info("peername") or "unix socket"
+        unit_id = None
+        try:
+            if not await self._authenticate(reader):
+                logger.warning("Rejected worker %s: invalid token", peer)
+                await _send(writer, {"type": "error", "message": "Invalid token"})
+                return
+            logger.info("Worker connected: %s", peer)
+            self._last_activity = time.monotonic()
+            self._writers.add(writer)
+            while (unit_id := await self._next_unit()) is not None:
+                unit = self.units[unit_id]
+                await _send(writer, {"type": "unit", "id": unit_id, **{key: unit[key] for key in UNIT_MESSAGE_KEYS}})
+                results = await self._receive_results(reader)
+                await self._complete(unit_id, results + _missing_results(unit, results))
+                unit_id = None
+            await _send(writer, {"type": "stop"})
+        except (ConnectionError, ValueError, KeyError, asyncio.TimeoutError) as e:
+            # ValueError and KeyError are raised by invalid messages
+            logger.warning("Lost worker %s: %s", peer, exc_to_str(e))
+            if unit_id is not None:
+                logger.warning("Work unit %s of worker %s has been requeued", unit_id, peer)
+                await self._requeue(unit_id)
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def wait(self) -> None:
+        """Wait until all the work units are done or no worker has made progress for `timeout` seconds.
+
+        While a work unit is running, its worker is bound by the message timeout of `handle_worker`. Otherwise, if no work unit
+        has been sent to a worker for `timeout` seconds, the connections to the workers are closed and the remaining work units
+        fail with an error result.
+        """
+        async with self._available:
+            while not self.done:
+                if self._running:
+                    await self._available.wait()
+                    continue
+                if (remaining := self._last_activity + self.timeout - time.monotonic()) <= 0:
+                    break
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._available.wait(), timeout=remaining)
+        if self.done:
+            return
+        logger.error("No worker has made progress for %s seconds, the remaining work units fail", self.timeout)
+        for writer in self._writers:
+            writer.close()
+        message = f"No worker has run this test within the worker timeout of {self.timeout} seconds"
+        for unit_id, unit in enumerate(self.units):
+            if unit_id not in self._completed:
+                await self._complete(unit_id, _error_results(unit, message))
+
+
+def _error_result(device: str, test: AntaTestDefinition, message: str) -> TestResult:
+    """Return the error result of a test that has not been run on a device."""
+    result = TestResult(name=device, test=test.test.name, categories=test.test.categories, description=test.test.description)
+    result.is_error(message)
+    return result
+
+
+def _error_results(unit: dict[str, Any], message: str) -> list[TestResult]:
+    """Return the error results of the tests of a work unit that has not been run."""
+    return [_error_result(device, test, message) for device, tests in unit["tests"].items() for test in tests]
+
+
+def _missing_results(unit: dict[str, Any], results: list[TestResult]) -> list[TestResult]:
+    """Return the error results of the tests of a work unit without a result from the worker, e.g. on a device missing from the worker inventory."""
+    if len(results) >= unit["count"]:
+        return []
+    received = Counter((result.name, result.test) for result in results)
+    missing = []
+    for device, tests in unit["tests"].items():
+        for test in tests:
+            if received[(device, test.test.name)] > 0:
+                received[(device, test.test.name)] -= 1
+            else:
+                missing.append(_error_result(device, test, "The worker has not returned a result for this test, is the device in the worker inventory?"))
+    return missing
+
+
+def prepare_units(
+    inventory: AntaInventory, catalog: AntaCatalog, *, shard_size: int, tags: set[str] | None = None, tests: set[str] | None = None
+) -> list[dict[str, Any]]:
+    """Partition the inventory and the catalog into work units.
+
+    Parameters
+    ----------
+    inventory
+        AntaInventory object that includes the selected device(s).
+    catalog
+        AntaCatalog object that includes the list of tests.
+    shard_size
+        Maximum number of devices in a work unit.
+    tags
+        Tags to filter devices from the inventory.
+    tests
+        Tests to run against devices. None means all tests.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        The work units, each one with the device names, the tags, the catalog and the number of the tests to run on these devices.
+        The test definitions of each device are also kept in the work unit to report an error if the work unit cannot be run.
+    """
+    if shard_size < 1:
+        msg = f"The shard size must be a positive integer, got {shard_size}"
+        raise ValueError(msg)
+    if (selected_tests := prepare_tests(inventory, catalog, tests, tags)) is None:
+        return []
+    devices = list(selected_tests)
+    units = []
+    for index in range(0, len(devices), shard_size):
+        shard = devices[index : index + shard_size]
+        shard_tests = set().union(*(selected_tests[device] for device in shard))
+        units.append(
+            {
+                "devices": [device.name for device in shard],
+                "tags": sorted(tags) if tags else None,
+                "count": sum(len(selected_tests[device]) for device in shard),
+                # Keep the order of the catalog
+                "catalog": _dump_catalog([test for test in catalog.tests if test in shard_tests]),
+                # Not sent to the workers
+                "tests": {device.name: list(selected_tests[device]) for device in shard},
+            }
+        )
+    return units
+
+
+async def coordinate(  # noqa: PLR0913
+    manager: ResultManager,
+    inventory: AntaInventory,
+    catalog: AntaCatalog,
+    address: str,
+    *,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    devices: set[str] | None = None,
+    tests: set[str] | None = None,
+    tags: set[str] | None = None,
+    on_result: Callable[[TestResult], Awaitable[None] | None] | None = None,
+    worker_timeout: float = DEFAULT_WORKER_TIMEOUT,
+    token: str | None = None,
+) -> None:
+    """Run ANTA as the coordinator of workers started with `work`.
+
+    The coordinator does not connect to the devices: the workers connect to the devices of their work units
+    using their own inventory, which must include the devices of the coordinator inventory.
+
+    Parameters
+    ----------
+    manager
+        ResultManager object to populate with the test results.
+    inventory
+        AntaInventory object that includes the device(s).
+    catalog
+        AntaCatalog object that includes the list of tests.
+    address
+        Address to listen on for workers, either `unix:<path>` or `<host>:<port>`.
+    shard_size
+        Maximum number of devices in a work unit.
+    devices
+        Devices on which to run tests. None means all devices.
+    tests
+        Tests to run against devices. None means all tests.
+    tags
+        Tags to filter devices from the inventory.
+    on_result
+        Function or coroutine function called with each `TestResult` once its work unit is done.
+    worker_timeout
+        Time in seconds to wait for a message of a worker running a work unit, its work unit is sent to another worker afterwards.
+        If no worker makes progress during this time, e.g. no worker is connected, the remaining tests fail with an error result.
+    token
+        Shared token the workers must send to be accepted, required to listen on TCP. See the trust model of `anta.distributed`.
+
+    Raises
+    ------
+    ValueError
+        If the address is a TCP address and no token is provided.
+    """
+    parsed_address = parse_address(address)
+    if not isinstance(parsed_address, str) and not token:
+        msg = f"A token is required to listen for workers on the TCP address '{address}'"
+        raise ValueError(msg)
+    if not catalog.tests:
+        logger.info("The list of tests is empty, exiting")
+        return
+    selected_inventory = inventory.get_inventory(tags=tags, devices=devices) if tags or devices else inventory
+    with Catchtime(logger=logger, message="Preparing the work units"):
+        units = prepare_units(selected_inventory, catalog, shard_size=shard_size, tags=tags, tests=tests)
+    if not units:
+        return
+
+    coordinator = Coordinator(units, on_result=on_result, timeout=worker_timeout, token=token)
+    if AntaTest.progress is not None:
+        AntaTest.nrfu_task = AntaTest.progress.add_task("Running NRFU Tests...", total=sum(unit["count"] for unit in units))
+
+    if isinstance(parsed_address, str):
+        server = await asyncio.start_unix_server(coordinator.handle_worker, parsed_address, limit=STREAM_LIMIT)
+        # Only the user of the coordinator can connect to the socket
+        Path(parsed_address).chmod(0o600)
+    else:
+        server = await asyncio.start_server(coordinator.handle_worker, *parsed_address, limit=STREAM_LIMIT)
+    logger.info("Waiting for workers on %s to run %s work units", address, len(units))
+    with Catchtime(logger=logger, message="Running ANTA tests"):
+        async with server:
+            await coordinator.wait()
+    for result in coordinator.results:
+        manager.add(result)
+
+
+async def _open_connection(address: tuple[str, int] | str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Open a connection to a parsed coordinator address."""
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address, limit=STREAM_LIMIT)
+    return await asyncio.open_connection(*address, limit=STREAM_LIMIT)
+
+
+async def _connect(address: str, connect_timeout: float) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to a coordinator, retrying until the coordinator is listening or the timeout expires."""
+    parsed_address = parse_address(address)
+    deadline = asyncio.get_running_loop().time() + connect_timeout
+    while asyncio.get_running_loop().time() < deadline:
+        with contextlib.suppress(OSError):
+            return await _open_connection(parsed_address)
+        logger.debug("Coordinator %s is not reachable, retrying in %s second(s)", address, CONNECT_RETRY_INTERVAL)
+        await asyncio.sleep(CONNECT_RETRY_INTERVAL)
+    # Last attempt, raising the connection error
+    return await _open_connection(parsed_address)
+
+
+async def work(
+    inventory: AntaInventory,
+    address: str,
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    token: str | None = None,
+) -> int:
+    """Run the work units of a coordinator started with `coordinate`.
+
+    Parameters
+    ----------
+    inventory
+        AntaInventory object that includes the devices of the work units.
+    address
+        Address of the coordinator, either `unix:<path>` or `<host>:<port>`.
+    max_concurrency
+        Maximum number of tests to run concurrently.
+    connect_timeout
+        Time in seconds to wait for the coordinator to be listening.
+    token
+        Shared token of the coordinator. The worker loads the catalogs sent by the coordinator, see the trust model of `anta.distributed`.
+
+    Returns
+    -------
+    int
+        The number of work units run by this worker.
+
+    Raises
+    ------
+    ConnectionError
+        If the coordinator closes the connection before sending a `stop` message, e.g. if it has rejected the token of the worker.
+    """
+    reader, writer = await _connect(address, connect_timeout)
+    logger.info("Connected to coordinator %s", address)
+    count = 0
+    try:
+        await _send(writer, {"type": "hello", "token": token})
+        while (message := await _receive(reader)) is not None and message["type"] == "unit":
+            unit_id = message["id"]
+            logger.info("Running work unit %s on %s devices", unit_id, len(message["devices"]))
+
+            async def _send_result(result: TestResult, unit_id: int = unit_id) -> None:
+                await _send(writer, {"type": "result", "id": unit_id, "result": result.model_dump(mode="json")})
+
+            await main(
+                ResultManager(),
+                inventory,
+                AntaCatalog.from_dict(message["catalog"]),
+                devices=set(message["devices"]),
+                tags=set(message["tags"]) if message["tags"] else None,
+                max_concurrency=max_concurrency,
+                on_result=_send_result,
+            )
+            await _send(writer, {"type": "done", "id": unit_id})
+            count += 1
+        if message is None:
+            msg = "The coordinator has closed the connection"
+            raise ConnectionError(msg)
+        if message["type"] == "error":
+            msg = f"The coordinator has rejected the worker: {message['message']}"
+            raise ConnectionError(msg)
+    finally:
+        writer.close()
+    logger.info("Worker done, %s work units have been run", count)
+    return count
@@ -7,20 +7,30 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections import defaultdict
 from ipaddress import ip_address, ip_network
 from pathlib import Path
-from typing import Any, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from pydantic import ValidationError
 from yaml import YAMLError, safe_load
 
+from anta.cache import CacheBudget
 from anta.device import AntaDevice, AsyncEOSDevice
 from anta.inventory.exceptions import InventoryIncorrectSchemaError, InventoryRootKeyError
 from anta.inventory.models import AntaInventoryInput
 from anta.logger import anta_log_exception
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from anta.models import AntaCommand
+
 logger = logging.getLogger(__name__)
 
+# Default maximum number of devices refreshed concurrently when connecting to the inventory
+DEFAULT_CONNECT_CONCURRENCY = 500
+
 
 class AntaInventory(dict[str, AntaDevice]):
     """Inventory abstraction for ANTA framework."""
@@ -56,6 +66,23 @@ class AntaInventory(dict[str, AntaDevice]):
         updated_kwargs["disable_cache"] = inventory_disable_cache or kwargs.get("disable_cache")
         return updated_kwargs
 
+    @staticmethod
+    def _update_max_concurrent_requests(kwargs: dict[str, Any], *, inventory_max_concurrent_requests: int | None) -> dict[str, Any]:
+        """Return new dictionary, replacing kwargs with max_concurrent_requests value from the inventory if it is set.
+
+        Parameters
+        ----------
+        inventory_max_concurrent_requests
+            The value of max_concurrent_requests in the inventory.
+        kwargs
+            The kwargs to instantiate the device.
+
+        """
+        updated_kwargs = kwargs.copy()
+        if inventory_max_concurrent_requests is not None:
+            updated_kwargs["max_concurrent_requests"] = inventory_max_concurrent_requests
+        return updated_kwargs
+
     @staticmethod
     def _parse_hosts(
         inventory_input: AntaInventoryInput,
@@ -79,6 +106,7 @@ class AntaInventory(dict[str, AntaDevice]):
 
         for host in inventory_input.hosts:
             updated_kwargs = AntaInventory._update_disable_cache(kwargs, inventory_disable_cache=host.disable_cache)
+            updated_kwargs = AntaInventory._update_max_concurrent_requests(updated_kwargs, inventory_max_concurrent_requests=host.max_concurrent_requests)
             device = AsyncEOSDevice(
                 name=host.name,
                 host=str(host.host),
@@ -117,6 +145,7 @@ class AntaInventory(dict[str, AntaDevice]):
         try:
             for network in inventory_input.networks:
                 updated_kwargs = AntaInventory._update_disable_cache(kwargs, inventory_disable_cache=network.disable_cache)
+                updated_kwargs = AntaInventory._update_max_concurrent_requests(updated_kwargs, inventory_max_concurrent_requests=network.max_concurrent_requests)
                 for host_ip in ip_network(str(network.network)):
                     device = AsyncEOSDevice(host=str(host_ip), tags=network.tags, **updated_kwargs)
                     inventory.add_device(device)
@@ -154,6 +183,7 @@ class AntaInventory(dict[str, AntaDevice]):
         try:
             for range_def in inventory_input.ranges:
                 updated_kwargs = AntaInventory._update_disable_cache(kwargs, inventory_disable_cache=range_def.disable_cache)
+                updated_kwargs = AntaInventory._update_max_concurrent_requests(updated_kwargs, inventory_max_concurrent_requests=range_def.max_concurrent_requests)
                 range_increment = ip_address(str(range_def.start))
                 range_stop = ip_address(str(range_def.end))
                 while range_increment <= range_stop:  # type: ignore[operator]
@@ -182,6 +212,9 @@ class AntaInventory(dict[str, AntaDevice]):
         enable: bool = False,
         insecure: bool = False,
         disable_cache: bool = False,
+        cache_max_total_size: int | None = None,
+        cache_max_total_entries: int | None = None,
+        **kwargs: Any,  # noqa: ANN401
     ) -> AntaInventory:
         """Create an AntaInventory instance from an inventory file.
 
@@ -205,6 +238,13 @@ class AntaInventory(dict[str, AntaDevice]):
             Disable SSH Host Key validation.
         disable_cache
             Disable cache globally.
+        cache_max_total_size
+            Maximum size in bytes of the command outputs stored in the memory caches of all the devices. None means no limit.
+        cache_max_total_entries
+            Maximum number of command outputs stored in the memory caches of all the devices. None means no limit.
+        **kwargs
+            Additional keyword arguments to pass to the device constructor, e.g. the cache, batching, retry and connection options
+            of `AsyncEOSDevice`. `max_concurrent_requests` can be overridden per device in the inventory file.
 
         Raises
         ------
@@ -215,7 +255,7 @@ class AntaInventory(dict[str, AntaDevice]):
 
         """
         inventory = AntaInventory()
-        kwargs: dict[str, Any] = {
+        device_kwargs: dict[str, Any] = {
             "username": username,
             "password": password,
             "enable": enable,
@@ -223,6 +263,10 @@ class AntaInventory(dict[str, AntaDevice]):
             "timeout": timeout,
             "insecure": insecure,
             "disable_cache": disable_cache,
+            "cache_budget": CacheBudget(max_entries=cache_max_total_entries, max_size=cache_max_total_size)
+            if cache_max_total_entries is not None or cache_max_total_size is not None
+            else None,
+            **kwargs,
         }
         if username is None:
             message = "'username' is required to create an AntaInventory"
@@ -254,9 +298,9 @@ class AntaInventory(dict[str, AntaDevice]):
             raise
 
         # Read data from input
-        AntaInventory._parse_hosts(inventory_input, inventory, **kwargs)
-        AntaInventory._parse_networks(inventory_input, inventory, **kwargs)
-        AntaInventory._parse_ranges(inventory_input, inventory, **kwargs)
+        AntaInventory._parse_hosts(inventory_input, inventory, **device_kwargs)
+        AntaInventory._parse_networks(inventory_input, inventory, **device_kwargs)
+        AntaInventory._parse_ranges(inventory_input, inventory, **device_kwargs)
 
         return inventory
 
@@ -331,14 +375,52 @@ class AntaInventory(dict[str, AntaDevice]):
     # MISC methods
     ###########################################################################
 
-    async def connect_inventory(self) -> None:
-        """Run `refresh()` coroutines for all AntaDevice objects in this inventory."""
+    async def connect_inventory(self, max_concurrency: int = DEFAULT_CONNECT_CONCURRENCY, preload_commands: Sequence[AntaCommand] | None = None) -> None:
+        """Run `refresh()` coroutines for all AntaDevice objects in this inventory.
+
+        The time spent in each phase of `refresh()` is logged for all the devices, see `AntaDevice.connect_timings`.
+
+        Parameters
+        ----------
+        max_concurrency
+            Maximum number of devices refreshed concurrently, to avoid opening connections to a large inventory all at once.
+        preload_commands
+            Commands collected on the established devices once refreshed, their outputs are stored in the device cache
+            to be shared by all the tests using them. See `AntaDevice.preload()`.
+        """
         logger.debug("Refreshing devices...")
+        if max_concurrency < 1:
+            msg = f"The connect concurrency limit must be a positive integer, got {max_concurrency}"
+            raise ValueError(msg)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def refresh(device: AntaDevice) -> None:
+            async with semaphore:
+                await device.refresh()
+                if preload_commands and device.established:
+                    await device.preload(preload_commands)
+
         results = await asyncio.gather(
-            *(device.refresh() for device in self.values()),
+            *(refresh(device) for device in self.values()),
             return_exceptions=True,
         )
         for r in results:
             if isinstance(r, Exception):
                 message = "Error when refreshing inventory"
                 anta_log_exception(r, message, logger)
+        self._log_connect_timings()
+
+    def _log_connect_timings(self) -> None:
+        """Log the time spent in each phase of `refresh()` for all the devices of the inventory."""
+        phases: defaultdict[str, list[float]] = defaultdict(list)
+        for device in self.values():
+            for phase, timing in device.connect_timings.items():
+                phases[phase].append(timing)
+        for phase, timings in phases.items():
+            logger.info(
+                "Connect phase '%s': %s device(s), %.3fs on average, %.3fs max",
+                phase,
+                len(timings),
+                sum(timings) / len(timings),
+                max(timings),
+            )
@@ -9,7 +9,7 @@ import logging
 import math
 
 import yaml
-from pydantic import BaseModel, ConfigDict, IPvAnyAddress, IPvAnyNetwork
+from pydantic import BaseModel, ConfigDict, IPvAnyAddress, IPvAnyNetwork, PositiveInt
 
 from anta.custom_types import Hostname, Port
 
@@ -31,6 +31,8 @@ class AntaInventoryHost(BaseModel):
         Tags of the device.
     disable_cache : bool
         Disable cache for this device.
+    max_concurrent_requests : PositiveInt | None
+        Maximum number of concurrent eAPI requests for this device. Overrides the global setting.
 
     """
 
@@ -41,6 +43,7 @@ class AntaInventoryHost(BaseModel):
     port: Port | None = None
     tags: set[str] | None = None
     disable_cache: bool = False
+    max_concurrent_requests: PositiveInt | None = None
 
 
 class AntaInventoryNetwork(BaseModel):
@@ -54,6 +57,8 @@ class AntaInventoryNetwork(BaseModel):
         Tags of the devices in this network.
     disable_cache : bool
         Disable cache for all devices in this network.
+    max_concurrent_requests : PositiveInt | None
+        Maximum number of concurrent eAPI requests for all devices in this network. Overrides the global setting.
 
     """
 
@@ -62,6 +67,7 @@ class AntaInventoryNetwork(BaseModel):
     network: IPvAnyNetwork
     tags: set[str] | None = None
     disable_cache: bool = False
+    max_concurrent_requests: PositiveInt | None = None
 
 
 class AntaInventoryRange(BaseModel):
@@ -77,6 +83,8 @@ class AntaInventoryRange(BaseModel):
         Tags of the devices in this IP range.
     disable_cache : bool
         Disable cache for all devices in this IP range.
+    max_concurrent_requests : PositiveInt | None
+        Maximum number of concurrent eAPI requests for all devices in this IP range. Overrides the global setting.
 
     """
 
@@ -86,6 +94,7 @@ class AntaInventoryRange(BaseModel):
     end: IPvAnyAddress
     tags: set[str] | None = None
     disable_cache: bool = False
+    max_concurrent_requests: PositiveInt | None = None
 
 
 class AntaInventoryInput(BaseModel):
@@ -5,44 +5,132 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
 import re
 from abc import ABC, abstractmethod
-from functools import wraps
+from functools import lru_cache, wraps
 from string import Formatter
 from typing import TYPE_CHECKING, Any, Callable, ClassVar, Literal, TypeVar
 
-from pydantic import BaseModel, ConfigDict, ValidationError, create_model
+from pydantic import BaseModel, ConfigDict, PositiveFloat, PositiveInt, ValidationError, create_model
 
 from anta import GITHUB_SUGGESTION
 from anta.custom_types import REGEXP_EOS_BLACKLIST_CMDS, Revision
 from anta.logger import anta_log_exception, exc_to_str
 from anta.result_manager.models import AntaTestStatus, TestResult
+from asynceapi.json_stream import escape_path_key
 
 if TYPE_CHECKING:
+    import sys
     from collections.abc import Coroutine
+    from concurrent.futures import Executor
 
     from rich.progress import Progress, TaskID
 
     from anta.device import AntaDevice
 
+    if sys.version_info >= (3, 11):
+        from typing import Self
+    else:
+        from typing_extensions import Self
+
 F = TypeVar("F", bound=Callable[..., Any])
+M = TypeVar("M", bound=BaseModel)
 # Proper way to type input class - revisit this later if we get any issue @gmuloc
 # This would imply overhead to define classes
 # https://stackoverflow.com/questions/74103528/type-hinting-an-instance-of-a-nested-class
 
 logger = logging.getLogger(__name__)
 
+# Keys of the values cached in the dictionary of an AntaTest.Input instance.
+# Pydantic ignores these keys as they are not fields, they are not pickled as they are only valid in the current process
+# and they are removed from the copies of the inputs, e.g. `model_copy(update=...)`.
+INPUTS_HASH_KEY = "__anta_hash__"
+INPUTS_RENDERED_COMMANDS_KEY = "__anta_rendered_commands__"
+
+# Key of the unique identifier memoized in the dictionary of an AntaCommand instance, see `AntaCommand.uid`
+COMMAND_UID_KEY = "__anta_uid__"
+# Fields of an AntaCommand the unique identifier depends on
+COMMAND_UID_FIELDS = frozenset({"command", "version", "revision", "ofmt", "json_paths"})
+
+# Attribute of the functions decorated by `AntaTest.anta_test` referencing the decorated function.
+# `functools.wraps` copies it to the wrappers of the other decorators, e.g. `anta.decorators.skip_on_platforms`.
+ANTA_TEST_FUNCTION_ATTR = "__anta_test_function__"
+
+# Single regular expression matching the commands blocked by any of the REGEXP_EOS_BLACKLIST_CMDS patterns
+BLOCKED_COMMANDS_REGEXP = re.compile("|".join(f"(?:{pattern})" for pattern in REGEXP_EOS_BLACKLIST_CMDS))
+
+
+@lru_cache(maxsize=65536)
+def is_blocked_command(command: str) -> bool:
+    """Return True if the command is blocked for security reason, the verdict is cached per command string."""
+    return BLOCKED_COMMANDS_REGEXP.match(command) is not None
+
+
+def _command_uid(command: AntaCommand) -> str:
+    """Compute the unique identifier of a command from its command, version, revision, output format and JSON paths."""
+    uid_str = f"{command.command}_{command.version}_{command.revision or 'NA'}_{command.ofmt}"
+    if command.json_paths is not None:
+        # The output only contains the subtrees at the JSON paths, the commands with the same JSON paths in a different order are identical
+        uid_str += f"_{','.join(sorted(command.json_paths))}"
+    # Ignoring S324 probable use of insecure hash function - sha1 is enough for our needs.
+    return hashlib.sha1(uid_str.encode()).hexdigest()  # noqa: S324
+
+
+def _reset_inputs_cache(values: dict[str, Any]) -> None:
+    """Remove the values cached in the dictionary of an AntaTest.Input instance."""
+    values.pop(INPUTS_HASH_KEY, None)
+    values.pop(INPUTS_RENDERED_COMMANDS_KEY, None)
+
+
+def _copy_model(model: M, **update: Any) -> M:  # noqa: ANN401
+    """Return a shallow copy of a validated model without extra fields nor private attributes, updating some fields without validation.
+
+    Lighter than `BaseModel.model_copy()` on the hot path of test instantiation: the copy and the fields set of the model
+    are plain dictionary and set copies instead of `copy.copy()` calls for the values, extra fields and private attributes.
+    """
+    copy = model.__class__.__new__(model.__class__)
+    values = model.__dict__.copy()
+    values.update(update)
+    object.__setattr__(copy, "__dict__", values)
+    object.__setattr__(copy, "__pydantic_fields_set__", model.__pydantic_fields_set__ | update.keys())
+    object.__setattr__(copy, "__pydantic_extra__", None)
+    object.__setattr__(copy, "__pydantic_private__", None)
+    return copy
+
 
 class AntaParamsBaseModel(BaseModel):
     """Extends BaseModel and overwrite __getattr__ to return None on missing attribute."""
 
     model_config = ConfigDict(extra="forbid")
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle the parameters by value as the AntaParams models are dynamically created by AntaTemplate."""
+        return (_rebuild_params, (dict(self),))
+
+
+@lru_cache
+def _params_model(field_names: tuple[str, ...]) -> type[AntaParamsBaseModel]:
+    """Create the AntaParams model storing the variables of AntaTemplate instances with these field names."""
+    # Extracting the type from the params based on the expected field_names from the template
+    fields: dict[str, Any] = {key: (Any, ...) for key in field_names}
+    return create_model(
+        "AntaParams",
+        __base__=AntaParamsBaseModel,
+        **fields,
+    )
+
+
+def _rebuild_params(values: dict[str, Any]) -> AntaParamsBaseModel:
+    """Rebuild an unpickled AntaParams instance."""
+    model = _params_model(tuple(values)) if values else AntaParamsBaseModel
+    return model(**values)
+
 
 class AntaTemplate:
-    """Class to define a command template as Python f-string.
+    r"""Class to define a command template as Python f-string.
 
     Can render a command from parameters.
 
@@ -58,11 +146,18 @@ class AntaTemplate:
         eAPI output - json or text.
     use_cache
         Enable or disable caching for this AntaTemplate if the AntaDevice supports it.
+    max_attempts
+        Maximum number of attempts of the rendered commands, overriding the retry policy of the AntaDevice if it supports it.
+    timeout
+        Timeout in seconds of the rendered commands, overriding the timeout of the AntaDevice if it supports it.
+    json_paths
+        JSON paths of the output used by the test, rendered with the same parameters as the template. Example: 'vrfs.{vrf}.routes'.
+        The dots of the parameters are escaped in the rendered JSON paths, e.g. 'vrfs.v\.1.routes' for the VRF 'v.1'.
     """
 
-    # pylint: disable=too-few-public-methods
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         template: str,
         version: Literal[1, "latest"] = "latest",
@@ -70,22 +165,35 @@ class AntaTemplate:
         ofmt: Literal["json", "text"] = "json",
         *,
         use_cache: bool = True,
+        max_attempts: int | None = None,
+        timeout: float | None = None,
+        json_paths: list[str] | None = None,
     ) -> None:
         self.template = template
         self.version = version
         self.revision = revision
         self.ofmt = ofmt
         self.use_cache = use_cache
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.json_paths = json_paths
+        self._init_params_schema()
+
+    def _init_params_schema(self) -> None:
+        """Create a AntaTemplateParams model to elegantly store AntaTemplate variables."""
+        field_names = tuple(fname for _, fname, _, _ in Formatter().parse(self.template) if fname)
+        self.params_schema = _params_model(field_names)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Return the state of the template to pickle, without the dynamically created `params_schema` model."""
+        state = self.__dict__.copy()
+        del state["params_schema"]
+        return state
 
-        # Create a AntaTemplateParams model to elegantly store AntaTemplate variables
-        field_names = [fname for _, fname, _, _ in Formatter().parse(self.template) if fname]
-        # Extracting the type from the params based on the expected field_names from the template
-        fields: dict[str, Any] = {key: (Any, ...) for key in field_names}
-        self.params_schema = create_model(
-            "AntaParams",
-            __base__=AntaParamsBaseModel,
-            **fields,
-        )
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the state of an unpickled template."""
+        self.__dict__.update(state)
+        self._init_params_schema()
 
     def __repr__(self) -> str:
         """Return the representation of the class.
@@ -118,6 +226,11 @@ class AntaTemplate:
         """
         try:
             command = self.template.format(**params)
+            json_paths = None
+            if self.json_paths is not None:
+                # A parameter is a single key of the JSON paths
+                path_params = {name: escape_path_key(str(value)) for name, value in params.items()}
+                json_paths = [path.format(**path_params) for path in self.json_paths]
         except (KeyError, SyntaxError) as e:
             raise AntaTemplateRenderError(self, e.args[0]) from e
         return AntaCommand(
@@ -128,6 +241,9 @@ class AntaTemplate:
             template=self,
             params=self.params_schema(**params),
             use_cache=self.use_cache,
+            max_attempts=self.max_attempts,
+            timeout=self.timeout,
+            json_paths=json_paths,
         )
 
 
@@ -165,6 +281,15 @@ class AntaCommand(BaseModel):
         Pydantic Model containing the variables values used to render the template.
     use_cache
         Enable or disable caching for this AntaCommand if the AntaDevice supports it.
+    max_attempts
+        Maximum number of attempts to collect this AntaCommand, overriding the retry policy of the AntaDevice if it supports it.
+    timeout
+        Timeout in seconds to collect this AntaCommand, overriding the timeout of the AntaDevice if it supports it.
+    json_paths
+        JSON paths of the output used by the test, as dot-separated keys of nested JSON objects. Example: 'vrfs.default.routes'.
+        The dots and backslashes of a key are escaped with a backslash, see `asynceapi.json_stream.escape_path_key()`.
+        Only the subtrees at these paths are kept in the output, the AntaDevice can use them to avoid materializing large outputs.
+        None means the whole output is kept.
 
     """
 
@@ -179,13 +304,38 @@ class AntaCommand(BaseModel):
     errors: list[str] = []
     params: AntaParamsBaseModel = AntaParamsBaseModel()
     use_cache: bool = True
+    max_attempts: PositiveInt | None = None
+    timeout: PositiveFloat | None = None
+    json_paths: list[str] | None = None
 
     @property
     def uid(self) -> str:
-        """Generate a unique identifier for this command."""
-        uid_str = f"{self.command}_{self.version}_{self.revision or 'NA'}_{self.ofmt}"
-        # Ignoring S324 probable use of insecure hash function - sha1 is enough for our needs.
-        return hashlib.sha1(uid_str.encode()).hexdigest()  # noqa: S324
+        """Return the unique identifier of this command.
+
+        The identifier is memoized in the instance and reset when a field it depends on is set. The copies of a command made
+        for the test instances, e.g. the static commands of a test class, share the identifier of the original command.
+        """
+        if (uid := self.__dict__.get(COMMAND_UID_KEY)) is None:
+            uid = self.__dict__[COMMAND_UID_KEY] = _command_uid(self)
+        return uid
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+        """Set an attribute, resetting the memoized unique identifier if it depends on this attribute."""
+        super().__setattr__(name, value)
+        if name in COMMAND_UID_FIELDS:
+            self.__dict__.pop(COMMAND_UID_KEY, None)
+
+    def __copy__(self) -> Self:
+        """Return a shallow copy of the command without the memoized unique identifier, `model_copy()` updates the fields of the copy."""
+        copy = super().__copy__()
+        copy.__dict__.pop(COMMAND_UID_KEY, None)
+        return copy
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> Self:
+        """Return a deep copy of the command without the memoized unique identifier, `model_copy()` updates the fields of the copy."""
+        copy = super().__deepcopy__(memo)
+        copy.__dict__.pop(COMMAND_UID_KEY, None)
+        return copy
 
     @property
     def json_output(self) -> dict[str, Any]:
@@ -340,6 +490,14 @@ class AntaTest(ABC):
     progress: Progress | None = None
     nrfu_task: TaskID | None = None
 
+    # Class attribute to evaluate the test results in a pool of worker processes, see `anta.runner.main()`
+    executor: Executor | None = None
+
+    # Verdict of the static commands of the test class, see `blocked`
+    _blocked_static_commands: ClassVar[dict[str, bool]] = {}
+    # Validated TestResult of the test class copied for each instance, see `_new_result`
+    _result_template: ClassVar[TestResult | None] = None
+
     class Input(BaseModel):
         """Class defining inputs for a test in ANTA.
 
@@ -370,8 +528,34 @@ class AntaTest(ABC):
             """Implement generic hashing for AntaTest.Input.
 
             This will work in most cases but this does not consider 2 lists with different ordering as equal.
+            The hash is computed once and reset when a field is set: the inputs must not be modified in place once hashed.
             """
-            return hash(self.model_dump_json())
+            if (value := self.__dict__.get(INPUTS_HASH_KEY)) is None:
+                value = self.__dict__[INPUTS_HASH_KEY] = hash(self.model_dump_json())
+            return value
+
+        def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+            """Set an attribute, resetting the values cached for the previous inputs."""
+            super().__setattr__(name, value)
+            _reset_inputs_cache(self.__dict__)
+
+        def __copy__(self) -> Self:
+            """Return a shallow copy of the inputs without the cached values, `model_copy()` updates the fields of the copy."""
+            copy = super().__copy__()
+            _reset_inputs_cache(copy.__dict__)
+            return copy
+
+        def __deepcopy__(self, memo: dict[int, Any] | None = None) -> Self:
+            """Return a deep copy of the inputs without the cached values, `model_copy()` updates the fields of the copy."""
+            copy = super().__deepcopy__(memo)
+            _reset_inputs_cache(copy.__dict__)
+            return copy
+
+        def __getstate__(self) -> dict[Any, Any]:
+            """Return the state of the inputs to pickle, without the values cached in the current process."""
+            state = super().__getstate__()
+            state["__dict__"] = {key: value for key, value in state["__dict__"].items() if key not in (INPUTS_HASH_KEY, INPUTS_RENDERED_COMMANDS_KEY)}
+            return state
 
         class ResultOverwrite(BaseModel):
             """Test inputs model to overwrite result fields.
@@ -426,16 +610,23 @@ class AntaTest(ABC):
         self.device: AntaDevice = device
         self.inputs: AntaTest.Input
         self.instance_commands: list[AntaCommand] = []
-        self.result: TestResult = TestResult(
-            name=device.name,
-            test=self.name,
-            categories=self.categories,
-            description=self.description,
-        )
+        self.result: TestResult = self._new_result(device.name)
         self._init_inputs(inputs)
         if self.result.result == AntaTestStatus.UNSET:
             self._init_commands(eos_data)
 
+    @classmethod
+    def _new_result(cls, device_name: str) -> TestResult:
+        """Return a new TestResult of this test for a device.
+
+        The TestResult is validated once per test class and copied for each instance: the test name, categories and description
+        are class attributes, validating them for each test instance is expensive for large catalogs and inventories.
+        """
+        # Looked up in the class namespace, the TestResult of the parent class is not inherited
+        if (template := cls.__dict__.get("_result_template")) is None:
+            template = cls._result_template = TestResult(name="", test=cls.name, categories=cls.categories, description=cls.description)
+        return _copy_model(template, name=device_name, categories=list(template.categories), messages=[])
+
     def _init_inputs(self, inputs: dict[str, Any] | AntaTest.Input | None) -> None:
         """Instantiate the `inputs` instance attribute with an `AntaTest.Input` instance to validate test inputs using the model.
 
@@ -465,8 +656,8 @@ class AntaTest(ABC):
     def _init_commands(self, eos_data: list[dict[Any, Any] | str] | None) -> None:
         """Instantiate the `instance_commands` instance attribute from the `commands` class attribute.
 
-        - Copy of the `AntaCommand` instances
-        - Render all `AntaTemplate` instances using the `render()` method.
+        - Copy of the `AntaCommand` instances, the copy of the validated static commands is not validated again
+        - Render all `AntaTemplate` instances using the `render()` method, once for all the instances sharing the same inputs.
 
         Any template rendering error will set this test result status as 'error'.
         Any exception in user code in `render()` will set this test result status as 'error'.
@@ -474,10 +665,10 @@ class AntaTest(ABC):
         if self.__class__.commands:
             for cmd in self.__class__.commands:
                 if isinstance(cmd, AntaCommand):
-                    self.instance_commands.append(cmd.model_copy())
+                    self.instance_commands.append(_copy_model(cmd))
                 elif isinstance(cmd, AntaTemplate):
                     try:
-                        self.instance_commands.extend(self.render(cmd))
+                        self.instance_commands.extend(self._render(cmd))
                     except AntaTemplateRenderError as e:
                         self.result.is_error(message=f"Cannot render template {{{e.template}}}")
                         return
@@ -522,6 +713,8 @@ class AntaTest(ABC):
                 msg = f"Cannot set the description for class {cls.name}, either set it in the class definition or add a docstring to the class."
                 raise AttributeError(msg)
             cls.description = cls.__doc__.split(sep="\n", maxsplit=1)[0]
+        # The static commands are the same for all the instances of the class, their verdict is computed once
+        cls._blocked_static_commands = {command.command: is_blocked_command(command.command) for command in cls.commands if isinstance(command, AntaCommand)}
 
     @property
     def module(self) -> str:
@@ -538,6 +731,48 @@ class AntaTest(ABC):
         """Return a list of all the commands that have failed."""
         return [command for command in self.instance_commands if command.error]
 
+    def _render(self, template: AntaTemplate) -> list[AntaCommand]:
+        """Render an AntaTemplate instance of this AntaTest, rendering it once for all the instances sharing the same inputs.
+
+        The commands rendered by `render()` only depend on the inputs, they are cached in the `AntaTest.Input` instance
+        shared by all the instances of a test definition and copied for each instance: the templates of a test definition
+        are rendered once for all the devices.
+        """
+        rendered: dict[tuple[type[AntaTest], AntaTemplate], list[AntaCommand]] = self.inputs.__dict__.setdefault(INPUTS_RENDERED_COMMANDS_KEY, {})
+        key = (self.__class__, template)
+        if key not in rendered:
+            commands: list[AntaCommand] = self.render(template)
+            rendered[key] = commands
+        return [_copy_model(command) for command in rendered[key]]
+
+    @classmethod
+    def render_commands(cls, inputs: AntaTest.Input) -> list[AntaCommand]:
+        """Return the commands of this AntaTest for the given inputs, without instantiating the test on a device.
+
+        The static commands are returned as is and the templates are rendered once for all the instances sharing these inputs,
+        see `_render()`. Used to plan the commands of a run, including in dry-run mode.
+
+        Parameters
+        ----------
+        inputs
+            The validated inputs of the test, e.g. the inputs of an `AntaTestDefinition`.
+
+        Returns
+        -------
+        list[AntaCommand]
+            The commands of the test. The static commands must not be modified.
+        """
+        # render() only uses the inputs of the test: a bare instance with the inputs is enough
+        test = cls.__new__(cls)
+        test.inputs = inputs
+        commands: list[AntaCommand] = []
+        for cmd in cls.commands:
+            if isinstance(cmd, AntaCommand):
+                commands.append(cmd)
+            else:
+                commands.extend(test._render(cmd))  # noqa: SLF001
+        return commands
+
     def render(self, template: AntaTemplate) -> list[AntaCommand]:
         """Render an AntaTemplate instance of this AntaTest using the provided AntaTest.Input instance at self.inputs.
 
@@ -550,18 +785,23 @@ class AntaTest(ABC):
 
     @property
     def blocked(self) -> bool:
-        """Check if CLI commands contain a blocked keyword."""
+        """Check if CLI commands contain a blocked keyword.
+
+        The verdict of the static commands is computed once per test class and the verdict of the rendered commands once per command string.
+        """
         state = False
         for command in self.instance_commands:
-            for pattern in REGEXP_EOS_BLACKLIST_CMDS:
-                if re.match(pattern, command.command):
-                    self.logger.error(
-                        "Command <%s> is blocked for security reason matching %s",
-                        command.command,
-                        REGEXP_EOS_BLACKLIST_CMDS,
-                    )
-                    self.result.is_error(f"<{command.command}> is blocked for security reason")
-                    state = True
+            blocked = self._blocked_static_commands.get(command.command) if command.template is None else None
+            if blocked is None:
+                blocked = is_blocked_command(command.command)
+            if blocked:
+                self.logger.error(
+                    "Command <%s> is blocked for security reason matching %s",
+                    command.command,
+                    REGEXP_EOS_BLACKLIST_CMDS,
+                )
+                self.result.is_error(f"<{command.command}> is blocked for security reason")
+                state = True
         return state
 
     async def collect(self) -> None:
@@ -640,7 +880,10 @@ class AntaTest(ABC):
                     return self.result
 
             try:
-                function(self, **kwargs)
+                if AntaTest.executor is None:
+                    function(self, **kwargs)
+                else:
+                    await self._evaluate_in_executor(AntaTest.executor, kwargs)
             except Exception as e:  # noqa: BLE001
                 # test() is user-defined code.
                 # We need to catch everything if we want the AntaTest object
@@ -653,8 +896,22 @@ class AntaTest(ABC):
             AntaTest.update_progress()
             return self.result
 
+        # Evaluated in the executor worker processes, see `_evaluate_test`
+        setattr(wrapper, ANTA_TEST_FUNCTION_ATTR, function)
         return wrapper
 
+    async def _evaluate_in_executor(self, executor: Executor, kwargs: dict[str, Any]) -> None:
+        """Run the `test()` method in an executor and update the test result with the result computed by the executor.
+
+        Only the inputs, the commands including their outputs and the `TestResult` instance are pickled to be sent to the executor,
+        not the device, and the `TestResult` instance is pickled back.
+        """
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(executor, _evaluate_test, self.__class__, self.inputs, self.instance_commands, self.result, kwargs)
+        # The result of this instance is referenced by the ResultManager, update it in place
+        for field in TestResult.model_fields:
+            setattr(self.result, field, getattr(result, field))
+
     @classmethod
     def update_progress(cls: type[AntaTest]) -> None:
         """Update progress bar for all AntaTest objects if it exists."""
@@ -681,3 +938,18 @@ class AntaTest(ABC):
             ```
 
         """
+
+
+def _evaluate_test(test_class: type[AntaTest], inputs: AntaTest.Input, commands: list[AntaCommand], result: TestResult, kwargs: dict[str, Any]) -> TestResult:
+    """Run the function decorated by `AntaTest.anta_test` of a test class on the collected command outputs and return the test result.
+
+    This function is called in the executor worker processes. The test instance is rebuilt without its device:
+    the `device` attribute is not available to the tests evaluated in the executor.
+    """
+    test = test_class.__new__(test_class)
+    test.logger = logging.getLogger(f"{test.module}.{test_class.__name__}")
+    test.inputs = inputs
+    test.instance_commands = commands
+    test.result = result
+    getattr(test_class.test, ANTA_TEST_FUNCTION_ATTR)(test, **kwargs)
+    return test.result
@@ -0,0 +1,148 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""Record the outputs of the commands collected on the devices during an ANTA run."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import queue
+import threading
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+if TYPE_CHECKING:
+    import sys
+    from pathlib import Path
+    from types import TracebackType
+
+    from anta.models import AntaCommand
+
+    if sys.version_info >= (3, 11):
+        from typing import Self
+    else:
+        from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+
+class Recorder:
+    """Record the outputs of the commands collected on the devices in a gzip-compressed JSON lines archive.
+
+    Each line of the archive is a JSON object with the `device` name and the `uid`, `command`, `version`, `revision`, `ofmt`,
+    `json_paths` and `output` of a collected command. The output of a command is recorded once per device.
+    The output of a command with JSON paths only has the subtrees at these paths, it is replayed for the same JSON paths only.
+
+    The records are serialized, compressed and written by a background thread so that recording does not slow down
+    the collection of the commands. The archive is opened in append mode: each recording is a gzip member appended to the archive,
+    which is read as a whole by `gzip.open()`. When the size of the archive reaches `max_size`, the next records are dropped.
+
+    The recorder must be started, e.g. by using it as a context manager, to record the commands.
+
+    Attributes
+    ----------
+    path : Path
+        Path of the archive.
+    max_size : int | None
+        Maximum size in bytes of the archive. None means no limit.
+    records : int
+        Number of records written in the archive.
+    """
+
+    def __init__(self, path: Path, max_size: int | None = None) -> None:
+        """Initialize a Recorder.
+
+        Parameters
+        ----------
+        path
+            Path of the archive, created if it does not exist.
+        max_size
+            Maximum size in bytes of the archive. None means no limit.
+        """
+        self.path = path
+        self.max_size = max_size
+        self.records = 0
+        # Recorded commands keyed by device and command unique identifier
+        self._recorded: set[tuple[str, str]] = set()
+        self._queue: queue.SimpleQueue[dict[str, Any] | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._full = False
+
+    @property
+    def dropped(self) -> int:
+        """Number of records dropped because the archive has reached `max_size`, the pending records are included until the recorder is closed."""
+        return len(self._recorded) - self.records
+
+    def __enter__(self) -> Self:
+        """Start the recorder."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None) -> None:
+        """Write the pending records and close the archive."""
+        self.close()
+
+    def start(self) -> None:
+        """Open the archive and start the thread writing the records."""
+        if self._thread is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._write, args=(self.path.open("ab"),), name="anta-recorder", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Write the pending records, then close the archive."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        logger.info("Recorded %s command output(s) in %s", self.records, self.path)
+        if self.dropped:
+            logger.warning("%s command output(s) not recorded: the size of %s has reached %s bytes", self.dropped, self.path, self.max_size)
+
+    def record(self, device: str, command: AntaCommand) -> None:
+        """Record the output of a command collected on a device.
+
+        The commands that are not collected, already recorded for this device or recorded while the recorder is not started are ignored.
+
+        Parameters
+        ----------
+        device
+            Name of the device.
+        command
+            The collected command.
+        """
+        if self._thread is None or not command.collected:
+            return
+        key = (device, command.uid)
+        if key in self._recorded:
+            return
+        self._recorded.add(key)
+        if self._full:
+            return
+        self._queue.put(
+            {
+                "device": device,
+                "uid": command.uid,
+                "command": command.command,
+                "version": command.version,
+                "revision": command.revision,
+                "ofmt": command.ofmt,
+                "json_paths": command.json_paths,
+                "output": command.output,
+            }
+        )
+
+    def _write(self, file: BinaryIO) -> None:
+        """Write the records of the queue in the archive until the recorder is closed."""
+        with file, gzip.GzipFile(fileobj=file, mode="ab") as archive:
+            while (record := self._queue.get()) is not None:
+                if self._full:
+                    continue
+                archive.write(json.dumps(record, default=str).encode() + b"\n")
+                self.records += 1
+                # The compressed data is written to the file by blocks, the size of the archive lags behind the records
+                if self.max_size is not None and file.tell() >= self.max_size:
+                    self._full = True
@@ -202,6 +202,15 @@ class ResultManager:
         # Every time a new result is added, we need to clear the cached property
         self.__dict__.pop("results_by_status", None)
 
+    def refresh_stats(self) -> None:
+        """Recompute the status and the statistics of the ResultManager instance from its results.
+
+        The status and the statistics are updated when a result is added. This method must be called when
+        results are updated after being added, e.g. the ANTA runner adds the results when the tests are
+        instantiated and sets them once the tests have run.
+        """
+        self.results = list(self._result_entries)
+
     def get_results(self, status: set[AntaTestStatus] | None = None, sort_by: list[str] | None = None) -> list[TestResult]:
         """Get the results, optionally filtered by status and sorted by TestResult fields.
 
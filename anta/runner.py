@@ -6,29 +6,41 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
 import logging
+import multiprocessing
 import os
 import resource
-from collections import defaultdict
-from typing import TYPE_CHECKING, Any
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from anta import GITHUB_SUGGESTION
+from anta.inventory import DEFAULT_CONNECT_CONCURRENCY
 from anta.logger import anta_log_exception, exc_to_str
-from anta.models import AntaTest
+from anta.models import AntaCommand, AntaTest
+from anta.result_manager import ResultManager
 from anta.tools import Catchtime, cprofile
+from asynceapi import shared_ssl_context
 
 if TYPE_CHECKING:
-    from collections.abc import Coroutine
+    import queue
+    from collections.abc import AsyncGenerator, Awaitable, Callable, Coroutine, Generator, Iterable, Iterator, Mapping
 
     from anta.catalog import AntaCatalog, AntaTestDefinition
     from anta.device import AntaDevice
     from anta.inventory import AntaInventory
-    from anta.result_manager import ResultManager
+    from anta.recorder import Recorder
     from anta.result_manager.models import TestResult
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_NOFILE = 16384
+DEFAULT_MAX_CONCURRENCY = 10000
+
+K = TypeVar("K")
+V = TypeVar("V")
 
 
 def adjust_rlimit_nofile() -> tuple[int, int]:
@@ -70,14 +82,54 @@ def log_cache_statistics(devices: list[AntaDevice]) -> None:
             msg = (
                 f"Cache statistics for '{device.name}': "
                 f"{device.cache_statistics['cache_hits']} hits / {device.cache_statistics['total_commands_sent']} "
-                f"command(s) ({device.cache_statistics['cache_hit_ratio']})"
+                f"command(s) ({device.cache_statistics['cache_hit_ratio']}), {device.cache_statistics['cache_evictions']} eviction(s)"
             )
             logger.info(msg)
         else:
             logger.info("Caching is not enabled on %s", device.name)
 
 
-async def setup_inventory(inventory: AntaInventory, tags: set[str] | None, devices: set[str] | None, *, established_only: bool) -> AntaInventory | None:
+def log_pool_statistics(devices: list[AntaDevice]) -> None:
+    """Log the connection pool statistics for each device in the inventory.
+
+    Parameters
+    ----------
+    devices
+        List of devices in the inventory.
+    """
+    for device in devices:
+        if (stats := device.pool_statistics) is not None:
+            logger.debug(
+                "Connection pool statistics for '%s': %s request(s) / %s connection(s) opened, waited %.3fs for a connection (max %.3fs)",
+                device.name,
+                stats["requests"],
+                stats["connections"],
+                stats["wait_time"],
+                stats["max_wait_time"],
+            )
+
+
+def log_tls_statistics() -> None:
+    """Log the statistics of the TLS handshakes of the eAPI connections of the ANTA process."""
+    stats = shared_ssl_context().statistics
+    if stats.handshakes:
+        logger.info(
+            "TLS statistics: %s handshake(s), %s resumed session(s), %.3fs spent in handshakes",
+            stats.handshakes,
+            stats.resumed,
+            stats.handshake_time,
+        )
+
+
+async def setup_inventory(  # noqa: PLR0913
+    inventory: AntaInventory,
+    tags: set[str] | None,
+    devices: set[str] | None,
+    *,
+    established_only: bool,
+    connect_concurrency: int = DEFAULT_CONNECT_CONCURRENCY,
+    preload_commands: list[AntaCommand] | None = None,
+) -> AntaInventory | None:
     """Set up the inventory for the ANTA run.
 
     Parameters
@@ -90,6 +142,10 @@ async def setup_inventory(inventory: AntaInventory, tags: set[str] | None, devic
         Devices on which to run tests. None means all devices.
     established_only
         If True use return only devices where a connection is established.
+    connect_concurrency
+        Maximum number of devices connected concurrently.
+    preload_commands
+        Commands collected on the devices when connecting to them, their outputs are cached to be shared by all the tests using them.
 
     Returns
     -------
@@ -105,7 +161,7 @@ async def setup_inventory(inventory: AntaInventory, tags: set[str] | None, devic
 
     with Catchtime(logger=logger, message="Connecting to devices"):
         # Connect to the devices
-        await selected_inventory.connect_inventory()
+        await selected_inventory.connect_inventory(max_concurrency=connect_concurrency, preload_commands=preload_commands)
 
     # Remove devices that are unreachable
     selected_inventory = selected_inventory.get_inventory(established_only=established_only)
@@ -119,6 +175,38 @@ async def setup_inventory(inventory: AntaInventory, tags: set[str] | None, devic
     return selected_inventory
 
 
+def get_preload_commands(catalog: AntaCatalog, preload: set[str], tests: set[str] | None = None) -> list[AntaCommand]:
+    """Get the commands of the catalog tests to preload when connecting to the devices.
+
+    The commands are the ones of the tests, with the same revision and output format, so that the tests find their outputs in the device cache.
+    Commands rendered from an `AntaTemplate` cannot be preloaded.
+
+    Parameters
+    ----------
+    catalog
+        AntaCatalog object that includes the list of tests.
+    preload
+        EOS commands to preload.
+    tests
+        Tests to run. None means all tests.
+
+    Returns
+    -------
+    list[AntaCommand]
+        The unique commands to preload.
+    """
+    commands: dict[str, AntaCommand] = {}
+    for definition in catalog.tests:
+        if tests and definition.test.name not in tests:
+            continue
+        for command in definition.test.commands:
+            if isinstance(command, AntaCommand) and command.command in preload and command.use_cache:
+                commands.setdefault(command.uid, command)
+    if not_found := preload - {command.command for command in commands.values()}:
+        logger.warning("The following commands are not used by the selected tests and are not preloaded: %s", ", ".join(sorted(not_found)))
+    return list(commands.values())
+
+
 def prepare_tests(
     inventory: AntaInventory, catalog: AntaCatalog, tests: set[str] | None, tags: set[str] | None
 ) -> defaultdict[AntaDevice, set[AntaTestDefinition]] | None:
@@ -175,43 +263,352 @@ def prepare_tests(
     return device_to_tests
 
 
-def get_coroutines(selected_tests: defaultdict[AntaDevice, set[AntaTestDefinition]], manager: ResultManager) -> list[Coroutine[Any, Any, TestResult]]:
+def prepare_command_plan(selected_tests: Mapping[AntaDevice, Iterable[AntaTestDefinition]], *, register: bool = True) -> tuple[int, int]:
+    """Compute the commands to collect on each device and register the command plan on the devices.
+
+    The commands used by several tests of a device are collected only once during the run
+    and their output is shared with all the tests, see `AntaDevice.plan_commands()`.
+
+    The commands of a test definition are computed once from the test definition, without instantiating the test on the devices:
+    the static commands are counted as is and the templates are rendered once per test definition.
+
+    Parameters
+    ----------
+    selected_tests
+        A mapping of devices to the tests to run. The selected tests are generated by the `prepare_tests` function.
+    register
+        Register the command plan on the devices. When False, e.g. in dry-run mode, the commands are only counted.
+
+    Returns
+    -------
+    tuple[int, int]
+        The total number of commands of the selected tests and the number of commands actually collected.
+    """
+    commands_per_test: dict[int, list[AntaCommand]] = {}
+    total_commands_count = 0
+    unique_commands_count = 0
+
+    for device, tests in selected_tests.items():
+        device_commands: list[AntaCommand] = []
+        for test in tests:
+            if (commands := commands_per_test.get(id(test))) is None:
+                try:
+                    commands = test.test.render_commands(test.inputs)
+                except Exception:  # noqa: BLE001
+                    # The error is reported when the test is instantiated to be run
+                    commands = []
+                commands_per_test[id(test)] = commands
+            device_commands.extend(commands)
+
+        if register:
+            device.plan_commands(device_commands)
+        counter = Counter(command.uid for command in device_commands if command.use_cache)
+        total_commands_count += len(device_commands)
+        unique_commands_count += len(counter) + sum(not command.use_cache for command in device_commands)
+
+    return total_commands_count, unique_commands_count
+
+
+def get_coroutines(
+    selected_tests: Mapping[AntaDevice, Iterable[AntaTestDefinition]], manager: ResultManager, *, on_error: Callable[[str], None] | None = None
+) -> Generator[Coroutine[Any, Any, TestResult], None, None]:
     """Get the coroutines for the ANTA run.
 
+    The coroutines are generated lazily: a test is only instantiated and its result added to the ResultManager
+    when the next coroutine is requested from the generator.
+
+    Tests are interleaved across devices in a round-robin fashion so that a concurrency-limited run
+    spreads the load on all the devices instead of running all the tests of a device before moving to the next one.
+
     Parameters
     ----------
     selected_tests
         A mapping of devices to the tests to run. The selected tests are generated by the `prepare_tests` function.
     manager
         A ResultManager
+    on_error
+        Function called with the error message of a test that cannot be instantiated, e.g. to report it from a worker process.
+        None means the error is logged and the progress bar is updated.
+
+    Yields
+    ------
+    Coroutine[Any, Any, TestResult]
+        The coroutine of a test to run.
+    """
+    for device, test in _round_robin(selected_tests):
+        try:
+            test_instance = test.test(device=device, inputs=test.inputs)
+            manager.add(test_instance.result)
+        except Exception as e:  # noqa: BLE001
+            # An AntaTest instance is potentially user-defined code.
+            # We need to catch everything and exit gracefully with an error message.
+            message = "\n".join(
+                [
+                    f"There is an error when creating test {test.test.__module__}.{test.test.__name__}.",
+                    f"If this is not a custom test implementation: {GITHUB_SUGGESTION}",
+                ],
+            )
+            if on_error is None:
+                anta_log_exception(e, message, logger)
+                AntaTest.update_progress()
+            else:
+                on_error(f"{message}\n{exc_to_str(e)}")
+            continue
+        yield test_instance.test()
+
+
+def _clear_command_plan(selected_tests: Mapping[AntaDevice, Iterable[AntaTestDefinition]]) -> None:
+    """Remove the command plan of the devices, releasing the outputs of planned commands that have not been used."""
+    for device in selected_tests:
+        device.plan_commands([])
+
+
+def _round_robin(items: Mapping[K, Iterable[V]]) -> Generator[tuple[K, V], None, None]:
+    """Yield (key, item) pairs, e.g. (device, test), taking one item of each key in turn until all items are exhausted."""
+    iterators = {key: iter(values) for key, values in items.items()}
+    while iterators:
+        for key, values in list(iterators.items()):
+            if (value := next(values, None)) is None:
+                del iterators[key]
+            else:
+                yield key, value
+
+
+def _shard(selected_tests: Mapping[AntaDevice, Iterable[AntaTestDefinition]], workers: int) -> list[dict[AntaDevice, list[AntaTestDefinition]]]:
+    """Split the devices in shards with a similar number of tests, at most one shard per worker."""
+    shards: list[dict[AntaDevice, list[AntaTestDefinition]]] = [{} for _ in range(min(workers, len(selected_tests)))]
+    shard_sizes = [0] * len(shards)
+    # Assign the devices with the most tests first, each time to the shard with the fewest tests
+    for device, tests in sorted(((device, list(tests)) for device, tests in selected_tests.items()), key=lambda item: len(item[1]), reverse=True):
+        index = shard_sizes.index(min(shard_sizes))
+        shards[index][device] = tests
+        shard_sizes[index] += len(tests)
+    return shards
+
+
+async def run_workers(
+    selected_tests: Mapping[AntaDevice, Iterable[AntaTestDefinition]],
+    workers: int,
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    on_result: Callable[[TestResult], Awaitable[None] | None] | None = None,
+) -> list[TestResult]:
+    """Run the tests in worker processes, sharding the devices across the workers.
+
+    Each worker process runs the tests of its shard of devices with its own event loop and sends each result
+    to the current process as soon as the test is completed.
+    The devices are pickled to the workers: their connection state is kept but their cache is not shared.
+
+    Parameters
+    ----------
+    selected_tests
+        A mapping of devices to the tests to run. The selected tests are generated by the `prepare_tests` function.
+    workers
+        Maximum number of worker processes.
+    max_concurrency
+        Maximum number of tests to run concurrently in each worker process.
+    on_result
+        Function or coroutine function called with each `TestResult` as soon as a worker reports it, see `main()`.
 
     Returns
     -------
-    list[Coroutine[Any, Any, TestResult]]
-        The list of coroutines to run.
+    list[TestResult]
+        The results of all the workers, in the same order as a run in a single process.
     """
-    coros = []
-    for device, test_definitions in selected_tests.items():
-        for test in test_definitions:
+    _check_workers(workers, None)
+
+    # Keep the order of the tests of each device to return the results in the same order as a single process run
+    selected_tests = {device: list(tests) for device, tests in selected_tests.items()}
+    shards = _shard(selected_tests, workers)
+    logger.debug("Running the tests of %s devices in %s worker processes", len(selected_tests), len(shards))
+
+    loop = asyncio.get_running_loop()
+    # Results of each device with their position in the results of the shard
+    results_per_device: defaultdict[str, list[tuple[int, TestResult]]] = defaultdict(list)
+    with multiprocessing.Manager() as sync_manager, ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        # The workers send the results with their position and the error messages of the tests that cannot be instantiated
+        results_queue: queue.Queue[tuple[int, TestResult] | str | None] = sync_manager.Queue()
+
+        async def _run_shards() -> None:
             try:
-                test_instance = test.test(device=device, inputs=test.inputs)
-                manager.add(test_instance.result)
-                coros.append(test_instance.test())
-            except Exception as e:  # noqa: PERF203, BLE001
-                # An AntaTest instance is potentially user-defined code.
-                # We need to catch everything and exit gracefully with an error message.
-                message = "\n".join(
-                    [
-                        f"There is an error when creating test {test.test.__module__}.{test.test.__name__}.",
-                        f"If this is not a custom test implementation: {GITHUB_SUGGESTION}",
-                    ],
-                )
-                anta_log_exception(e, message, logger)
-    return coros
+                await asyncio.gather(*(loop.run_in_executor(executor, _run_shard, shard, max_concurrency, results_queue) for shard in shards))
+            finally:
+                # The workers have sent all their results, stop reading the queue
+                results_queue.put(None)
+
+        shards_task = asyncio.create_task(_run_shards())
+        while (item := await loop.run_in_executor(None, results_queue.get)) is not None:
+            AntaTest.update_progress()
+            if isinstance(item, str):
+                logger.critical(item)
+                continue
+            results_per_device[item[1].name].append(item)
+            if on_result is not None:
+                await _notify_result(on_result, item[1])
+        await shards_task
+
+    # The tests of a device complete in any order, sort the results back in the order of the tests
+    ordered_results = {device.name: [result for _, result in sorted(results_per_device[device.name], key=lambda item: item[0])] for device in selected_tests}
+    return [result for _, result in _round_robin(ordered_results)]
+
+
+def _run_shard(
+    selected_tests: dict[AntaDevice, list[AntaTestDefinition]], max_concurrency: int, results_queue: queue.Queue[tuple[int, TestResult] | str | None]
+) -> None:
+    """Run the tests of a shard of devices and send each result to the queue as soon as the test is completed.
+
+    Each result is sent with its position in the results of the shard, i.e. the order in which the tests are instantiated.
+    The error message of a test that cannot be instantiated is sent instead of its result, the parent process logs it.
+    This function is called in the worker processes.
+    """
+    # The progress bar is handled by the parent process
+    AntaTest.progress = None
+    AntaTest.nrfu_task = None
+    manager = ResultManager()
+
+    positions: dict[int, int] = {}
+
+    async def _run_tests() -> None:
+        prepare_command_plan(selected_tests)
+        async for result in run(get_coroutines(selected_tests, manager, on_error=results_queue.put), limit=max_concurrency):
+            # The results are added to the manager when the tests are instantiated, before they are completed
+            for position in range(len(positions), len(manager)):
+                positions[id(manager.results[position])] = position
+            results_queue.put((positions[id(result)], result))
+        _clear_command_plan(selected_tests)
+
+    asyncio.run(_run_tests())
+
+
+async def run(coroutines: Iterator[Coroutine[Any, Any, TestResult]], limit: int) -> AsyncGenerator[TestResult, None]:
+    """Run the test coroutines with a concurrency limit.
+
+    Coroutines are pulled from the iterator only when there is room for a new test to run,
+    so the number of test instances and in-flight requests stays bounded by `limit`
+    regardless of the size of the inventory and the catalog.
+
+    Parameters
+    ----------
+    coroutines
+        An iterator of test coroutines, e.g. the generator returned by `get_coroutines`.
+    limit
+        Maximum number of tests to run concurrently.
+
+    Yields
+    ------
+    TestResult
+        The result of each test, as soon as the test is completed.
+    """
+    if limit < 1:
+        msg = f"The concurrency limit must be a positive integer, got {limit}"
+        raise ValueError(msg)
+
+    pending: set[asyncio.Task[TestResult]] = set()
+    exhausted = False
+
+    while pending or not exhausted:
+        # Schedule new tests until the limit is reached or there are no more tests
+        while len(pending) < limit and not exhausted:
+            if (coro := next(coroutines, None)) is None:
+                exhausted = True
+                logger.debug("All tests have been scheduled")
+            else:
+                pending.add(asyncio.create_task(coro))
+
+        if not pending:
+            return
+
+        if len(pending) >= limit:
+            logger.debug("Concurrency limit reached: %s tests running", limit)
+
+        # Wait for at least one test to complete before scheduling new ones
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            yield task.result()
+
+
+@contextmanager
+def evaluation_pool(process_pool_size: int | None) -> Generator[None, None, None]:
+    """Context manager to evaluate the test results in a pool of worker processes.
+
+    The process pool is set as `AntaTest.executor` and is shut down when exiting the context.
+
+    Parameters
+    ----------
+    process_pool_size
+        Number of worker processes. None means the test results are evaluated by the event loop of the current process.
+    """
+    if process_pool_size is None:
+        yield
+        return
+    if process_pool_size < 1:
+        msg = f"The process pool size must be a positive integer, got {process_pool_size}"
+        raise ValueError(msg)
+    with ProcessPoolExecutor(max_workers=process_pool_size) as executor:
+        AntaTest.executor = executor
+        try:
+            yield
+        finally:
+            AntaTest.executor = None
+
+
+async def _notify_result(on_result: Callable[[TestResult], Awaitable[None] | None], result: TestResult) -> None:
+    """Call the `on_result` callback of `main()` with a completed test result."""
+    try:
+        if inspect.isawaitable(ret := on_result(result)):
+            await ret
+    except Exception as e:  # noqa: BLE001
+        # on_result is user-defined code.
+        # We need to catch everything to keep running the tests.
+        anta_log_exception(e, f"Exception raised by the result callback for test {result.test} (on device {result.name})", logger)
+
+
+def _check_workers(workers: int, process_pool_size: int | None, *, record: bool = False) -> None:
+    """Check that the number of worker processes is compatible with the process pool size and the recording of the commands."""
+    if workers < 1:
+        msg = f"The number of workers must be a positive integer, got {workers}"
+        raise ValueError(msg)
+    if workers > 1 and process_pool_size is not None:
+        msg = "The tests cannot be run in worker processes when the test results are evaluated in a process pool"
+        raise ValueError(msg)
+    if workers > 1 and record:
+        msg = "The commands collected in worker processes cannot be recorded"
+        raise ValueError(msg)
+
+
+async def _run_in_process(
+    manager: ResultManager,
+    selected_tests: Mapping[AntaDevice, Iterable[AntaTestDefinition]],
+    *,
+    max_concurrency: int,
+    on_result: Callable[[TestResult], Awaitable[None] | None] | None,
+    process_pool_size: int | None,
+) -> None:
+    """Run the tests in the current process, the results being added to the manager when the tests are instantiated."""
+    with evaluation_pool(process_pool_size):
+        # The tests are instantiated just in time by the scheduler: the number of test instances alive is bounded by `max_concurrency`
+        async for result in run(get_coroutines(selected_tests, manager), limit=max_concurrency):
+            if on_result is not None:
+                await _notify_result(on_result, result)
+    # Update the status and the statistics of the manager with the final results
+    manager.refresh_stats()
+
+
+async def _run_in_workers(
+    manager: ResultManager,
+    selected_tests: Mapping[AntaDevice, Iterable[AntaTestDefinition]],
+    workers: int,
+    *,
+    max_concurrency: int,
+    on_result: Callable[[TestResult], Awaitable[None] | None] | None,
+) -> None:
+    """Run the tests in worker processes, streaming the results to `on_result`, and add the merged results to the manager once all the workers are done."""
+    for result in await run_workers(selected_tests, workers, max_concurrency=max_concurrency, on_result=on_result):
+        manager.add(result)
 
 
 @cprofile()
-async def main(  # noqa: PLR0913
+async def main(  # noqa: PLR0913, C901  function is too complex - because of the many run options
     manager: ResultManager,
     inventory: AntaInventory,
     catalog: AntaCatalog,
@@ -221,6 +618,13 @@ async def main(  # noqa: PLR0913
     *,
     established_only: bool = True,
     dry_run: bool = False,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    on_result: Callable[[TestResult], Awaitable[None] | None] | None = None,
+    process_pool_size: int | None = None,
+    workers: int = 1,
+    connect_concurrency: int = DEFAULT_CONNECT_CONCURRENCY,
+    preload: set[str] | None = None,
+    recorder: Recorder | None = None,
 ) -> None:
     """Run ANTA.
 
@@ -244,8 +648,30 @@ async def main(  # noqa: PLR0913
     established_only
         Include only established device(s).
     dry_run
-        Build the list of coroutine to run and stop before test execution.
+        Select the tests and compute the command plan, then stop before the tests are instantiated and run.
+    max_concurrency
+        Maximum number of tests to run concurrently.
+    on_result
+        Function or coroutine function called with each `TestResult` as soon as the test is completed,
+        while the other tests are still running. Exceptions raised by this callback are logged and do not stop the run.
+    process_pool_size
+        Number of worker processes used to evaluate the test results. The commands are still collected by the event loop
+        of the current process. None means the test results are evaluated by the event loop of the current process.
+    workers
+        Number of worker processes running the tests. When greater than 1, the devices are sharded across the worker processes,
+        each one running the tests of its devices with its own event loop, and the results are merged in `manager`.
+        Cannot be used with `process_pool_size`.
+    connect_concurrency
+        Maximum number of devices connected concurrently before running the tests.
+    preload
+        EOS commands of the tests collected when connecting to the devices. Their outputs are cached and shared by all the tests using them.
+        Requires caching to be enabled on the devices.
+    recorder
+        Started recorder of the outputs of the commands collected on the devices, see `anta.recorder.Recorder`.
+        Cannot be used with worker processes.
     """
+    _check_workers(workers, process_pool_size, record=recorder is not None)
+
     # Adjust the maximum number of open file descriptors for the ANTA process
     limits = adjust_rlimit_nofile()
 
@@ -253,9 +679,24 @@ async def main(  # noqa: PLR0913
         logger.info("The list of tests is empty, exiting")
         return
 
+    if recorder is not None and not dry_run:
+        for device in inventory.devices:
+            device.recorder = recorder
+
     with Catchtime(logger=logger, message="Preparing ANTA NRFU Run"):
         # Setup the inventory
-        selected_inventory = inventory if dry_run else await setup_inventory(inventory, tags, devices, established_only=established_only)
+        selected_inventory = (
+            inventory
+            if dry_run
+            else await setup_inventory(
+                inventory,
+                tags,
+                devices,
+                established_only=established_only,
+                connect_concurrency=connect_concurrency,
+                preload_commands=get_preload_commands(catalog, preload, tests) if preload else None,
+            )
+        )
         if selected_inventory is None:
             return
 
@@ -265,35 +706,51 @@ async def main(  # noqa: PLR0913
                 return
             final_tests_count = sum(len(tests) for tests in selected_tests.values())
 
+        with Catchtime(logger=logger, message="Preparing the command plan"):
+            # The command plan is only registered on the devices when the tests are run
+            total_commands_count, unique_commands_count = prepare_command_plan(selected_tests, register=not dry_run)
+
         run_info = (
             "--- ANTA NRFU Run Information ---\n"
             f"Number of devices: {len(inventory)} ({len(selected_inventory)} established)\n"
             f"Total number of selected tests: {final_tests_count}\n"
+            f"Total number of commands: {total_commands_count} ({unique_commands_count} unique commands to collect)\n"
+            f"Maximum number of concurrent tests: {max_concurrency}{' per worker' if workers > 1 else ''}\n"
+            f"Number of worker processes: {workers}\n"
+            f"Test evaluation: {f'process pool of {process_pool_size} workers' if process_pool_size else 'event loop'}\n"
             f"Maximum number of open file descriptors for the current ANTA process: {limits[0]}\n"
             "---------------------------------"
         )
 
         logger.info(run_info)
 
-        if final_tests_count > limits[0]:
+        if min(final_tests_count, max_concurrency) > limits[0]:
             logger.warning(
                 "The number of concurrent tests is higher than the open file descriptors limit for this ANTA process.\n"
                 "Errors may occur while running the tests.\n"
                 "Please consult the ANTA FAQ."
             )
 
-        coroutines = get_coroutines(selected_tests, manager)
-
     if dry_run:
+        # The tests are not instantiated: the counts above come from the test definitions
         logger.info("Dry-run mode, exiting before running the tests.")
-        for coro in coroutines:
-            coro.close()
         return
 
     if AntaTest.progress is not None:
-        AntaTest.nrfu_task = AntaTest.progress.add_task("Running NRFU Tests...", total=len(coroutines))
+        AntaTest.nrfu_task = AntaTest.progress.add_task("Running NRFU Tests...", total=final_tests_count)
 
     with Catchtime(logger=logger, message="Running ANTA tests"):
-        await asyncio.gather(*coroutines)
-
-    log_cache_statistics(selected_inventory.devices)
+        if workers > 1:
+            # The command plan is computed again by each worker
+            _clear_command_plan(selected_tests)
+            await _run_in_workers(manager, selected_tests, workers, max_concurrency=max_concurrency, on_result=on_result)
+        else:
+            await _run_in_process(manager, selected_tests, max_concurrency=max_concurrency, on_result=on_result, process_pool_size=process_pool_size)
+            _clear_command_plan(selected_tests)
+
+    if workers > 1:
+        logger.info("Cache statistics are not available when running the tests in worker processes")
+    else:
+        log_cache_statistics(selected_inventory.devices)
+        log_pool_statistics(selected_inventory.devices)
+        log_tls_statistics()
@@ -0,0 +1,187 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""Read the command outputs collected by `anta exec snapshot` or recorded by `anta nrfu --record`."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import tarfile
+import zipfile
+from contextlib import ExitStack
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING, Any
+
+from anta.tools import safe_command
+
+if TYPE_CHECKING:
+    import sys
+    from collections.abc import Sequence
+    from pathlib import Path
+    from types import TracebackType
+    from typing import Literal
+
+    if sys.version_info >= (3, 11):
+        from typing import Self
+    else:
+        from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+# Extension of the snapshot files per output format
+SNAPSHOT_EXTENSIONS = {"json": ".json", "text": ".log"}
+
+
+def _is_gzip(path: Path) -> bool:
+    """Return True if the file is compressed with gzip."""
+    with path.open("rb") as file:
+        return file.read(2) == b"\x1f\x8b"
+
+
+class Snapshot:
+    """Command outputs collected by `anta exec snapshot`, read from the snapshot directory or from an archive of this directory.
+
+    The output of a command is stored in the `<device>/json/<command>.json` or `<device>/text/<command>.log` file of the snapshot,
+    where `<command>` is the command sanitized by `anta.tools.safe_command()`.
+    The snapshot can be archived as a ZIP file or a tar file, compressed or not. The members of a tar archive are read in memory
+    when the snapshot is opened, the members of a ZIP archive are read on demand.
+
+    The archive of the command outputs recorded by `anta.recorder.Recorder` is also a snapshot, read in memory when the snapshot is opened.
+    The outputs of a recording filtered by JSON paths are only read for the same JSON paths.
+
+    The ZIP archive stays open until the snapshot is closed, the snapshot can be used as a context manager to close it.
+
+    Attributes
+    ----------
+    path : Path
+        Path of the snapshot directory or archive.
+    devices : set[str]
+        Names of the devices of the snapshot.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize a Snapshot, indexing the snapshot files.
+
+        Parameters
+        ----------
+        path
+            Path of the snapshot directory or archive.
+
+        Raises
+        ------
+        ValueError
+            If the path is neither a directory nor a ZIP, tar or recording archive.
+        """
+        self.path = path
+        # Snapshot files indexed by device, output format, file name and JSON paths of the outputs of a recording filtered by JSON paths
+        self._files: dict[tuple[str, str, str, tuple[str, ...] | None], str] = {}
+        # Content of the members of a tar archive or of the records of a recording
+        self._contents: dict[str, bytes] | None = None
+        self._zip: zipfile.ZipFile | None = None
+        # Close the ZIP archive when the snapshot is closed
+        self._resources = ExitStack()
+        self._directory = path.is_dir()
+        if self._directory:
+            names = [file.relative_to(path).as_posix() for file in path.rglob("*") if file.is_file()]
+        elif zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                names = [info.filename for info in archive.infolist() if not info.is_dir()]
+        elif tarfile.is_tarfile(path):
+            self._contents = {}
+            with tarfile.open(path) as archive:
+                for member in archive:
+                    if member.isfile() and self._index(member.name) is not None and (file := archive.extractfile(member)) is not None:
+                        self._contents[member.name] = file.read()
+            names = []
+        elif _is_gzip(path):
+            self._contents = self._read_recording(path)
+            names = []
+        else:
+            msg = f"{path} is not a snapshot directory, a ZIP or tar archive of a snapshot directory or a recording"
+            raise ValueError(msg)
+        for name in names:
+            self._index(name)
+        self.devices = {device for device, _, _, _ in self._files}
+        logger.debug("Snapshot %s has %s output(s) of %s device(s)", path, len(self._files), len(self.devices))
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Return the state of the snapshot to pickle, without the open ZIP archive."""
+        state = self.__dict__.copy()
+        state["_zip"] = None
+        state["_resources"] = ExitStack()
+        return state
+
+    def __enter__(self) -> Self:
+        """Return the snapshot."""
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None) -> None:
+        """Close the snapshot."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the ZIP archive of the snapshot if it is open. The archive is opened again by the next `read()`."""
+        self._resources.close()
+        self._zip = None
+
+    def _read_recording(self, path: Path) -> dict[str, bytes]:
+        """Read the command outputs of a recording archive, the last recorded output of a command is kept."""
+        contents: dict[str, bytes] = {}
+        with gzip.open(path, mode="rt", encoding="UTF-8") as recording:
+            for line in recording:
+                record = json.loads(line)
+                # Same name as the file of the command output in a snapshot directory
+                name = f"{record['device']}/{record['ofmt']}/{safe_command(record['command'])}{SNAPSHOT_EXTENSIONS[record['ofmt']]}"
+                # A filtered output does not replace the whole output of the command
+                json_paths = tuple(record["json_paths"]) if record.get("json_paths") is not None else None
+                output = record["output"] if record["ofmt"] == "text" else json.dumps(record["output"])
+                if (member := self._index(name, json_paths)) is not None:
+                    contents[member] = output.encode(encoding="UTF-8")
+        return contents
+
+    def _index(self, name: str, json_paths: tuple[str, ...] | None = None) -> str | None:
+        """Index a snapshot file, return the name of its content or None if the file is not a command output."""
+        path = PurePosixPath(name)
+        device, ofmt = path.parent.parent.name, path.parent.name
+        if not device or ofmt not in SNAPSHOT_EXTENSIONS or path.suffix != SNAPSHOT_EXTENSIONS[ofmt]:
+            return None
+        member = name if json_paths is None else f"{name}#{','.join(json_paths)}"
+        self._files[(device, ofmt, path.name, json_paths)] = member
+        return member
+
+    def read(self, device: str, command: str, ofmt: Literal["json", "text"], json_paths: Sequence[str] | None = None) -> str | None:
+        """Read the output of a command collected on a device.
+
+        The output recorded for the same JSON paths is returned if any, the whole output of the command otherwise.
+
+        Parameters
+        ----------
+        device
+            Name of the device.
+        command
+            The command.
+        ofmt
+            Output format of the command.
+        json_paths
+            JSON paths of the command.
+
+        Returns
+        -------
+        str | None
+            The output of the command, None if the command is not in the snapshot.
+        """
+        file_name = f"{safe_command(command)}{SNAPSHOT_EXTENSIONS[ofmt]}"
+        name = self._files.get((device, ofmt, file_name, tuple(json_paths))) if json_paths is not None else None
+        if name is None:
+            name = self._files.get((device, ofmt, file_name, None))
+        if name is None:
+            return None
+        if self._contents is not None:
+            return self._contents[name].decode(encoding="UTF-8")
+        if self._directory:
+            return (self.path / name).read_text(encoding="UTF-8")
+        if self._zip is None:
+            self._zip = self._resources.enter_context(zipfile.ZipFile(self.path))
+        return self._zip.read(name).decode(encoding="UTF-8")
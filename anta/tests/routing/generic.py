@@ -137,7 +137,8 @@ class VerifyRoutingTableEntry(AntaTest):
     categories: ClassVar[list[str]] = ["routing"]
     commands: ClassVar[list[AntaCommand | AntaTemplate]] = [
         AntaTemplate(template="show ip route vrf {vrf} {route}", revision=4),
-        AntaTemplate(template="show ip route vrf {vrf}", revision=4),
+        # The routing table of a VRF can be very large, only the routes are used
+        AntaTemplate(template="show ip route vrf {vrf}", revision=4, json_paths=["vrfs.{vrf}.routes"]),
     ]
 
     class Input(AntaTest.Input):
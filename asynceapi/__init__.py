@@ -6,7 +6,19 @@
 """Arista EOS eAPI asyncio client."""
 
 from .config_session import SessionConfig
-from .device import Device
+from .device import Device, PoolStatistics
 from .errors import EapiCommandError
+from .json_codec import JSONCodec, get_codec
+from .ssl_context import SessionCachingSSLContext, TLSStatistics, shared_ssl_context
 
-__all__ = ["Device", "SessionConfig", "EapiCommandError"]
+__all__ = [
+    "Device",
+    "SessionConfig",
+    "EapiCommandError",
+    "PoolStatistics",
+    "JSONCodec",
+    "SessionCachingSSLContext",
+    "TLSStatistics",
+    "get_codec",
+    "shared_ssl_context",
+]
@@ -33,7 +33,7 @@ __all__ = ["port_check_url"]
 # -----------------------------------------------------------------------------
 
 
-async def port_check_url(url: URL, timeout: int = 5) -> bool:
+async def port_check_url(url: URL, timeout: float = 5) -> bool:
     """Open the port designated by the URL given the timeout in seconds.
 
     Parameters
@@ -46,7 +46,7 @@ async def port_check_url(url: URL, timeout: int = 5) -> bool:
     Returns
     -------
     bool
-        If the port is available then return True; False otherwise.
+        If the port is available then return True; False otherwise, including when the connection is refused or the host is unreachable.
     """
     port = url.port or socket.getservbyname(url.scheme)
 
@@ -57,6 +57,6 @@ async def port_check_url(url: URL, timeout: int = 5) -> bool:
         # MUST close if opened!
         wr.close()
 
-    except TimeoutError:
+    except (TimeoutError, OSError):
         return False
     return True
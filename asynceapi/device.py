@@ -9,6 +9,8 @@
 
 from __future__ import annotations
 
+import time
+from dataclasses import asdict, dataclass
 from socket import getservbyname
 from typing import TYPE_CHECKING, Any
 
@@ -23,6 +25,9 @@ import httpx
 from .aio_portcheck import port_check_url
 from .config_session import SessionConfig
 from .errors import EapiCommandError
+from .json_codec import JSONCodec, get_codec
+from .json_stream import parse_response, select_outputs_paths, streaming_available
+from .ssl_context import shared_ssl_context
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -32,7 +37,7 @@ if TYPE_CHECKING:
 # -----------------------------------------------------------------------------
 
 
-__all__ = ["Device"]
+__all__ = ["Device", "PoolStatistics"]
 
 
 # -----------------------------------------------------------------------------
@@ -42,11 +47,67 @@ __all__ = ["Device"]
 # -----------------------------------------------------------------------------
 
 
+@dataclass
+class PoolStatistics:
+    """Statistics of the connection pool of a Device.
+
+    Attributes
+    ----------
+    requests
+        Number of requests sent.
+    connections
+        Number of connections opened, i.e. TCP and TLS handshakes.
+    wait_time
+        Total time in seconds the requests waited for a connection of the pool.
+    max_wait_time
+        Maximum time in seconds a request waited for a connection of the pool.
+    """
+
+    requests: int = 0
+    connections: int = 0
+    wait_time: float = 0.0
+    max_wait_time: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return asdict(self)
+
+
+class _PoolTrace:  # pylint: disable=too-few-public-methods
+    """httpcore trace extension measuring the time a request waits for a connection of the pool.
+
+    httpcore calls the trace extension for each event of the request, the instance is only used as a callable.
+    The wait time is the time elapsed before sending the request headers, minus the time spent opening a new connection.
+    """
+
+    def __init__(self, statistics: PoolStatistics) -> None:
+        self.statistics = statistics
+        self.start = time.monotonic()
+        self.connect_start: float | None = None
+        self.connect_time = 0.0
+        self.sent = False
+
+    async def __call__(self, event_name: str, _info: dict[str, Any]) -> None:
+        now = time.monotonic()
+        if event_name == "connection.connect_tcp.started":
+            self.statistics.connections += 1
+            self.connect_start = now
+        elif event_name in {"connection.connect_tcp.complete", "connection.start_tls.complete"} and self.connect_start is not None:
+            self.connect_time = now - self.connect_start
+        elif event_name.endswith(".send_request_headers.started") and not self.sent:
+            self.sent = True
+            wait_time = max(0.0, now - self.start - self.connect_time)
+            self.statistics.wait_time += wait_time
+            self.statistics.max_wait_time = max(self.statistics.max_wait_time, wait_time)
+
+
 class Device(httpx.AsyncClient):
     """Represent the async JSON-RPC client that communicates with an Arista EOS device.
 
     This class inherits directly from the
     httpx.AsyncClient, so any initialization options can be passed directly.
+
+    The statistics of the connection pool of the client are available in the `pool_statistics` attribute.
     """
 
     auth = None
@@ -94,32 +155,50 @@ class Device(httpx.AsyncClient):
             If provided, used as the httpx authorization initializer value. If
             not provided, then username+password is assumed by the Caller and
             used to create a BasicAuth instance.
+
+        verify :
+            If provided, used as the httpx TLS verification initializer value. If
+            not provided, the SSL context shared by all the Device instances is used:
+            the certificates are not verified and the TLS sessions are resumed.
+
+        json_codec : JSONCodec
+            If provided, the JSON codec used to encode the eAPI requests and decode
+            the eAPI responses. If not provided, the standard library is used, see
+            `asynceapi.json_codec.get_codec()`.
         """
         self.port = port or getservbyname(proto)
         self.host = host
         kwargs.setdefault("base_url", httpx.URL(f"{proto}://{self.host}:{self.port}"))
-        kwargs.setdefault("verify", False)
+        kwargs.setdefault("verify", shared_ssl_context())
 
         if username and password:
             self.auth = httpx.BasicAuth(username, password)
 
         kwargs.setdefault("auth", self.auth)
+        json_codec: JSONCodec | None = kwargs.pop("json_codec", None)
+        self.json_codec = json_codec if json_codec is not None else get_codec()
 
         super().__init__(**kwargs)
         self.headers["Content-Type"] = "application/json-rpc"
+        self.pool_statistics = PoolStatistics()
 
-    async def check_connection(self) -> bool:
+    async def check_connection(self, timeout: float = 5) -> bool:
         """Check the target device to ensure that the eAPI port is open and accepting connections.
 
         It is recommended that a Caller checks the connection before involving cli commands,
         but this step is not required.
 
+        Parameters
+        ----------
+        timeout
+            Time to await for the eAPI port to open in seconds.
+
         Returns
         -------
         bool
             True when the device eAPI is accessible, False otherwise.
         """
-        return await port_check_url(self.base_url)
+        return await port_check_url(self.base_url, timeout=timeout)
 
     async def cli(  # noqa: PLR0913
         self,
@@ -132,6 +211,8 @@ class Device(httpx.AsyncClient):
         auto_complete: bool = False,
         expand_aliases: bool = False,
         req_id: int | str | None = None,
+        timeout: float | None = None,
+        json_paths: Sequence[Sequence[str] | None] | None = None,
     ) -> list[dict[str, Any] | str] | dict[str, Any] | str | None:
         """Execute one or more CLI commands.
 
@@ -173,6 +254,10 @@ class Device(httpx.AsyncClient):
                 return the output of show version.
         req_id
             A unique identifier that will be echoed back by the switch. May be a string or number.
+        timeout
+            Timeout in seconds of the eAPI request. None means the timeout of the client is used.
+        json_paths
+            The JSON paths to select in the output of each command, see `jsonrpc_exec()`.
 
         Returns
         -------
@@ -188,7 +273,7 @@ class Device(httpx.AsyncClient):
         )
 
         try:
-            res = await self.jsonrpc_exec(jsonrpc)
+            res = await self.jsonrpc_exec(jsonrpc, timeout=timeout, json_paths=json_paths)
             return res[0] if command else res
         except EapiCommandError:
             if suppress_error:
@@ -259,13 +344,21 @@ class Device(httpx.AsyncClient):
 
         return cmd
 
-    async def jsonrpc_exec(self, jsonrpc: dict[str, Any]) -> list[dict[str, Any] | str]:
+    async def jsonrpc_exec(
+        self, jsonrpc: dict[str, Any], *, timeout: float | None = None, json_paths: Sequence[Sequence[str] | None] | None = None
+    ) -> list[dict[str, Any] | str]:
         """Execute the JSON-RPC dictionary object.
 
         Parameters
         ----------
         jsonrpc
             The JSON-RPC as created by the `meth`:_jsonrpc_command().
+        timeout
+            Timeout in seconds of the eAPI request. None means the timeout of the client is used.
+        json_paths
+            The JSON paths to select in the JSON output of each command, None meaning the whole output, see
+            `asynceapi.json_stream.select_paths()`. When the ijson library is installed, the response is
+            streamed and only the selected subtrees are materialized, which caps the memory usage for large outputs.
 
         Raises
         ------
@@ -278,12 +371,27 @@ class Device(httpx.AsyncClient):
             The list of command results; either dict or text depending on the
             JSON-RPC format parameter.
         """
-        res = await self.post("/command-api", json=jsonrpc)
-        res.raise_for_status()
-        body = res.json()
-
         commands = jsonrpc["params"]["cmds"]
         ofmt = jsonrpc["params"]["format"]
+        if ofmt == "text" or json_paths is None or all(paths is None for paths in json_paths):
+            json_paths = None
+
+        self.pool_statistics.requests += 1
+        request_kwargs: dict[str, Any] = {
+            "content": self.json_codec.dumps(jsonrpc),
+            "timeout": httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+            "extensions": {"trace": _PoolTrace(self.pool_statistics)},
+        }
+        if json_paths is not None and streaming_available():
+            async with self.stream("POST", "/command-api", **request_kwargs) as res:
+                res.raise_for_status()
+                body = await parse_response(res.aiter_bytes(), json_paths)
+        else:
+            res = await self.post("/command-api", **request_kwargs)
+            res.raise_for_status()
+            body = self.json_codec.loads(res.content)
+            if json_paths is not None and "result" in body:
+                body["result"] = select_outputs_paths(body["result"], json_paths)
 
         get_output = (lambda _r: _r["output"]) if ofmt == "text" else (lambda _r: _r)
 
@@ -314,8 +422,12 @@ class Device(httpx.AsyncClient):
         err_msg = err_data["message"]
         failed_cmd = commands[err_at]
 
+        passed = [get_output(cmd_data[cmd_i]) for cmd_i, cmd in enumerate(commands[:err_at])]
+        if json_paths is not None:
+            passed = select_outputs_paths(passed, json_paths)
+
         raise EapiCommandError(
-            passed=[get_output(cmd_data[cmd_i]) for cmd_i, cmd in enumerate(commands[:err_at])],
+            passed=passed,
             failed=failed_cmd["cmd"] if isinstance(failed_cmd, dict) else failed_cmd,
             errors=cmd_data[err_at]["errors"],
             errmsg=err_msg,
@@ -0,0 +1,120 @@
+# Copyright (c) 2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""JSON codecs used to encode the eAPI requests and decode the eAPI responses."""
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import importlib
+import json
+from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = ["JSONCodec", "available_codecs", "get_codec"]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class JSONCodec:
+    """JSON encoder and decoder of a JSON library.
+
+    Attributes
+    ----------
+    name
+        Name of the JSON library.
+    loads
+        Decode a JSON document from bytes.
+    dumps
+        Encode an object to a JSON document in bytes.
+    """
+
+    name: str
+    loads: Callable[[bytes], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _stdlib_codec() -> JSONCodec:
+    return JSONCodec("json", json.loads, lambda obj: json.dumps(obj).encode())
+
+
+def _orjson_codec() -> JSONCodec:
+    # orjson decodes the integers larger than 64 bits as floats, EOS counters are at most 64 bits
+    orjson = importlib.import_module("orjson")
+    decode_error = orjson.JSONDecodeError
+
+    def loads(data: bytes) -> Any:  # noqa: ANN401
+        try:
+            return orjson.loads(data)
+        except decode_error:
+            # orjson rejects NaN, Infinity and the numbers overflowing a double, which the standard library accepts
+            return json.loads(data)
+
+    return JSONCodec("orjson", loads, orjson.dumps)
+
+
+# The codecs by order of speed, the fastest first
+_CODECS: dict[str, Callable[[], JSONCodec]] = {"orjson": _orjson_codec, "json": _stdlib_codec}
+
+
+def available_codecs() -> list[str]:
+    """Return the names of the JSON codecs whose library is installed, the fastest first.
+
+    Returns
+    -------
+    list[str]
+        The names of the available JSON codecs.
+    """
+    names = []
+    for name, factory in _CODECS.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+@cache
+def get_codec(name: str | None = None) -> JSONCodec:
+    """Return a JSON codec.
+
+    Parameters
+    ----------
+    name
+        Name of the JSON codec: 'orjson' or 'json' (standard library). None means the standard library.
+        orjson is faster but decodes the integers larger than 64 bits as floats.
+
+    Raises
+    ------
+    ValueError
+        If the JSON codec is unknown.
+    ImportError
+        If the library of the JSON codec is not installed.
+
+    Returns
+    -------
+    JSONCodec
+        The JSON codec.
+    """
+    if name is None:
+        return _stdlib_codec()
+    if name not in _CODECS:
+        msg = f"Unknown JSON codec '{name}', supported codecs are: {', '.join(_CODECS)}"
+        raise ValueError(msg)
+    return _CODECS[name]()
@@ -0,0 +1,264 @@
+# Copyright (c) 2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""Selection of JSON paths in the eAPI command outputs, streaming the eAPI responses when ijson is installed."""
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import importlib
+from functools import cache, partial
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Sequence
+    from types import ModuleType
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = ["escape_path_key", "parse_response", "select_outputs_paths", "select_paths", "streaming_available"]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+# Key of the items of a JSON array in the path of a value, never the key of a JSON object
+ARRAY_ITEM = None
+RESULT_PREFIX = ("result", ARRAY_ITEM)
+SCALAR_EVENTS = frozenset({"string", "number", "boolean", "null"})
+START_EVENTS = frozenset({"start_map", "start_array"})
+END_EVENTS = frozenset({"end_map", "end_array"})
+
+
+@cache
+def _ijson() -> ModuleType | None:
+    try:
+        return importlib.import_module("ijson")
+    except ImportError:
+        return None
+
+
+def streaming_available() -> bool:
+    """Return True if the ijson library is installed to stream the eAPI responses."""
+    return _ijson() is not None
+
+
+def escape_path_key(key: str) -> str:
+    """Escape a key of a JSON object to be used in a JSON path, e.g. a VRF name containing a dot.
+
+    Parameters
+    ----------
+    key
+        The key of the JSON object.
+
+    Returns
+    -------
+    str
+        The key with its dots and backslashes escaped with a backslash.
+    """
+    return key.replace("\\", "\\\\").replace(".", "\\.")
+
+
+def _split_path(path: str) -> tuple[str, ...]:
+    """Return the keys of a JSON path, see `escape_path_key()`."""
+    keys: list[str] = []
+    key: list[str] = []
+    escaped = False
+    for char in path:
+        if escaped:
+            key.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ".":
+            keys.append("".join(key))
+            key = []
+        else:
+            key.append(char)
+    keys.append("".join(key))
+    return tuple(keys)
+
+
+def _set_path(output: dict[str, Any], keys: Sequence[str], value: Any) -> None:  # noqa: ANN401
+    for key in keys[:-1]:
+        output = output.setdefault(key, {})
+    output[keys[-1]] = value
+
+
+def select_paths(output: Any, paths: Sequence[str] | None) -> Any:  # noqa: ANN401
+    r"""Return the subtrees of a command output at the given JSON paths.
+
+    A JSON path is the dot-separated keys of nested JSON objects, e.g. `vrfs.default.routes`. The dots and backslashes
+    of a key are escaped with a backslash, e.g. `vrfs.v\.1.routes` for the VRF `v.1`, see `escape_path_key()`.
+    The subtrees are kept at the same path in the returned output, the paths missing from the output are ignored.
+
+    Parameters
+    ----------
+    output
+        The command output.
+    paths
+        The JSON paths to select. None means the whole output is selected.
+
+    Returns
+    -------
+    Any
+        The selected subtrees of the command output.
+    """
+    if paths is None or not isinstance(output, dict):
+        return output
+    selected: dict[str, Any] = {}
+    for path in paths:
+        keys = _split_path(path)
+        value = output
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            _set_path(selected, keys, value)
+    return selected
+
+
+def select_outputs_paths(outputs: list[Any], json_paths: Sequence[Sequence[str] | None]) -> list[Any]:
+    """Return the subtrees of the command outputs at the given JSON paths, see `select_paths()`.
+
+    Parameters
+    ----------
+    outputs
+        The outputs of the commands.
+    json_paths
+        The JSON paths to select in the output of each command. The outputs without JSON paths are selected as a whole.
+
+    Returns
+    -------
+    list[Any]
+        The selected subtrees of the command outputs.
+    """
+    return [select_paths(output, json_paths[index] if index < len(json_paths) else None) for index, output in enumerate(outputs)]
+
+
+class _AsyncReader:  # pylint: disable=too-few-public-methods
+    """Async file-like object reading the chunks of an async iterator, as expected by ijson.
+
+    ijson only calls the `read()` coroutine of the file-like object.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self.chunks = chunks
+
+    async def read(self, size: int = -1) -> bytes:
+        """Return the next chunk of the iterator, an empty bytes object once the iterator is exhausted."""
+        if size == 0:
+            # ijson reads 0 bytes to check the type of the file
+            return b""
+        # The anext() built-in function is not available in Python 3.9, leaving the loop does not close the iterator
+        async for chunk in self.chunks:
+            return chunk
+        return b""
+
+
+class _ResponseParser:  # pylint: disable=too-few-public-methods
+    """Build a JSON-RPC response body from the ijson events, keeping only the subtrees of the command outputs at the given JSON paths.
+
+    The state of the parser is only updated by `target()`, called by `parse_response()` for each ijson event starting a value.
+    The path of a value is the tuple of the keys of the JSON objects and of `ARRAY_ITEM` for the JSON arrays containing it.
+    """
+
+    def __init__(self, json_paths: Sequence[Sequence[str] | None]) -> None:
+        self.json_paths = json_paths
+        self.body: dict[str, Any] = {}
+        self.results: list[Any] = []
+        # The keys of the JSON paths to select in the output of the current command
+        self.paths: set[tuple[str, ...]] | None = None
+
+    def target(self, path: tuple[str | None, ...], event: str, value: Any) -> Callable[[Any], None] | None:  # noqa: ANN401
+        """Return the function storing the value starting with this event, None if the value is skipped."""
+        if path == RESULT_PREFIX:
+            # Output of the next command
+            command_paths = self.json_paths[len(self.results)] if len(self.results) < len(self.json_paths) else None
+            self.paths = {_split_path(command_path) for command_path in command_paths} if command_paths is not None and event == "start_map" else None
+            if self.paths is None:
+                return self.results.append
+            self.results.append({})
+        elif self.paths is not None and path[: len(RESULT_PREFIX)] == RESULT_PREFIX and (keys := path[len(RESULT_PREFIX) :]) in self.paths:
+            # The keys of the selected paths are never ARRAY_ITEM
+            return partial(_set_path, self.results[-1], cast("tuple[str, ...]", keys))
+        elif path == ("result",) and event == "start_array":
+            self.body["result"] = self.results
+        elif path == ("error",) and event == "start_map":
+            return partial(self.body.__setitem__, "error")
+        elif path == ("jsonrpc",):
+            self.body["jsonrpc"] = value
+        elif path == ("id",):
+            self.body["id"] = value
+        return None
+
+
+async def parse_response(chunks: AsyncIterator[bytes], json_paths: Sequence[Sequence[str] | None]) -> dict[str, Any]:
+    """Parse a streamed eAPI response, materializing only the subtrees of the command outputs at the given JSON paths.
+
+    The other subtrees of the command outputs are skipped while parsing the response, which caps the memory usage for large outputs.
+    The error object of the response, if any, is materialized in full.
+
+    Parameters
+    ----------
+    chunks
+        The chunks of the eAPI response body.
+    json_paths
+        The JSON paths to select in the output of each command, see `select_paths()`. None means the whole output is selected.
+
+    Raises
+    ------
+    RuntimeError
+        If the ijson library is not installed.
+
+    Returns
+    -------
+    dict[str, Any]
+        The JSON-RPC response body.
+    """
+    if (ijson := _ijson()) is None:
+        msg = "Streaming the eAPI responses requires the 'ijson' library"
+        raise RuntimeError(msg)
+
+    parser = _ResponseParser(json_paths)
+    # The function storing the value being built and the builder of this value
+    building: tuple[Callable[[Any], None], Any] | None = None
+    depth = 0
+    # Path of the current value, the ijson prefixes are ambiguous for the keys containing a dot
+    path: list[str | None] = []
+
+    async for event, value in ijson.basic_parse_async(_AsyncReader(chunks), use_float=True):
+        if building is not None:
+            store, builder = building
+            builder.event(event, value)
+            depth += 1 if event in START_EVENTS else -1 if event in END_EVENTS else 0
+            if depth == 0:
+                store(builder.value)
+                building = None
+            continue
+        if event == "map_key":
+            path[-1] = value
+            continue
+        if event in END_EVENTS:
+            path.pop()
+            continue
+        target = parser.target(tuple(path), event, value)
+        if event in SCALAR_EVENTS:
+            if target is not None:
+                target(value)
+        elif target is not None:
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            building = (target, builder)
+            depth = 1
+        else:
+            # The key of a JSON object is set by the next map_key event
+            path.append(ARRAY_ITEM)
+    return parser.body
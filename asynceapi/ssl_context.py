@@ -0,0 +1,154 @@
+# Copyright (c) 2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""SSL context shared by the Device instances, resuming the TLS sessions."""
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import ssl
+import time
+from dataclasses import asdict, dataclass
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import sys
+
+    if sys.version_info >= (3, 11):
+        from typing import Self
+    else:
+        from typing_extensions import Self
+
+# -----------------------------------------------------------------------------
+# Exports
+# -----------------------------------------------------------------------------
+
+__all__ = ["SessionCachingSSLContext", "TLSStatistics", "shared_ssl_context"]
+
+# -----------------------------------------------------------------------------
+#
+#                                 CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+
+@dataclass
+class TLSStatistics:
+    """Statistics of the TLS handshakes of a SessionCachingSSLContext.
+
+    Attributes
+    ----------
+    handshakes
+        Number of completed TLS handshakes.
+    resumed
+        Number of completed TLS handshakes that resumed a previous session.
+    handshake_time
+        Total time in seconds spent computing the TLS handshakes, excluding the time waiting for the network.
+    """
+
+    handshakes: int = 0
+    resumed: int = 0
+    handshake_time: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return asdict(self)
+
+
+class _SessionCachingSSLObject(ssl.SSLObject):
+    """SSLObject storing its TLS session in its SessionCachingSSLContext to resume it on the next connection to the same host."""
+
+    context: SessionCachingSSLContext
+    _session_refreshed = False
+
+    def do_handshake(self) -> None:
+        """Start the TLS handshake and store the TLS session once it is completed."""
+        start = time.perf_counter()
+        try:
+            super().do_handshake()
+        finally:
+            self.context.statistics.handshake_time += time.perf_counter() - start
+        self.context.statistics.handshakes += 1
+        if self.session_reused:
+            self.context.statistics.resumed += 1
+        self._store_session()
+
+    def read(self, len: int = 1024, buffer: Any = None) -> Any:  # noqa: A002, ANN401
+        """Read data from the TLS connection.
+
+        With TLS 1.3, the session tickets are sent by the server after the handshake: the session is stored again after the first read.
+        """
+        data = super().read(len, buffer)
+        if not self._session_refreshed:
+            self._session_refreshed = True
+            self._store_session()
+        return data
+
+    def _store_session(self) -> None:
+        if self.server_hostname is not None and (session := self.session) is not None:
+            self.context.sessions[self.server_hostname] = session
+
+
+class SessionCachingSSLContext(ssl.SSLContext):
+    """Client SSLContext caching the TLS sessions by host name to resume them when reconnecting.
+
+    Resuming a TLS session skips the key exchange of a full handshake, which dominates the CPU time of the connections.
+    Only the connections using `wrap_bio()`, like the asyncio and anyio TLS streams used by httpx, resume their sessions.
+
+    The port of a connection is not known by the SSL context: the sessions are keyed by host name only. The servers sharing
+    a host name on different ports, e.g. devices reached through port forwarding on localhost, replace the session of each other;
+    a server rejects the session of another server and a full handshake is done instead.
+
+    Attributes
+    ----------
+    sessions
+        The last TLS session of each host name.
+    statistics
+        The statistics of the TLS handshakes.
+    """
+
+    sslobject_class = _SessionCachingSSLObject
+
+    def __new__(cls, protocol: int = ssl.PROTOCOL_TLS_CLIENT) -> Self:
+        """Create a client SSLContext."""
+        return super().__new__(cls, protocol)
+
+    def __init__(self, protocol: int = ssl.PROTOCOL_TLS_CLIENT) -> None:  # noqa: ARG002 # the protocol is set by __new__()
+        """Initialize the cache of TLS sessions and the statistics."""
+        self.sessions: dict[str, ssl.SSLSession] = {}
+        self.statistics = TLSStatistics()
+
+    def wrap_bio(
+        self,
+        incoming: ssl.MemoryBIO,
+        outgoing: ssl.MemoryBIO,
+        server_side: bool = False,  # noqa: FBT001, FBT002
+        server_hostname: str | bytes | None = None,
+        session: ssl.SSLSession | None = None,
+    ) -> ssl.SSLObject:
+        """Wrap the BIO objects in an SSLObject, resuming the last TLS session of the host if any."""
+        if session is None and not server_side and server_hostname is not None:
+            # anyio passes the IDNA encoded host name
+            session = self.sessions.get(server_hostname.decode() if isinstance(server_hostname, bytes) else server_hostname)
+        return super().wrap_bio(incoming, outgoing, server_side=server_side, server_hostname=server_hostname, session=session)
+
+
+@cache
+def shared_ssl_context() -> SessionCachingSSLContext:
+    """Return the SSL context shared by the Device instances of the process.
+
+    The TLS certificates are not verified, like with `verify=False`.
+    Building a single SSL context avoids building one per Device and allows the TLS sessions to be resumed.
+
+    Returns
+    -------
+    SessionCachingSSLContext
+        The SSL context shared by the Device instances.
+    """
+    context = SessionCachingSSLContext()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
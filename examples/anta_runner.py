@@ -21,6 +21,7 @@ from anta.inventory import AntaInventory
 from anta.logger import Log, setup_logging
 from anta.models import AntaTest
 from anta.result_manager import ResultManager
+from anta.result_manager.models import AntaTestStatus, TestResult
 from anta.runner import main as anta_runner
 
 # setup logging
@@ -54,11 +55,18 @@ LOGGER.info("%s Inventory loaded!", SCRIPT_LOG_PREFIX)
 # Create result manager object
 manager = ResultManager()
 
+
+def log_failure(result: TestResult) -> None:
+    """Log failed tests as soon as they are completed, while the run is still going."""
+    if result.result in (AntaTestStatus.FAILURE, AntaTestStatus.ERROR):
+        LOGGER.warning("%s %s:%s:%s", SCRIPT_LOG_PREFIX, result.name, result.test, result.result)
+
+
 # Launch ANTA
 LOGGER.info("%s  Starting ANTA runner...", SCRIPT_LOG_PREFIX)
 with anta_progress_bar() as AntaTest.progress:
     # Set dry_run to True to avoid connecting to the devices
-    asyncio.run(anta_runner(manager, inventory, catalog, dry_run=False))
+    asyncio.run(anta_runner(manager, inventory, catalog, dry_run=False, on_result=log_failure))
 
 LOGGER.info("%s ANTA run completed!", SCRIPT_LOG_PREFIX)
 
@@ -3,22 +3,29 @@
 # that can be found in the LICENSE file.
 """Benchmark tests for ANTA."""
 
-import asyncio
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING
 from unittest.mock import patch
 
 import pytest
 import respx
-from pytest_codspeed import BenchmarkFixture
 
-from anta.catalog import AntaCatalog
-from anta.inventory import AntaInventory
 from anta.result_manager import ResultManager
 from anta.result_manager.models import AntaTestStatus
 from anta.runner import main
 
 from .utils import collect, collect_commands
 
+if TYPE_CHECKING:
+    import asyncio
+
+    from pytest_codspeed import BenchmarkFixture
+
+    from anta.catalog import AntaCatalog
+    from anta.inventory import AntaInventory
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,16 +51,21 @@ def test_anta_dry_run(benchmark: BenchmarkFixture, event_loop: asyncio.AbstractE
 
 @patch("anta.models.AntaTest.collect", collect)
 @patch("anta.device.AntaDevice.collect_commands", collect_commands)
+# The eAPI responses are mocked per test, the outputs of the commands shared by several tests must not be deduplicated
+@patch("anta.device.AntaDevice.plan_commands", lambda _self, _commands: None)
 @respx.mock  # Mock eAPI responses
-def test_anta(benchmark: BenchmarkFixture, event_loop: asyncio.AbstractEventLoop, catalog: AntaCatalog, inventory: AntaInventory) -> None:
-    """Benchmark ANTA."""
+@pytest.mark.parametrize("process_pool_size", [pytest.param(None, id="event-loop"), pytest.param(4, id="process-pool")])
+def test_anta(
+    benchmark: BenchmarkFixture, event_loop: asyncio.AbstractEventLoop, catalog: AntaCatalog, inventory: AntaInventory, process_pool_size: int | None
+) -> None:
+    """Benchmark ANTA, evaluating the test results in the event loop or in a process pool."""
     # Disable logging during ANTA execution to avoid having these function time in benchmarks
     logging.disable()
 
     def _() -> ResultManager:
         manager = ResultManager()
         catalog.clear_indexes()
-        event_loop.run_until_complete(main(manager, inventory, catalog))
+        event_loop.run_until_complete(main(manager, inventory, catalog, process_pool_size=process_pool_size))
         return manager
 
     manager = benchmark(_)
@@ -0,0 +1,43 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""Benchmark tests for asynceapi."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from asynceapi.json_codec import available_codecs, get_codec
+
+if TYPE_CHECKING:
+    from pytest_codspeed import BenchmarkFixture
+
+    from .utils import AntaMockEnvironment
+
+# The outputs of the unit tests are replicated to get an eAPI response of a few MB, like `show interfaces` on a chassis
+OUTPUTS_REPLICAS = 20
+
+
+@pytest.fixture(name="eapi_response", scope="module")
+def eapi_response_fixture(anta_mock_env: AntaMockEnvironment) -> bytes:
+    """Return an eAPI response with the JSON outputs of all the ANTA unit tests."""
+    outputs = [output for eos_data in anta_mock_env.eos_data_catalog.values() for output in eos_data if isinstance(output, dict)]
+    return json.dumps({"jsonrpc": "2.0", "id": "benchmark", "result": outputs * OUTPUTS_REPLICAS}).encode()
+
+
+@pytest.mark.parametrize("codec", available_codecs())
+def test_json_decode(benchmark: BenchmarkFixture, eapi_response: bytes, codec: str) -> None:
+    """Benchmark the decoding of an eAPI response with the available JSON codecs."""
+    body: dict[str, Any] = benchmark(get_codec(codec).loads, eapi_response)
+    assert body == json.loads(eapi_response)
+
+
+@pytest.mark.parametrize("codec", available_codecs())
+def test_json_encode(benchmark: BenchmarkFixture, eapi_response: bytes, codec: str) -> None:
+    """Benchmark the encoding of an eAPI request with the available JSON codecs."""
+    body = json.loads(eapi_response)
+    request: bytes = benchmark(get_codec(codec).dumps, body)
+    assert json.loads(request) == body
@@ -0,0 +1,23 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""Benchmark tests for anta.models."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pytest_codspeed import BenchmarkFixture
+
+    from anta.catalog import AntaCatalog
+    from anta.inventory import AntaInventory
+
+
+def test_blocked(benchmark: BenchmarkFixture, catalog: AntaCatalog, inventory: AntaInventory) -> None:
+    """Benchmark `anta.models.AntaTest.blocked` for all the tests of the catalog."""
+    tests = [definition.test(device=device, inputs=definition.inputs) for device in inventory.devices for definition in catalog.tests]
+
+    blocked = benchmark(lambda: [test.blocked for test in tests])
+
+    assert not any(blocked)
@@ -5,6 +5,8 @@
 
 from __future__ import annotations
 
+import logging
+import tracemalloc
 from typing import TYPE_CHECKING
 
 from anta.result_manager import ResultManager
@@ -19,6 +21,11 @@ if TYPE_CHECKING:
     from anta.device import AntaDevice
     from anta.inventory import AntaInventory
 
+logger = logging.getLogger(__name__)
+
+# Upper bound of the memory allocated per test instance by `anta.runner.get_coroutines`
+MAX_MEMORY_PER_TEST = 8 * 1024
+
 
 def test_prepare_tests(benchmark: BenchmarkFixture, catalog: AntaCatalog, inventory: AntaInventory) -> None:
     """Benchmark `anta.runner.prepare_tests`."""
@@ -40,9 +47,36 @@ def test_get_coroutines(benchmark: BenchmarkFixture, catalog: AntaCatalog, inven
 
     assert selected_tests is not None
 
-    coroutines = benchmark(lambda: get_coroutines(selected_tests=selected_tests, manager=ResultManager()))
+    coroutines = benchmark(lambda: list(get_coroutines(selected_tests=selected_tests, manager=ResultManager())))
     for coros in coroutines:
         coros.close()
 
     count = sum(len(tests) for tests in selected_tests.values())
     assert count == len(coroutines)
+
+
+def test_get_coroutines_memory(benchmark: BenchmarkFixture, catalog: AntaCatalog, inventory: AntaInventory) -> None:
+    """Benchmark the memory allocated by `anta.runner.get_coroutines`.
+
+    The peak of the traced memory is logged and checked against `MAX_MEMORY_PER_TEST`, the benchmark measures the traced run.
+    """
+    selected_tests = prepare_tests(inventory=inventory, catalog=catalog, tests=None, tags=None)
+
+    assert selected_tests is not None
+
+    def _() -> int:
+        tracemalloc.start()
+        try:
+            coroutines = list(get_coroutines(selected_tests=selected_tests, manager=ResultManager()))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        for coros in coroutines:
+            coros.close()
+        return peak
+
+    peak = benchmark(_)
+
+    count = sum(len(tests) for tests in selected_tests.values())
+    logger.info("get_coroutines peak memory: %s bytes for %s tests, %s bytes per test", peak, count, peak // count)
+    assert peak < count * MAX_MEMORY_PER_TEST
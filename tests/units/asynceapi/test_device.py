@@ -5,12 +5,15 @@
 
 from __future__ import annotations
 
+import socket
 from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
 
 import pytest
 from httpx import HTTPStatusError
 
-from asynceapi import Device, EapiCommandError
+from asynceapi import Device, EapiCommandError, PoolStatistics
+from asynceapi.device import _PoolTrace
 
 from .test_data import ERROR_EAPI_RESPONSE, JSONRPC_REQUEST_TEMPLATE, SUCCESS_EAPI_RESPONSE
 
@@ -83,3 +86,51 @@ async def test_jsonrpc_exec_http_status_error(asynceapi_device: Device, httpx_mo
 
     with pytest.raises(HTTPStatusError):
         await asynceapi_device.jsonrpc_exec(jsonrpc=jsonrpc_request)
+
+
+async def test_jsonrpc_exec_pool_statistics(asynceapi_device: Device, httpx_mock: HTTPXMock) -> None:
+    """Test that the Device.jsonrpc_exec method counts the requests in the pool statistics."""
+    jsonrpc_request: dict[str, Any] = JSONRPC_REQUEST_TEMPLATE.copy()
+    jsonrpc_request["params"]["cmds"] = ["show version"]
+
+    httpx_mock.add_response(json=SUCCESS_EAPI_RESPONSE)
+    httpx_mock.add_response(json=SUCCESS_EAPI_RESPONSE)
+
+    await asynceapi_device.jsonrpc_exec(jsonrpc=jsonrpc_request)
+    await asynceapi_device.jsonrpc_exec(jsonrpc=jsonrpc_request)
+
+    assert asynceapi_device.pool_statistics.requests == 2
+
+
+@pytest.mark.parametrize(
+    ("events", "expected"),
+    [
+        pytest.param(
+            ["connection.connect_tcp.started", "connection.connect_tcp.complete", "connection.start_tls.complete", "http11.send_request_headers.started"],
+            {"requests": 0, "connections": 1, "wait_time": 2.5, "max_wait_time": 2.5},
+            id="new-connection",
+        ),
+        pytest.param(
+            ["http2.send_request_headers.started", "http2.send_request_headers.started"],
+            {"requests": 0, "connections": 0, "wait_time": 1.0, "max_wait_time": 1.0},
+            id="reused-connection",
+        ),
+    ],
+)
+async def test_pool_trace(events: list[str], expected: dict[str, Any]) -> None:
+    """Test that the trace extension measures the time a request waits for a connection of the pool."""
+    statistics = PoolStatistics()
+    with patch("asynceapi.device.time.monotonic", side_effect=[0.0, 1.0, 2.0, 3.0, 4.5][: len(events) + 1]):
+        trace = _PoolTrace(statistics)
+        for event in events:
+            await trace(event, {})
+    assert statistics.as_dict() == expected
+
+
+async def test_check_connection_refused() -> None:
+    """Test that Device.check_connection returns False without waiting for the timeout when the connection is refused."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    device = Device(host="127.0.0.1", port=port, username="admin", password="admin")
+    assert await device.check_connection(timeout=60) is False
@@ -0,0 +1,82 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""Unit tests the asynceapi.json_codec module."""
+
+from __future__ import annotations
+
+import json
+import math
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+
+from asynceapi import Device, JSONCodec, get_codec
+from asynceapi.json_codec import available_codecs
+
+from .test_data import JSONRPC_REQUEST_TEMPLATE, SUCCESS_EAPI_RESPONSE
+
+if TYPE_CHECKING:
+    from pytest_httpx import HTTPXMock
+
+
+@pytest.mark.parametrize("codec", available_codecs())
+def test_codec(codec: str) -> None:
+    """Test that the available JSON codecs encode and decode like the standard library."""
+    json_codec = get_codec(codec)
+    assert json_codec.name == codec
+    assert json.loads(json_codec.dumps(SUCCESS_EAPI_RESPONSE)) == SUCCESS_EAPI_RESPONSE
+    assert json_codec.loads(json.dumps(SUCCESS_EAPI_RESPONSE).encode()) == SUCCESS_EAPI_RESPONSE
+    # EOS counters are 64 bits unsigned integers
+    assert json_codec.loads(b'{"counter": 18446744073709551615}') == {"counter": 18446744073709551615}
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.loads(b"{invalid")
+
+
+@pytest.mark.parametrize("codec", available_codecs())
+def test_codec_fallback(codec: str) -> None:
+    """Test that the available JSON codecs decode the values only supported by the standard library."""
+    json_codec = get_codec(codec)
+    values = json_codec.loads(b'{"nan": NaN, "infinity": Infinity, "overflow": 1e400}')
+    assert math.isnan(values["nan"])
+    assert values["infinity"] == values["overflow"] == math.inf
+
+
+def test_get_codec() -> None:
+    """Test that get_codec returns the standard library codec by default."""
+    assert available_codecs()[-1] == "json"
+    assert get_codec().name == "json"
+    # The integers larger than 64 bits are only decoded as integers by the standard library
+    assert get_codec().loads(b'{"counter": 18446744073709551616}') == {"counter": 18446744073709551616}
+    with patch("asynceapi.json_codec.importlib.import_module", side_effect=ImportError):
+        assert available_codecs() == ["json"]
+    with pytest.raises(ValueError, match="Unknown JSON codec 'ujson', supported codecs are: orjson, json"):
+        get_codec("ujson")
+
+
+async def test_jsonrpc_exec_json_codec(httpx_mock: HTTPXMock) -> None:
+    """Test that Device.jsonrpc_exec uses the JSON codec of the Device."""
+    calls: list[str] = []
+
+    def loads(data: bytes) -> Any:  # noqa: ANN401
+        calls.append("loads")
+        return json.loads(data)
+
+    def dumps(obj: Any) -> bytes:  # noqa: ANN401
+        calls.append("dumps")
+        return json.dumps(obj).encode()
+
+    device = Device(host="localhost", username="admin", password="admin", json_codec=JSONCodec("custom", loads, dumps))
+    jsonrpc_request: dict[str, Any] = JSONRPC_REQUEST_TEMPLATE.copy()
+    jsonrpc_request["params"]["cmds"] = ["show version"]
+    httpx_mock.add_response(json=SUCCESS_EAPI_RESPONSE)
+
+    result = await device.jsonrpc_exec(jsonrpc=jsonrpc_request)
+
+    assert result == SUCCESS_EAPI_RESPONSE["result"]
+    assert calls == ["dumps", "loads"]
+    request = httpx_mock.get_request()
+    assert request is not None
+    assert request.headers["Content-Type"] == "application/json-rpc"
+    assert json.loads(request.content) == jsonrpc_request
@@ -0,0 +1,145 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""Unit tests the asynceapi.json_stream module."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+
+from asynceapi import Device, EapiCommandError
+from asynceapi.json_stream import escape_path_key, parse_response, select_paths
+
+from .test_data import JSONRPC_REQUEST_TEMPLATE
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from pytest_httpx import HTTPXMock
+
+ROUTES_OUTPUT: dict[str, Any] = {
+    "vrfs": {
+        "default": {
+            "routes": {"10.1.0.1/32": {"routeType": "eBGP", "vias": [{"nexthopAddr": "10.0.0.1"}]}},
+            "allRoutesProgrammedHardware": True,
+            "totalRoutes": 1.0,
+        },
+    },
+}
+SUCCESS_RESPONSE: dict[str, Any] = {"jsonrpc": "2.0", "id": "EapiExplorer-1", "result": [{}, ROUTES_OUTPUT, ROUTES_OUTPUT, "scalar"]}
+ERROR_RESPONSE: dict[str, Any] = {
+    "jsonrpc": "2.0",
+    "id": "EapiExplorer-1",
+    "error": {"code": 1002, "message": "CLI command 2 of 2 'bad command' failed: invalid command", "data": [ROUTES_OUTPUT, {"errors": ["Invalid input"]}]},
+}
+JSON_PATHS = [None, ["vrfs.default.routes", "vrfs.default.missing", "missing"], None]
+SELECTED_ROUTES_OUTPUT = {"vrfs": {"default": {"routes": ROUTES_OUTPUT["vrfs"]["default"]["routes"]}}}
+# VRF names can contain dots, escaped in the JSON paths
+DOTTED_ROUTES_OUTPUT: dict[str, Any] = {
+    "vrfs": {
+        "v.1": ROUTES_OUTPUT["vrfs"]["default"],
+        "v": {"1": {"routes": {}}},
+    },
+}
+DOTTED_JSON_PATHS = [f"vrfs.{escape_path_key('v.1')}.routes"]
+SELECTED_DOTTED_ROUTES_OUTPUT = {"vrfs": {"v.1": {"routes": ROUTES_OUTPUT["vrfs"]["default"]["routes"]}}}
+
+
+async def _chunks(data: bytes, size: int = 16) -> AsyncIterator[bytes]:
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+@pytest.mark.parametrize(
+    ("output", "paths", "expected"),
+    [
+        pytest.param(ROUTES_OUTPUT, None, ROUTES_OUTPUT, id="no-paths"),
+        pytest.param(ROUTES_OUTPUT, ["vrfs.default.routes", "vrfs.default.missing", "missing"], SELECTED_ROUTES_OUTPUT, id="paths"),
+        pytest.param(ROUTES_OUTPUT, ["vrfs.default.totalRoutes.missing"], {}, id="scalar"),
+        pytest.param("text output", ["vrfs"], "text output", id="not-a-dict"),
+        pytest.param(DOTTED_ROUTES_OUTPUT, DOTTED_JSON_PATHS, SELECTED_DOTTED_ROUTES_OUTPUT, id="dotted-key"),
+        pytest.param({"a\\b.c": {"d": 1}, "a\\b": {"c": {"d": 2}}}, [escape_path_key("a\\b.c") + ".d"], {"a\\b.c": {"d": 1}}, id="backslash-key"),
+    ],
+)
+def test_select_paths(output: Any, paths: list[str] | None, expected: Any) -> None:  # noqa: ANN401
+    """Test asynceapi.json_stream.select_paths."""
+    assert select_paths(output, paths) == expected
+
+
+@pytest.mark.parametrize(
+    ("response", "expected"),
+    [
+        pytest.param(
+            SUCCESS_RESPONSE,
+            {"jsonrpc": "2.0", "id": "EapiExplorer-1", "result": [{}, SELECTED_ROUTES_OUTPUT, ROUTES_OUTPUT, "scalar"]},
+            id="success",
+        ),
+        pytest.param(ERROR_RESPONSE, ERROR_RESPONSE, id="error"),
+        pytest.param({"jsonrpc": "2.0", "id": 1, "result": []}, {"jsonrpc": "2.0", "id": 1, "result": []}, id="empty"),
+        pytest.param(
+            {"jsonrpc": "2.0", "id": 1, "result": [{}, DOTTED_ROUTES_OUTPUT]},
+            {"jsonrpc": "2.0", "id": 1, "result": [{}, {}]},
+            id="dotted-key-not-selected",
+        ),
+    ],
+)
+async def test_parse_response(response: dict[str, Any], expected: dict[str, Any]) -> None:
+    """Test asynceapi.json_stream.parse_response."""
+    pytest.importorskip("ijson")
+    assert await parse_response(_chunks(json.dumps(response).encode()), JSON_PATHS) == expected
+
+
+async def test_parse_response_ijson_not_installed() -> None:
+    """Test asynceapi.json_stream.parse_response when ijson is not installed."""
+    with patch("asynceapi.json_stream._ijson", return_value=None), pytest.raises(RuntimeError, match="Streaming the eAPI responses requires the 'ijson' library"):
+        await parse_response(_chunks(json.dumps(SUCCESS_RESPONSE).encode()), JSON_PATHS)
+
+
+@pytest.mark.parametrize("streaming", [pytest.param(True, id="streaming"), pytest.param(False, id="ijson-not-installed")])
+async def test_jsonrpc_exec_json_paths(asynceapi_device: Device, httpx_mock: HTTPXMock, streaming: bool) -> None:
+    """Test the Device.jsonrpc_exec method with JSON paths."""
+    if streaming:
+        pytest.importorskip("ijson")
+    jsonrpc_request: dict[str, Any] = JSONRPC_REQUEST_TEMPLATE.copy()
+    jsonrpc_request["params"]["cmds"] = ["enable", "show ip route", "show ip route", "show version"]
+    httpx_mock.add_response(json=SUCCESS_RESPONSE)
+
+    with patch("asynceapi.device.streaming_available", return_value=streaming):
+        result = await asynceapi_device.jsonrpc_exec(jsonrpc=jsonrpc_request, json_paths=JSON_PATHS)
+
+    assert result == [{}, SELECTED_ROUTES_OUTPUT, ROUTES_OUTPUT, "scalar"]
+
+
+@pytest.mark.parametrize("streaming", [pytest.param(True, id="streaming"), pytest.param(False, id="ijson-not-installed")])
+async def test_jsonrpc_exec_json_paths_dotted_key(asynceapi_device: Device, httpx_mock: HTTPXMock, streaming: bool) -> None:
+    """Test the Device.jsonrpc_exec method with a JSON path of a VRF name containing a dot."""
+    if streaming:
+        pytest.importorskip("ijson")
+    jsonrpc_request: dict[str, Any] = JSONRPC_REQUEST_TEMPLATE.copy()
+    jsonrpc_request["params"]["cmds"] = ["enable", "show ip route vrf v.1"]
+    httpx_mock.add_response(json={"jsonrpc": "2.0", "id": "EapiExplorer-1", "result": [{}, DOTTED_ROUTES_OUTPUT]})
+
+    with patch("asynceapi.device.streaming_available", return_value=streaming):
+        result = await asynceapi_device.jsonrpc_exec(jsonrpc=jsonrpc_request, json_paths=[None, DOTTED_JSON_PATHS])
+
+    assert result == [{}, SELECTED_DOTTED_ROUTES_OUTPUT]
+
+
+@pytest.mark.parametrize("streaming", [pytest.param(True, id="streaming"), pytest.param(False, id="ijson-not-installed")])
+async def test_jsonrpc_exec_json_paths_error(asynceapi_device: Device, httpx_mock: HTTPXMock, streaming: bool) -> None:
+    """Test the Device.jsonrpc_exec method with JSON paths and an error response."""
+    if streaming:
+        pytest.importorskip("ijson")
+    jsonrpc_request: dict[str, Any] = JSONRPC_REQUEST_TEMPLATE.copy()
+    jsonrpc_request["params"]["cmds"] = ["show ip route", "bad command"]
+    httpx_mock.add_response(json=ERROR_RESPONSE)
+
+    with patch("asynceapi.device.streaming_available", return_value=streaming), pytest.raises(EapiCommandError) as exc_info:
+        await asynceapi_device.jsonrpc_exec(jsonrpc=jsonrpc_request, json_paths=[["vrfs.default.routes"], None])
+
+    assert exc_info.value.passed == [SELECTED_ROUTES_OUTPUT]
+    assert exc_info.value.errors == ["Invalid input"]
@@ -0,0 +1,93 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""Unit tests the asynceapi.ssl_context module."""
+
+from __future__ import annotations
+
+import asyncio
+import ssl
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from asynceapi import Device, SessionCachingSSLContext, shared_ssl_context
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+# Self-signed certificate only used by the tests
+TLS_DIR = Path(__file__).parent.parent.parent.resolve() / "data" / "tls"
+
+
+@asynccontextmanager
+async def _https_server() -> AsyncIterator[int]:
+    """Start a local HTTPS server answering all the requests and closing the connections, return its port."""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(TLS_DIR / "cert.pem", TLS_DIR / "key.pem")
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while await reader.readline() not in {b"\r\n", b""}:
+            pass
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: close\r\n\r\nok")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0, ssl=context)
+    async with server:
+        yield server.sockets[0].getsockname()[1]
+
+
+@pytest.fixture(name="https_server")
+async def https_server_fixture() -> AsyncIterator[int]:
+    """Start a local HTTPS server, return its port."""
+    async with _https_server() as port:
+        yield port
+
+
+def test_shared_ssl_context() -> None:
+    """Test that the Device instances share an SSL context not verifying the certificates."""
+    context = shared_ssl_context()
+    assert isinstance(context, SessionCachingSSLContext)
+    assert context.verify_mode == ssl.CERT_NONE
+    assert context.check_hostname is False
+    assert shared_ssl_context() is context
+    assert Device(host="localhost", username="admin", password="admin")._transport._pool._ssl_context is context  # type: ignore[attr-defined]
+
+
+async def test_session_resumption(https_server: int) -> None:
+    """Test that the TLS sessions are resumed when reconnecting to a host."""
+    context = SessionCachingSSLContext()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+
+    for _ in range(3):
+        async with Device(host="127.0.0.1", port=https_server, username="admin", password="admin", verify=context) as device:
+            assert (await device.get("/")).text == "ok"
+
+    assert list(context.sessions) == ["127.0.0.1"]
+    assert context.statistics.handshakes == 3
+    assert context.statistics.resumed == 2
+    assert context.statistics.handshake_time > 0
+
+
+async def test_session_same_host_name() -> None:
+    """Test that the servers sharing a host name on different ports replace the TLS session of each other.
+
+    The SSL context does not know the port of a connection: the TLS sessions are keyed by host name only.
+    """
+    context = SessionCachingSSLContext()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+
+    async with _https_server() as port1, _https_server() as port2:
+        for port in (port1, port1, port2, port1):
+            async with Device(host="127.0.0.1", port=port, username="admin", password="admin", verify=context) as device:
+                assert (await device.get("/")).text == "ok"
+
+    assert list(context.sessions) == ["127.0.0.1"]
+    # The sessions of the other server are rejected and a full handshake is done instead
+    assert context.statistics.handshakes == 4
+    assert context.statistics.resumed == 1
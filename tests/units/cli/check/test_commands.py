@@ -32,3 +32,13 @@ def test_catalog(click_runner: CliRunner, catalog_path: Path, expected_exit: int
     result = click_runner.invoke(anta, ["check", "catalog", "-c", str(DATA_DIR / catalog_path)])
     assert result.exit_code == expected_exit
     assert expected_output in result.output
+
+
+def test_catalog_compile(click_runner: CliRunner, tmp_path: Path) -> None:
+    """Test `anta check catalog -c catalog --compile."""
+    result = click_runner.invoke(
+        anta, ["check", "catalog", "-c", str(DATA_DIR / "test_catalog.yml"), "--catalog-compiled-dir", str(tmp_path), "--compile"], terminal_width=300
+    )
+    assert result.exit_code == ExitCode.OK
+    assert "Catalog is compiled" in result.output
+    assert len(list(tmp_path.iterdir())) == 1
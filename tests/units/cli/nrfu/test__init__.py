@@ -5,12 +5,16 @@
 
 from __future__ import annotations
 
+import json
 from typing import TYPE_CHECKING
 
+from anta.cache import CACHE_FILENAME
 from anta.cli import anta
 from anta.cli.utils import ExitCode
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from click.testing import CliRunner
 
 # TODO: write unit tests for ignore-status and ignore-error
@@ -55,6 +59,27 @@ def test_anta_nrfu_wrong_catalog_format(click_runner: CliRunner) -> None:
     assert "Invalid value for '--catalog-format': 'toto' is not one of 'yaml', 'json'." in result.output
 
 
+def test_anta_nrfu_workers_process_pool_size(click_runner: CliRunner) -> None:
+    """Test anta nrfu --workers with --process-pool-size."""
+    result = click_runner.invoke(anta, ["nrfu", "--dry-run", "--workers", "2", "--process-pool-size", "2"])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "Invalid value for '--workers': '--workers' cannot be used with '--process-pool-size'" in result.output
+
+
+def test_anta_nrfu_coordinator_workers(click_runner: CliRunner) -> None:
+    """Test anta nrfu --coordinator with --workers."""
+    result = click_runner.invoke(anta, ["nrfu", "--dry-run", "--coordinator", "localhost:8000", "--workers", "2"])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "'--coordinator' cannot be used with '--workers' or '--process-pool-size'" in result.output
+
+
+def test_anta_nrfu_coordinator_token(click_runner: CliRunner) -> None:
+    """Test anta nrfu --coordinator on a TCP address without --token."""
+    result = click_runner.invoke(anta, ["nrfu", "--dry-run", "--coordinator", "localhost:8000"], env={"ANTA_DISTRIBUTED_TOKEN": None})
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "'--token' is required to listen for workers on a TCP address" in result.output
+
+
 def test_anta_password_required(click_runner: CliRunner) -> None:
     """Test that password is provided."""
     env = {"ANTA_PASSWORD": None}
@@ -119,6 +144,52 @@ def test_disable_cache(click_runner: CliRunner) -> None:
     assert result.exit_code == ExitCode.OK
 
 
+def test_cache_dir(click_runner: CliRunner, tmp_path: Path) -> None:
+    """Test that the `--cache-dir` option stores the command outputs in a disk cache."""
+    result = click_runner.invoke(anta, ["nrfu", "--cache-dir", str(tmp_path), "--cache-ttl", "300", "--cache-max-size", "10"])
+    assert result.exit_code == ExitCode.OK
+    assert (tmp_path / CACHE_FILENAME).exists()
+
+
+def test_replay(click_runner: CliRunner, tmp_path: Path) -> None:
+    """Test that the `--replay` option runs the tests against the command outputs of a snapshot."""
+    for device, version in (("leaf1", "4.31.1F"), ("leaf2", "4.30.1F")):
+        (tmp_path / device / "json").mkdir(parents=True)
+        (tmp_path / device / "json" / "show_version.json").write_text(json.dumps({"modelName": "DCS-7280CR3-32P4-F", "version": version}), encoding="UTF-8")
+    result = click_runner.invoke(anta, ["nrfu", "--replay", str(tmp_path), "text"])
+    assert result.exit_code == ExitCode.TESTS_FAILED
+    assert "leaf1 :: VerifyEOSVersion :: SUCCESS" in result.output
+    assert "leaf2 :: VerifyEOSVersion :: FAILURE" in result.output
+    assert "spine1 ::" not in result.output
+
+
+def test_replay_invalid(click_runner: CliRunner, tmp_path: Path) -> None:
+    """Test that the `--replay` option only accepts a snapshot directory or archive."""
+    (tmp_path / "snapshot.txt").write_text("not an archive", encoding="UTF-8")
+    result = click_runner.invoke(anta, ["nrfu", "--replay", str(tmp_path / "snapshot.txt")])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "is not a snapshot directory, a ZIP or tar archive" in result.output
+
+    result = click_runner.invoke(anta, ["nrfu", "--replay", str(tmp_path), "--coordinator", "unix:/tmp/anta.sock"])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "'--replay' cannot be used with '--coordinator'" in result.output
+
+
+def test_record(click_runner: CliRunner, tmp_path: Path) -> None:
+    """Test that the `--record` option records the command outputs, which can be replayed with the `--replay` option."""
+    recording = tmp_path / "recording.jsonl.gz"
+    result = click_runner.invoke(anta, ["nrfu", "--record", str(recording), "--record-max-size", "10", "text"])
+    assert result.exit_code == ExitCode.OK
+    assert recording.exists()
+    result = click_runner.invoke(anta, ["nrfu", "--replay", str(recording), "text"])
+    assert result.exit_code == ExitCode.OK
+    assert "leaf1 :: VerifyEOSVersion :: SUCCESS" in result.output
+
+    result = click_runner.invoke(anta, ["nrfu", "--record", str(recording), "--workers", "2"])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "'--record' cannot be used with '--workers' or '--coordinator'" in result.output
+
+
 def test_hide(click_runner: CliRunner) -> None:
     """Test the `--hide` option of the `anta nrfu` command."""
     result = click_runner.invoke(anta, ["nrfu", "--hide", "success", "text"])
@@ -0,0 +1,37 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""Tests for anta.cli.worker."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from anta.cli import anta
+from anta.cli.utils import ExitCode
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from click.testing import CliRunner
+
+
+def test_anta_worker_help(click_runner: CliRunner) -> None:
+    """Test anta worker --help."""
+    result = click_runner.invoke(anta, ["worker", "--help"])
+    assert result.exit_code == ExitCode.OK
+    assert "Usage: anta worker" in result.output
+
+
+def test_anta_worker_invalid_coordinator(click_runner: CliRunner) -> None:
+    """Test anta worker with an invalid coordinator address."""
+    result = click_runner.invoke(anta, ["worker", "--coordinator", "localhost"])
+    assert result.exit_code == ExitCode.USAGE_ERROR
+    assert "Invalid coordinator address 'localhost'" in result.output
+
+
+def test_anta_worker_unreachable_coordinator(click_runner: CliRunner, tmp_path: Path) -> None:
+    """Test anta worker when the coordinator is not listening."""
+    result = click_runner.invoke(anta, ["worker", "--coordinator", f"unix:{tmp_path / 'anta.sock'}", "--connect-timeout", "0"])
+    assert result.exit_code == ExitCode.INTERNAL_ERROR
+    assert "Cannot connect to coordinator" in result.output
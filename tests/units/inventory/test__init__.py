@@ -5,14 +5,19 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 from pathlib import Path
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 from pydantic import ValidationError
 
+from anta.device import AsyncEOSDevice
 from anta.inventory import AntaInventory
 from anta.inventory.exceptions import InventoryIncorrectSchemaError, InventoryRootKeyError
+from anta.models import AntaCommand
 
 if TYPE_CHECKING:
     from _pytest.mark.structures import ParameterSet
@@ -76,3 +81,72 @@ class TestAntaInventory:
         """Parse invalid YAML file to create ANTA inventory."""
         with pytest.raises((InventoryIncorrectSchemaError, InventoryRootKeyError, ValidationError)):
             AntaInventory.parse(filename=yaml_file, username="arista", password="arista123")
+
+    @pytest.mark.parametrize(
+        "yaml_file",
+        [
+            pytest.param(
+                {
+                    "anta_inventory": {
+                        "hosts": [{"host": "192.168.0.17", "name": "limited", "max_concurrent_requests": 5}, {"host": "192.168.0.2", "name": "default"}],
+                        "networks": [{"network": "192.168.1.0/30", "max_concurrent_requests": 1}],
+                    }
+                },
+                id="Inventory_with_max_concurrent_requests",
+            )
+        ],
+        indirect=["yaml_file"],
+    )
+    def test_parse_max_concurrent_requests(self, yaml_file: Path) -> None:
+        """Test that the inventory max_concurrent_requests value overrides the global value."""
+        inventory = AntaInventory.parse(filename=yaml_file, username="arista", password="arista123", max_concurrent_requests=10)
+        assert inventory["limited"].max_concurrent_requests == 5
+        assert inventory["default"].max_concurrent_requests == 10
+        assert inventory["192.168.1.1"].max_concurrent_requests == 1
+
+    async def test_connect_inventory(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Test that connect_inventory refreshes the devices with a bounded concurrency and logs the timings of the connect phases."""
+        caplog.set_level(logging.INFO)
+        inventory = AntaInventory()
+        for i in range(10):
+            inventory.add_device(AsyncEOSDevice(host=f"192.168.0.{i}", username="arista", password="arista123"))
+        running = 0
+        max_running = 0
+
+        async def refresh(device: AsyncEOSDevice) -> None:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0)
+            running -= 1
+            device.connect_timings = {"probe": 0.5, "show version": 1.0 if device.name != "192.168.0.0" else 3.0}
+
+        with patch("anta.device.AsyncEOSDevice.refresh", autospec=True, side_effect=refresh):
+            await inventory.connect_inventory(max_concurrency=3)
+
+        assert max_running == 3
+        assert "Connect phase 'probe': 10 device(s), 0.500s on average, 0.500s max" in caplog.text
+        assert "Connect phase 'show version': 10 device(s), 1.200s on average, 3.000s max" in caplog.text
+
+    async def test_connect_inventory_invalid_concurrency(self) -> None:
+        """Test that connect_inventory raises an error with an invalid concurrency limit."""
+        with pytest.raises(ValueError, match="The connect concurrency limit must be a positive integer, got 0"):
+            await AntaInventory().connect_inventory(max_concurrency=0)
+
+    async def test_connect_inventory_preload(self) -> None:
+        """Test that connect_inventory preloads the commands on the established devices only."""
+        inventory = AntaInventory()
+        for i in range(2):
+            inventory.add_device(AsyncEOSDevice(host=f"192.168.0.{i}", username="arista", password="arista123"))
+        commands = [AntaCommand(command="show version", revision=1)]
+
+        async def refresh(device: AsyncEOSDevice) -> None:
+            device.established = device.name == "192.168.0.0"
+
+        with (
+            patch("anta.device.AsyncEOSDevice.refresh", autospec=True, side_effect=refresh),
+            patch("anta.device.AsyncEOSDevice.preload", autospec=True) as preload,
+        ):
+            await inventory.connect_inventory(preload_commands=commands)
+
+        preload.assert_awaited_once_with(inventory["192.168.0.0"], commands)
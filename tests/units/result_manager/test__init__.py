@@ -193,6 +193,24 @@ class TestResultManager:
         assert "results_by_status" in result_manager.__dict__
         assert sum(len(v) for v in result_manager.__dict__["results_by_status"].values()) == 31
 
+    def test_refresh_stats(self, test_result_factory: Callable[[], TestResult]) -> None:
+        """Test ResultManager.refresh_stats when the results are updated after being added."""
+        result_manager = ResultManager()
+        result = test_result_factory()
+        result_manager.add(result)
+        assert result_manager.status == "unset"
+        assert result_manager.device_stats[result.name].tests_unset_count == 1
+        assert result_manager.get_total_results({AntaTestStatus.UNSET}) == 1
+
+        result.is_failure("Test failed")
+        result_manager.refresh_stats()
+        assert result_manager.status == "failure"
+        assert result_manager.device_stats[result.name].tests_unset_count == 0
+        assert result_manager.device_stats[result.name].tests_failure_count == 1
+        assert result_manager.test_stats[result.test].devices_failure_count == 1
+        assert result_manager.get_total_results({AntaTestStatus.FAILURE}) == 1
+        assert len(result_manager) == 1
+
     def test_get_results(self, result_manager: ResultManager) -> None:
         """Test ResultManager.get_results."""
         # Check for single status
@@ -0,0 +1,221 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""test anta.cache.py."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import pickle
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from aiocache.lock import RedLock
+
+from anta.cache import CACHE_FILENAME, CacheBudget, LRUMemoryCache, SQLiteCache, _connect
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+OUTPUT = {"mfgName": "Arista", "modelName": "DCS-7280CR3-32P4-F"}
+
+
+class TestSQLiteCache:
+    """Test for anta.cache.SQLiteCache."""
+
+    async def test_set_get(self, tmp_path: Path) -> None:
+        """Test that the values are persisted in the database and shared by the caches using it."""
+        cache = SQLiteCache(path=tmp_path / CACHE_FILENAME, namespace="leaf1")
+        assert await cache.get("uid") is None
+        assert await cache.set("uid", OUTPUT)
+        assert await cache.set("text", "text output")
+        assert await cache.get("uid") == OUTPUT
+        assert await cache.exists("uid")
+        with pytest.raises(ValueError, match="Key leaf1:uid already exists, use .set to update the value"):
+            await cache.add("uid", OUTPUT)
+
+        other_cache = SQLiteCache(path=tmp_path / CACHE_FILENAME, namespace="leaf1")
+        assert await other_cache.multi_get(["uid", "text", "missing"]) == [OUTPUT, "text output", None]
+        assert await SQLiteCache(path=tmp_path / CACHE_FILENAME, namespace="leaf2").get("uid") is None
+
+        assert await other_cache.delete("text") == 1
+        assert await cache.get("text") is None
+
+    async def test_ttl(self, tmp_path: Path) -> None:
+        """Test that the values expire after their TTL."""
+        cache = SQLiteCache(path=tmp_path / CACHE_FILENAME, namespace="leaf1", ttl=60)
+        with patch("anta.cache.time.time", return_value=1000.0):
+            await cache.set("uid", OUTPUT)
+            await cache.set("no-ttl", OUTPUT, ttl=0)
+        with patch("anta.cache.time.time", return_value=1059.0):
+            assert await cache.get("uid") == OUTPUT
+            assert await cache.expire("uid", 120)
+        with patch("anta.cache.time.time", return_value=1178.0):
+            assert await cache.get("uid") == OUTPUT
+        with patch("anta.cache.time.time", return_value=1179.0):
+            assert await cache.get("uid") is None
+            assert not await cache.exists("uid")
+            assert await cache.get("no-ttl") == OUTPUT
+
+    async def test_evict(self, tmp_path: Path) -> None:
+        """Test that the least recently used values are evicted when the size of the values exceeds the maximum size."""
+        # Each value is 10 bytes
+        cache = SQLiteCache(path=tmp_path / CACHE_FILENAME, namespace="leaf1", max_size=30)
+        for i, key in enumerate(["a", "b", "c"]):
+            with patch("anta.cache.time.time", return_value=1000.0 + i):
+                await cache.set(key, "x" * 8)
+        with patch("anta.cache.time.time", return_value=1010.0):
+            # 'a' is now the most recently used value
+            assert await cache.get("a") is not None
+            await cache.set("d", "x" * 8)
+
+        assert cache.evictions == 1
+        assert await cache.multi_get(["a", "b", "c", "d"]) == ["x" * 8, None, "x" * 8, "x" * 8]
+
+    async def test_clear(self, tmp_path: Path) -> None:
+        """Test that clear removes the values of the given namespace only."""
+        leaf1 = SQLiteCache(path=tmp_path / CACHE_FILENAME, namespace="leaf1")
+        leaf10 = SQLiteCache(path=tmp_path / CACHE_FILENAME, namespace="leaf10")
+        await leaf1.set("uid", OUTPUT)
+        await leaf10.set("uid", OUTPUT)
+
+        await leaf1.clear(namespace="leaf1")
+        assert await leaf1.get("uid") is None
+        assert await leaf10.get("uid") == OUTPUT
+        # Like the other aiocache backends, all the values are removed without namespace
+        await leaf1.clear()
+        assert await leaf10.get("uid") is None
+
+    async def test_size(self, tmp_path: Path) -> None:
+        """Test that the total size of the values is kept up to date without scanning the database on each set."""
+        cache = SQLiteCache(path=tmp_path / CACHE_FILENAME, namespace="leaf1", max_size=100)
+        await cache.set("a", "x" * 8)
+        await cache.set("b", "x" * 8)
+        # Replacing a value accounts for the size of the new value only
+        await cache.set("a", "x" * 18)
+        await cache.delete("b")
+        db = _connect(tmp_path / CACHE_FILENAME, os.getpid())
+        assert db.size == 20
+        statements: list[str] = []
+        db.connection.set_trace_callback(statements.append)
+        await cache.set("c", "x" * 8)
+        db.connection.set_trace_callback(None)
+        assert statements
+        assert not any("SUM(size)" in statement for statement in statements)
+        assert db.size == 30
+
+    async def test_increment_redlock(self, tmp_path: Path) -> None:
+        """Test the increment and the RedLock support of the cache."""
+        cache = SQLiteCache(path=tmp_path / CACHE_FILENAME, namespace="leaf1")
+        assert await cache.increment("counter") == 1
+        assert await cache.increment("counter", delta=2) == 3
+        assert await cache.get("counter") == 3
+        await cache.set("text", "text output")
+        with pytest.raises(TypeError, match="Value is not an integer"):
+            await cache.increment("text")
+        assert await cache.raw("execute", "SELECT value FROM cache WHERE key = ?", ("leaf1:counter",)) == [("3",)]
+
+        async with RedLock(cache, "lock", lease=10):
+            assert await cache.exists("lock-lock")
+        assert not await cache.exists("lock-lock")
+
+
+class TestLRUMemoryCache:
+    """Test for anta.cache.LRUMemoryCache."""
+
+    async def test_evict_entries(self) -> None:
+        """Test that the least recently used values are evicted when the number of values exceeds the maximum number of entries."""
+        cache = LRUMemoryCache(max_entries=2)
+        await cache.set("a", OUTPUT)
+        await cache.set("b", OUTPUT)
+        # 'a' is now the most recently used value
+        assert await cache.get("a") == OUTPUT
+        await cache.set("c", OUTPUT)
+
+        assert cache.evictions == 1
+        assert len(cache) == 2
+        assert await cache.multi_get(["a", "b", "c"]) == [OUTPUT, None, OUTPUT]
+
+    async def test_evict_size(self) -> None:
+        """Test that the least recently used values are evicted when the size of the values exceeds the maximum size."""
+        cache = LRUMemoryCache(max_size=25)
+        await cache.set("a", "x" * 10)
+        await cache.set("b", "x" * 10)
+        assert cache.size == 20
+        await cache.set("c", "x" * 10)
+
+        assert cache.evictions == 1
+        assert cache.size == 20
+        assert await cache.get("a") is None
+        # A value larger than the maximum size is not kept
+        await cache.set("d", "x" * 30)
+        assert len(cache) == 0
+        assert cache.size == 0
+
+    async def test_ttl(self) -> None:
+        """Test that the values expire after their TTL."""
+        cache = LRUMemoryCache(ttl=0.01)
+        await cache.set("uid", OUTPUT)
+        await cache.set("no-ttl", OUTPUT, ttl=0)
+        assert await cache.exists("uid")
+        await asyncio.sleep(0.05)
+        assert not await cache.exists("uid")
+        assert await cache.get("no-ttl") == OUTPUT
+        assert cache.evictions == 0
+
+    async def test_delete_clear(self) -> None:
+        """Test that the deleted values are not accounted anymore."""
+        budget = CacheBudget(max_size=100)
+        cache = LRUMemoryCache(namespace="leaf1", budget=budget)
+        await cache.set("a", "x" * 10)
+        await cache.set("b", "x" * 10)
+        with pytest.raises(ValueError, match="Key leaf1a already exists, use .set to update the value"):
+            await cache.add("a", "x")
+        assert await cache.delete("a") == 1
+        assert await cache.delete("a") == 0
+        assert (cache.size, budget.size, len(budget)) == (10, 10, 1)
+        await cache.clear(namespace="leaf1")
+        assert (len(cache), cache.size, budget.size, len(budget)) == (0, 0, 0, 0)
+
+    async def test_increment_redlock(self) -> None:
+        """Test the increment and the RedLock support of the cache."""
+        cache = LRUMemoryCache()
+        assert await cache.increment("counter") == 1
+        assert await cache.increment("counter", delta=2) == 3
+        assert await cache.get("counter") == 3
+        # The expiration of the value is kept
+        await cache.set("expiring", 1, ttl=0.01)
+        assert await cache.increment("expiring") == 2
+        await asyncio.sleep(0.05)
+        assert not await cache.exists("expiring")
+        await cache.set("text", "text output")
+        with pytest.raises(TypeError, match="Value is not an integer"):
+            await cache.increment("text")
+        assert await cache.raw("get", "counter") == (3, 0)
+
+        async with RedLock(cache, "lock", lease=10):
+            assert await cache.exists("lock-lock")
+        assert not await cache.exists("lock-lock")
+
+    async def test_budget(self) -> None:
+        """Test that the least recently used values of all the caches sharing a budget are evicted when a limit of the budget is exceeded."""
+        budget = CacheBudget(max_entries=3)
+        leaf1 = LRUMemoryCache(namespace="leaf1", budget=budget)
+        leaf2 = LRUMemoryCache(namespace="leaf2", budget=budget)
+        await leaf1.set("a", OUTPUT)
+        await leaf2.set("a", OUTPUT)
+        await leaf1.set("b", OUTPUT)
+        # The value of leaf1 is now the most recently used value
+        assert await leaf1.get("a") == OUTPUT
+        await leaf2.set("b", OUTPUT)
+
+        assert len(budget) == 3
+        assert (leaf1.evictions, leaf2.evictions) == (0, 1)
+        assert await leaf2.get("a") is None
+        assert await leaf1.multi_get(["a", "b"]) == [OUTPUT, OUTPUT]
+
+        # Only the limits of the budget are pickled
+        budget = pickle.loads(pickle.dumps(budget))  # noqa: S301
+        assert (budget.max_entries, budget.max_size, len(budget)) == (3, None, 0)
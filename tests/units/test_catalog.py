@@ -5,9 +5,12 @@
 
 from __future__ import annotations
 
+import os
+import stat
 from json import load as json_load
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal
+from unittest.mock import patch
 
 import pytest
 from pydantic import ValidationError
@@ -335,6 +338,77 @@ class TestAntaCatalog:
         file = catalog.dump()
         assert sum(len(tests) for tests in file.root.values()) == 228
 
+    def test_parse_compiled(self, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+        """Test that the compiled catalog is loaded instead of the catalog file while the catalog file is unchanged."""
+        file = tmp_path / "catalog.yml"
+        file.write_text((DATA_DIR / "test_catalog_medium.yml").read_text(encoding="UTF-8"), encoding="UTF-8")
+        catalog = AntaCatalog.parse(file, compiled=True)
+        assert catalog.compiled_path == tmp_path / ".catalog.yml.compiled"
+        assert catalog.compiled_path.exists()
+
+        with patch("anta.catalog.AntaCatalog.from_dict") as from_dict:
+            compiled_catalog = AntaCatalog.parse(file, compiled=True)
+            from_dict.assert_not_called()
+        assert compiled_catalog.tests == catalog.tests
+        assert compiled_catalog.filename == file
+
+        # The catalog file has changed, it is parsed and compiled again
+        file.write_text("anta.tests.software:\n  - VerifyEOSVersion:\n      versions:\n        - 4.31.1F\n", encoding="UTF-8")
+        assert len(AntaCatalog.parse(file, compiled=True).tests) == 1
+        assert len(AntaCatalog.parse(file, compiled=True).tests) == 1
+
+        # A corrupted compiled catalog is ignored
+        catalog.compiled_path.write_bytes(b"corrupted")
+        assert len(AntaCatalog.parse(file, compiled=True).tests) == 1
+        assert "Ignoring compiled catalog" in caplog.text
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="File ownership is not supported on this platform")
+    def test_parse_compiled_untrusted(self, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+        """Test that a compiled catalog owned by another user or writable by other users is not loaded."""
+        catalog = AntaCatalog.parse(DATA_DIR / "test_catalog.yml", compiled=True, compiled_dir=tmp_path)
+        assert catalog.compiled_path is not None
+        assert stat.S_IMODE(catalog.compiled_path.stat().st_mode) == 0o600
+
+        catalog.compiled_path.chmod(0o622)
+        with patch("anta.catalog.AntaCatalog.from_dict", wraps=AntaCatalog.from_dict) as from_dict:
+            assert AntaCatalog.parse(DATA_DIR / "test_catalog.yml", compiled=True, compiled_dir=tmp_path).tests == catalog.tests
+            from_dict.assert_called_once()
+        assert "Ignoring compiled catalog" in caplog.text
+        assert "writable only by their owner" in caplog.text
+
+        # The compiled catalog is written again with owner-only permissions
+        assert stat.S_IMODE(catalog.compiled_path.stat().st_mode) == 0o600
+        with patch("anta.catalog.os.getuid", return_value=os.getuid() + 1), patch("anta.catalog.AntaCatalog.from_dict", wraps=AntaCatalog.from_dict) as from_dict:
+            AntaCatalog.parse(DATA_DIR / "test_catalog.yml", compiled=True, compiled_dir=tmp_path)
+            from_dict.assert_called_once()
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="File ownership is not supported on this platform")
+    @pytest.mark.parametrize("mode", [pytest.param(0o770, id="group-writable"), pytest.param(0o707, id="world-writable")])
+    def test_parse_compiled_untrusted_directory(self, tmp_path: Path, caplog: pytest.LogCaptureFixture, mode: int) -> None:
+        """Test that a compiled catalog in a directory writable by other users is not loaded."""
+        compiled_dir = tmp_path / "compiled"
+        catalog = AntaCatalog.parse(DATA_DIR / "test_catalog.yml", compiled=True, compiled_dir=compiled_dir)
+        assert stat.S_IMODE(compiled_dir.stat().st_mode) == 0o700
+
+        compiled_dir.chmod(mode)
+        with patch("anta.catalog.AntaCatalog.from_dict", wraps=AntaCatalog.from_dict) as from_dict:
+            assert AntaCatalog.parse(DATA_DIR / "test_catalog.yml", compiled=True, compiled_dir=compiled_dir).tests == catalog.tests
+            from_dict.assert_called_once()
+        assert "Ignoring compiled catalog" in caplog.text
+
+    def test_compile(self, tmp_path: Path) -> None:
+        """Test the path of a compiled catalog in a directory of compiled catalogs."""
+        catalog = AntaCatalog.parse(DATA_DIR / "test_catalog.yml", compiled_dir=tmp_path)
+        assert not list(tmp_path.iterdir())
+        path = catalog.compile()
+        assert path.parent == tmp_path
+        assert path.name.startswith("test_catalog.yml-")
+        assert AntaCatalog.parse(DATA_DIR / "test_catalog.json", file_format="json", compiled_dir=tmp_path).compiled_path != path
+        assert AntaCatalog.parse(DATA_DIR / "test_catalog.yml", compiled=True, compiled_dir=tmp_path).tests == catalog.tests
+
+        with pytest.raises(ValueError, match="Only a catalog parsed from a file can be compiled"):
+            AntaCatalog().compile()
+
 
 class TestAntaCatalogFile:  # pylint: disable=too-few-public-methods
     """Test for anta.catalog.AntaCatalogFile."""
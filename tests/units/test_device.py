@@ -6,17 +6,22 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import pickle
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 from unittest.mock import patch
 
 import pytest
 from asyncssh import SSHClientConnection, SSHClientConnectionOptions
-from httpx import ConnectError, HTTPError
+from httpx import ConnectError, ConnectTimeout, HTTPError, ReadTimeout
 from rich import print as rprint
 
-from anta.device import AntaDevice, AsyncEOSDevice
+from anta.cache import CACHE_FILENAME, LRUMemoryCache, SQLiteCache
+from anta.device import AntaDevice, AsyncEOSDevice, ReplayDevice, RetryPolicy, _json_codec
 from anta.models import AntaCommand
+from anta.recorder import Recorder
+from anta.snapshot import Snapshot
 from asynceapi import EapiCommandError
 from tests.units.conftest import COMMAND_OUTPUT
 
@@ -302,6 +307,91 @@ ASYNCEAPI_COLLECT_PARAMS: list[ParameterSet] = [
         id="httpx.ConnectError",
     ),
 ]
+# Outputs of a batch in which the second command failed
+PARTIAL_FAILURE_OUTPUTS: list[dict[str, Any] | None] = [{"uptime": 1}, None, {"peers": {}}]
+ASYNCEAPI_COLLECT_BATCH_PARAMS: list[ParameterSet] = [
+    pytest.param(
+        {"max_batch_size": 10},
+        {"side_effect": [[{"uptime": 1}, {"vrfs": {}}, {"peers": {}}]]},
+        {
+            "calls": [["show uptime", "show ip route", "show lldp neighbors"]],
+            "outputs": [{"uptime": 1}, {"vrfs": {}}, {"peers": {}}],
+            "errors": [[], [], []],
+        },
+        id="single batch",
+    ),
+    pytest.param(
+        {"max_batch_size": 2},
+        {"side_effect": [[{"uptime": 1}, {"vrfs": {}}], [{"peers": {}}]]},
+        {
+            "calls": [["show uptime", "show ip route"], ["show lldp neighbors"]],
+            "outputs": [{"uptime": 1}, {"vrfs": {}}, {"peers": {}}],
+            "errors": [[], [], []],
+        },
+        id="max batch size",
+    ),
+    pytest.param(
+        {"max_batch_size": 10, "enable": True},
+        {"side_effect": [[{}, {"uptime": 1}, {"vrfs": {}}, {"peers": {}}]]},
+        {
+            "calls": [["enable", "show uptime", "show ip route", "show lldp neighbors"]],
+            "outputs": [{"uptime": 1}, {"vrfs": {}}, {"peers": {}}],
+            "errors": [[], [], []],
+        },
+        id="enable",
+    ),
+    pytest.param(
+        {"max_batch_size": 10},
+        {
+            "side_effect": [
+                EapiCommandError(
+                    passed=[{"uptime": 1}],
+                    failed="show ip route",
+                    errors=["Invalid input (at token 2: 'route')"],
+                    errmsg="Invalid command",
+                    not_exec=[{"cmd": "show lldp neighbors"}],
+                ),
+                [{"peers": {}}],
+            ]
+        },
+        {
+            "calls": [["show uptime", "show ip route", "show lldp neighbors"], ["show lldp neighbors"]],
+            "outputs": PARTIAL_FAILURE_OUTPUTS,
+            "errors": [[], ["Invalid input (at token 2: 'route')"], []],
+        },
+        id="partial failure",
+    ),
+    pytest.param(
+        {"max_batch_size": 10, "enable": True},
+        {
+            "side_effect": [
+                EapiCommandError(
+                    passed=[],
+                    failed="enable",
+                    errors=["Bad secret"],
+                    errmsg="Bad secret",
+                    not_exec=[{"cmd": "show uptime"}, {"cmd": "show ip route"}, {"cmd": "show lldp neighbors"}],
+                ),
+            ]
+        },
+        {
+            "calls": [["enable", "show uptime", "show ip route", "show lldp neighbors"]],
+            "outputs": [None, None, None],
+            "errors": [["Bad secret"], ["Bad secret"], ["Bad secret"]],
+        },
+        id="enable failure",
+    ),
+    pytest.param(
+        {"max_batch_size": 10},
+        {"side_effect": [HTTPError("404")]},
+        {
+            "calls": [["show uptime", "show ip route", "show lldp neighbors"]],
+            "outputs": [None, None, None],
+            "errors": [["HTTPError: 404"], ["HTTPError: 404"], ["HTTPError: 404"]],
+        },
+        id="httpx.HTTPError",
+    ),
+]
 ASYNCEAPI_COPY_PARAMS: list[ParameterSet] = [
     pytest.param({}, {"sources": [Path("/mnt/flash"), Path("/var/log/agents")], "destination": Path(), "direction": "from"}, id="from"),
     pytest.param({}, {"sources": [Path("/mnt/flash"), Path("/var/log/agents")], "destination": Path(), "direction": "to"}, id="to"),
@@ -447,6 +537,21 @@ REFRESH_PARAMS: list[ParameterSet] = [
         id="modelName empty string",
     ),
 ]
+REFRESH_NO_PROBE_PARAMS: list[ParameterSet] = [
+    pytest.param(
+        {"return_value": [{"mfgName": "Arista", "modelName": "DCS-7280CR3-32P4-F"}]},
+        {"is_online": True, "established": True, "hw_model": "DCS-7280CR3-32P4-F"},
+        id="established",
+    ),
+    pytest.param(
+        {"side_effect": EapiCommandError(passed=[], failed="show version", errors=["Authorization denied"], errmsg="Invalid command", not_exec=[])},
+        {"is_online": True, "established": False, "hw_model": None},
+        id="asynceapi.EapiCommandError",
+    ),
+    pytest.param({"side_effect": ReadTimeout("Timeout")}, {"is_online": True, "established": False, "hw_model": None}, id="httpx.ReadTimeout"),
+    pytest.param({"side_effect": ConnectTimeout("Timeout")}, {"is_online": False, "established": False, "hw_model": None}, id="httpx.ConnectTimeout"),
+    pytest.param({"side_effect": ConnectError("Cannot open port")}, {"is_online": False, "established": False, "hw_model": None}, id="httpx.ConnectError"),
+]
 COLLECT_PARAMS: list[ParameterSet] = [
     pytest.param(
         {"disable_cache": False},
@@ -476,7 +581,7 @@ COLLECT_PARAMS: list[ParameterSet] = [
     pytest.param({"disable_cache": True}, {"command": "show version", "use_cache": False}, {}, id="device cache disabled, command cache disabled"),
 ]
 CACHE_STATS_PARAMS: list[ParameterSet] = [
-    pytest.param({"disable_cache": False}, {"total_commands_sent": 0, "cache_hits": 0, "cache_hit_ratio": "0.00%"}, id="with_cache"),
+    pytest.param({"disable_cache": False}, {"total_commands_sent": 0, "cache_hits": 0, "cache_hit_ratio": "0.00%", "cache_evictions": 0}, id="with_cache"),
     pytest.param({"disable_cache": True}, None, id="without_cache"),
 ]
 
@@ -484,6 +589,22 @@ CACHE_STATS_PARAMS: list[ParameterSet] = [
 class TestAntaDevice:
     """Test for anta.device.AntaDevice Abstract class."""
 
+    @pytest.mark.parametrize("device", [{"disable_cache": False}, {"disable_cache": True}], indirect=True)
+    async def test_preload(self, device: AntaDevice) -> None:
+        """Test AntaDevice.preload stores the outputs of the commands in the device cache."""
+        command = AntaCommand(command="show version", revision=1)
+        with patch.object(AntaDevice, "_collect", wraps=device._collect) as collect:
+            await device.preload([command, AntaCommand(command="show clock", use_cache=False)])
+        # The preloaded commands are copied
+        assert command.output is None
+        if device.cache is None:
+            collect.assert_not_called()
+            assert "preload" not in device.connect_timings
+        else:
+            collect.assert_called_once()
+            assert await device.cache.get(command.uid) == COMMAND_OUTPUT
+            assert "preload" in device.connect_timings
+
     @pytest.mark.parametrize(("device", "command", "expected"), COLLECT_PARAMS, indirect=["device"])
     async def test_collect(self, device: AntaDevice, command: dict[str, Any], expected: dict[str, Any]) -> None:
         """Test AntaDevice.collect behavior."""
@@ -519,6 +640,54 @@ class TestAntaDevice:
             assert device.cache is None
             device._collect.assert_called_once_with(command=cmd, collection_id=None)  # type: ignore[attr-defined]
 
+    @pytest.mark.parametrize("device", [{"disable_cache": True, "max_concurrent_requests": 2}], indirect=True)
+    async def test_collect_max_concurrent_requests(self, device: AntaDevice) -> None:
+        """Test that AntaDevice.collect honors the max_concurrent_requests limit."""
+        running = 0
+        max_running = 0
+
+        async def _collect(command: AntaCommand, *args: Any, **kwargs: Any) -> None:  # noqa: ARG001, ANN401
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            command.output = COMMAND_OUTPUT
+
+        with patch.object(device, "_collect", side_effect=_collect):
+            commands = [AntaCommand(command=f"show version {i}") for i in range(10)]
+            await device.collect_commands(commands)
+
+        assert max_running == 2
+        assert all(cmd.output == COMMAND_OUTPUT for cmd in commands)
+
+    @pytest.mark.parametrize("device", [{"disable_cache": True}], indirect=True)
+    async def test_collect_command_plan(self, device: AntaDevice) -> None:
+        """Test that AntaDevice.collect collects the planned commands only once."""
+        commands = [AntaCommand(command="show version") for _ in range(3)] + [AntaCommand(command="show version", use_cache=False)]
+        device.plan_commands(commands)
+        with patch.object(device, "_collect", side_effect=lambda command, **_: setattr(command, "output", COMMAND_OUTPUT)) as collect:
+            await device.collect_commands(commands)
+            assert collect.call_count == 2
+        assert all(cmd.output == COMMAND_OUTPUT for cmd in commands)
+        # The outputs are released once all the planned commands have been collected
+        assert not device._command_plan
+        assert not device._planned_commands
+
+    @pytest.mark.parametrize("device", [{"disable_cache": False, "cache_max_entries": 2}], indirect=True)
+    async def test_collect_cache_eviction(self, device: AntaDevice) -> None:
+        """Test that AntaDevice.collect evicts the least recently used outputs from the cache and releases the cache locks."""
+        commands = [AntaCommand(command=f"show version {i}") for i in range(3)]
+        # The output of the first command is used again before collecting the last command
+        for command in [commands[0], commands[1], commands[0].model_copy(), commands[2]]:
+            await device.collect(command)
+        assert isinstance(device.cache, LRUMemoryCache)
+        assert await device.cache.multi_get([command.uid for command in commands]) == [COMMAND_OUTPUT, None, COMMAND_OUTPUT]
+        assert device.cache_statistics is not None
+        assert device.cache_statistics["cache_evictions"] == 1
+        assert not device.cache_locks
+        assert not device._cache_lock_users
+
     @pytest.mark.parametrize(("device", "expected"), CACHE_STATS_PARAMS, indirect=["device"])
     def test_cache_statistics(self, device: AntaDevice, expected: dict[str, Any] | None) -> None:
         """Verify that when cache statistics attribute does not exist.
@@ -528,7 +697,7 @@ class TestAntaDevice:
         assert device.cache_statistics == expected
 
 
-class TestAsyncEOSDevice:
+class TestAsyncEOSDevice:  # pylint: disable=too-many-public-methods
     """Test for anta.device.AsyncEOSDevice."""
 
     @pytest.mark.parametrize(("device", "expected"), INIT_PARAMS)
@@ -544,6 +713,10 @@ class TestAsyncEOSDevice:
             assert dev.cache is not None
             assert dev.cache_locks is not None
         hash(dev)
+        rprint(dev)
+        # The representation and the hash of the device do not create its eAPI session
+        assert dev._eapi_session is None
+        assert f"eapi_port={dev._session.port!r}" in repr(dev)
 
         with patch("anta.device.__DEBUG__", new=True):
             rprint(dev)
@@ -567,12 +740,49 @@ class TestAsyncEOSDevice:
         """Test AsyncEOSDevice.refresh()."""
         with patch.object(async_device._session, "check_connection", **patch_kwargs[0]), patch.object(async_device._session, "cli", **patch_kwargs[1]):
             await async_device.refresh()
-            async_device._session.check_connection.assert_called_once()  # type: ignore[attr-defined] # asynceapi.Device.check_connection is patched
+            async_device._session.check_connection.assert_called_once_with(timeout=5.0)  # type: ignore[attr-defined] # asynceapi.Device.check_connection is patched
             if expected["is_online"]:
                 async_device._session.cli.assert_called_once()  # type: ignore[attr-defined] # asynceapi.Device.cli is patched
             assert async_device.is_online == expected["is_online"]
             assert async_device.established == expected["established"]
             assert async_device.hw_model == expected["hw_model"]
+            assert list(async_device.connect_timings) == (["probe", "show version"] if expected["is_online"] else ["probe"])
+
+    async def test_disk_cache(self, tmp_path: Path) -> None:
+        """Test that the command outputs stored in the disk cache are reused by the devices of the next runs."""
+        output = {"mfgName": "Arista", "modelName": "DCS-7280CR3-32P4-F"}
+        for run in range(2):
+            dev = AsyncEOSDevice(host="42.42.42.42", username="anta", password="anta", cache_dir=tmp_path, cache_ttl=300)
+            assert isinstance(dev.cache, SQLiteCache)
+            # Need to ignore pylint no-member as Cache is a proxy class and pylint is not smart enough
+            # https://github.com/pylint-dev/pylint/issues/7258
+            assert dev.cache.ttl == 300  # pylint: disable=no-member
+            command = AntaCommand(command="show version")
+            with patch.object(dev._session, "cli", return_value=[output]) as cli:
+                await dev.collect(command)
+            assert command.output == output
+            assert cli.call_count == (1 if run == 0 else 0)
+        assert (tmp_path / CACHE_FILENAME).exists()
+
+    async def test_refresh_cache(self, async_device: AsyncEOSDevice) -> None:
+        """Test AsyncEOSDevice.refresh() stores the 'show version' output in the device cache for the tests using it."""
+        output = {"mfgName": "Arista", "modelName": "DCS-7280CR3-32P4-F"}
+        with patch.object(async_device._session, "check_connection", return_value=True), patch.object(async_device._session, "cli", return_value=[output]):
+            await async_device.refresh()
+        assert async_device.cache is not None
+        assert await async_device.cache.get(AntaCommand(command="show version", revision=1).uid) == output
+
+    @pytest.mark.parametrize("async_device", [{"probe": False, "disable_cache": True}], indirect=True)
+    @pytest.mark.parametrize(("patch_kwargs", "expected"), REFRESH_NO_PROBE_PARAMS)
+    async def test_refresh_no_probe(self, async_device: AsyncEOSDevice, patch_kwargs: dict[str, Any], expected: dict[str, Any]) -> None:
+        """Test AsyncEOSDevice.refresh() infers the reachability of the device from the 'show version' eAPI request when the device is not probed."""
+        with patch.object(async_device._session, "check_connection") as check_connection, patch.object(async_device._session, "cli", **patch_kwargs):
+            await async_device.refresh()
+        check_connection.assert_not_called()
+        assert async_device.is_online == expected["is_online"]
+        assert async_device.established == expected["established"]
+        assert async_device.hw_model == expected["hw_model"]
+        assert list(async_device.connect_timings) == ["show version"]
 
     @pytest.mark.parametrize(
         ("async_device", "command", "expected"),
@@ -600,10 +810,176 @@ class TestAsyncEOSDevice:
                 commands.append({"cmd": cmd.command, "revision": cmd.revision})
             else:
                 commands.append({"cmd": cmd.command})
-            async_device._session.cli.assert_called_once_with(commands=commands, ofmt=cmd.ofmt, version=cmd.version, req_id=f"ANTA-{collection_id}-{id(cmd)}")  # type: ignore[attr-defined] # asynceapi.Device.cli is patched
+            async_device._session.cli.assert_called_once_with(  # type: ignore[attr-defined] # asynceapi.Device.cli is patched
+                commands=commands, ofmt=cmd.ofmt, version=cmd.version, req_id=f"ANTA-{collection_id}-{id(cmd)}", timeout=None, json_paths=None
+            )
             assert cmd.output == expected["output"]
             assert cmd.errors == expected["errors"]
 
+    @pytest.mark.parametrize(
+        ("async_device", "patch_kwargs", "expected"),
+        ASYNCEAPI_COLLECT_BATCH_PARAMS,
+        indirect=["async_device"],
+    )
+    async def test__collect_batch(self, async_device: AsyncEOSDevice, patch_kwargs: dict[str, Any], expected: dict[str, Any]) -> None:
+        """Test AsyncEOSDevice._collect() with command batching."""
+        cmds = [AntaCommand(command="show uptime"), AntaCommand(command="show ip route"), AntaCommand(command="show lldp neighbors")]
+        with patch.object(async_device._session, "cli", **patch_kwargs) as cli:
+            await async_device.collect_commands(cmds, collection_id="pytest")
+            assert [[command["cmd"] for command in call.kwargs["commands"]] for call in cli.call_args_list] == expected["calls"]
+        assert [cmd.output for cmd in cmds] == expected["outputs"]
+        assert [cmd.errors for cmd in cmds] == expected["errors"]
+
+    @pytest.mark.parametrize("async_device", [{"max_batch_size": 10, "disable_cache": True}], indirect=True)
+    async def test__collect_batch_exception(self, async_device: AsyncEOSDevice) -> None:
+        """Test AsyncEOSDevice._collect() sets an error on the batched commands when the eAPI request of the batch raises an exception."""
+        cmds = [AntaCommand(command="show uptime"), AntaCommand(command="show ip route"), AntaCommand(command="show lldp neighbors")]
+        with patch.object(async_device._session, "cli", side_effect=RuntimeError("Unexpected error")):
+            results = await asyncio.gather(*(async_device._collect(cmd) for cmd in cmds), return_exceptions=True)
+        assert [type(result) for result in results] == [RuntimeError, type(None), type(None)]
+        assert [cmd.errors for cmd in cmds] == [["RuntimeError: Unexpected error"]] * 3
+        assert not async_device._batches
+
+    @pytest.mark.parametrize("async_device", [{"max_batch_size": 10, "disable_cache": True}], indirect=True)
+    async def test__collect_batch_ofmt(self, async_device: AsyncEOSDevice) -> None:
+        """Test AsyncEOSDevice._collect() does not batch commands with different output formats."""
+        cmds = [AntaCommand(command="show uptime"), AntaCommand(command="show version", ofmt="text"), AntaCommand(command="show ip route")]
+        with patch.object(async_device._session, "cli", side_effect=lambda commands, ofmt, **_: [ofmt] * len(commands)) as cli:
+            await async_device.collect_commands(cmds)
+            assert sorted(call.kwargs["ofmt"] for call in cli.call_args_list) == ["json", "text"]
+        assert [cmd.output for cmd in cmds] == ["json", "text", "json"]
+
+    def test__init__pool_limits(self) -> None:
+        """Test the connection pool limits of the AsyncEOSDevice eAPI session."""
+        dev = AsyncEOSDevice(host="42.42.42.42", username="anta", password="anta", max_concurrent_requests=8, keepalive_expiry=30)
+        pool = dev._session._transport._pool  # type: ignore[attr-defined]
+        assert pool._max_connections == 8
+        assert pool._max_keepalive_connections == 8
+        assert pool._keepalive_expiry == 30
+        dev = AsyncEOSDevice(host="42.42.42.42", username="anta", password="anta", max_concurrent_requests=8, max_connections=2)
+        assert dev._session._transport._pool._max_connections == 2  # type: ignore[attr-defined]
+        with pytest.raises(ValueError, match="'max_connections' must be a positive integer"):
+            AsyncEOSDevice(host="42.42.42.42", username="anta", password="anta", max_connections=0)
+
+    def test__init__invalid_probe_timeout(self) -> None:
+        """Test AsyncEOSDevice.__init__() with an invalid probe timeout."""
+        with pytest.raises(ValueError, match="'probe_timeout' must be a positive number to instantiate device '42.42.42.42'"):
+            AsyncEOSDevice(host="42.42.42.42", username="anta", password="anta", probe_timeout=0)
+
+    @pytest.mark.parametrize(
+        ("env", "expected"),
+        [
+            pytest.param({}, "json", id="default"),
+            pytest.param({"ANTA_JSON_CODEC": "orjson"}, "orjson", id="orjson"),
+            pytest.param({"ANTA_JSON_CODEC": "ujson"}, "json", id="invalid"),
+        ],
+    )
+    def test_json_codec(self, caplog: pytest.LogCaptureFixture, env: dict[str, str], expected: str) -> None:
+        """Test that the JSON codec of the eAPI session is set by the ANTA_JSON_CODEC environment variable."""
+        pytest.importorskip("orjson")
+        _json_codec.cache_clear()
+        try:
+            with patch.dict("os.environ", env):
+                dev = AsyncEOSDevice(host="42.42.42.42", username="anta", password="anta")
+                assert dev._session.json_codec.name == expected
+        finally:
+            _json_codec.cache_clear()
+        assert ("The ANTA_JSON_CODEC environment variable value is invalid" in caplog.text) is (env.get("ANTA_JSON_CODEC") == "ujson")
+
+    def test__init__http2_not_installed(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Test AsyncEOSDevice.__init__() falls back to HTTP/1.1 when the h2 package is not installed."""
+        with patch("anta.device.importlib.util.find_spec", return_value=None):
+            dev = AsyncEOSDevice(host="42.42.42.42", username="anta", password="anta", http2=True)
+        assert dev.http2 is False
+        assert "the 'h2' package is not installed. Falling back to HTTP/1.1" in caplog.text
+
+    @pytest.mark.parametrize("async_device", [{"disable_cache": True}], indirect=True)
+    async def test_pool_statistics(self, async_device: AsyncEOSDevice) -> None:
+        """Test AsyncEOSDevice.pool_statistics."""
+        assert async_device.pool_statistics is None
+        with patch.object(async_device._session, "post", side_effect=ConnectError("Connection refused")):
+            await async_device.collect(AntaCommand(command="show uptime"))
+        assert async_device.pool_statistics == {"requests": 1, "connections": 0, "wait_time": 0.0, "max_wait_time": 0.0}
+
+    def test__init__invalid_max_batch_size(self) -> None:
+        """Test AsyncEOSDevice.__init__() with an invalid max_batch_size."""
+        with pytest.raises(ValueError, match="'max_batch_size' must be a positive integer"):
+            AsyncEOSDevice(host="42.42.42.42", username="anta", password="anta", max_batch_size=0)
+
+    @pytest.mark.parametrize("async_device", [{"enable": True, "insecure": True, "max_batch_size": 10}], indirect=True)
+    def test_pickle(self, async_device: AsyncEOSDevice) -> None:
+        """Test that an AsyncEOSDevice can be pickled and unpickled."""
+        async_device.hw_model = "cEOSLab"
+        unpickled = pickle.loads(pickle.dumps(async_device))  # noqa: S301
+        assert unpickled == async_device
+        assert repr(unpickled) == repr(async_device)
+        assert unpickled.cache is not None
+        assert unpickled._session is not async_device._session
+        assert unpickled._ssh_opts.known_hosts is None
+        assert unpickled.max_batch_size == 10
+
+    @pytest.mark.parametrize(
+        ("max_attempts", "command_max_attempts", "expected"),
+        [
+            pytest.param(1, None, {"calls": 1, "output": None}, id="no-retry"),
+            pytest.param(3, None, {"calls": 3, "output": {"uptime": 42}}, id="retry-success"),
+            pytest.param(2, None, {"calls": 2, "output": None}, id="retry-exhausted"),
+            pytest.param(1, 3, {"calls": 3, "output": {"uptime": 42}}, id="command-max-attempts"),
+        ],
+    )
+    @pytest.mark.parametrize("async_device", [{"disable_cache": True}], indirect=True)
+    async def test__collect_retry(self, async_device: AsyncEOSDevice, max_attempts: int, command_max_attempts: int | None, expected: dict[str, Any]) -> None:
+        """Test AsyncEOSDevice._collect() retries the eAPI requests according to the retry policy."""
+        async_device.retry_policy = RetryPolicy(max_attempts=max_attempts)
+        cmd = AntaCommand(command="show uptime", max_attempts=command_max_attempts)
+        side_effect = [ReadTimeout("Timeout"), ReadTimeout("Timeout"), [{"uptime": 42}]]
+        with patch.object(async_device._session, "cli", side_effect=side_effect) as cli, patch("anta.device.asyncio.sleep") as sleep:
+            await async_device.collect(cmd)
+        assert cli.call_count == expected["calls"]
+        assert sleep.call_count == expected["calls"] - 1
+        assert cmd.output == expected["output"]
+        if expected["output"] is None:
+            assert cmd.errors == ["ReadTimeout: Timeout"]
+
+    @pytest.mark.parametrize("async_device", [{"disable_cache": True, "enable": True, "max_batch_size": 10}], indirect=True)
+    async def test__collect_json_paths(self, async_device: AsyncEOSDevice) -> None:
+        """Test AsyncEOSDevice._collect() sends the JSON paths of the commands."""
+        cmds = [AntaCommand(command="show ip route", json_paths=["vrfs.default.routes"]), AntaCommand(command="show version")]
+        with patch.object(async_device._session, "cli", return_value=[{}, {"vrfs": {}}, {"version": "4.31.1F"}]) as cli:
+            await async_device.collect_commands(cmds)
+        assert cli.call_args.kwargs["json_paths"] == [None, ["vrfs.default.routes"], None]
+        assert [cmd.output for cmd in cmds] == [{"vrfs": {}}, {"version": "4.31.1F"}]
+
+    @pytest.mark.parametrize("async_device", [{"disable_cache": True}], indirect=True)
+    async def test__collect_eos_error_not_retried(self, async_device: AsyncEOSDevice) -> None:
+        """Test AsyncEOSDevice._collect() does not retry the EOS errors."""
+        async_device.retry_policy = RetryPolicy(max_attempts=3)
+        cmd = AntaCommand(command="show bad command")
+        error = EapiCommandError(passed=[], failed="show bad command", errors=["Invalid input (at token 1: 'bad')"], errmsg="Invalid command", not_exec=[])
+        with patch.object(async_device._session, "cli", side_effect=error) as cli:
+            await async_device.collect(cmd)
+        cli.assert_called_once()
+        assert cmd.errors == ["Invalid input (at token 1: 'bad')"]
+
+    @pytest.mark.parametrize("async_device", [{"disable_cache": True, "timeout": 10}], indirect=True)
+    def test__request_timeout(self, async_device: AsyncEOSDevice) -> None:
+        """Test AsyncEOSDevice._request_timeout()."""
+        cmd = AntaCommand(command="show uptime")
+        assert async_device._request_timeout([cmd], attempt=1) is None
+        assert async_device._request_timeout([cmd, AntaCommand(command="show version", timeout=120)], attempt=1) == 120
+
+        async_device.adaptive_timeout = True
+        base = 10
+        # No latency learnt yet
+        assert async_device._request_timeout([cmd], attempt=1) == base
+        # The timeout is doubled at each attempt, up to the maximum factor
+        assert async_device._request_timeout([cmd], attempt=2) == base * 2
+        assert async_device._request_timeout([cmd], attempt=5) == base * 4
+        # A slow device gets a higher timeout
+        for _ in range(10):
+            async_device._latency.update(base * 1.5)
+        assert base < async_device._request_timeout([cmd], attempt=1) <= base * 4  # type: ignore[operator]
+
     @pytest.mark.parametrize(
         ("async_device", "copy"),
         ASYNCEAPI_COPY_PARAMS,
@@ -626,3 +1002,100 @@ class TestAsyncEOSDevice:
                     scp_mock.assert_not_awaited()
                     return
                 scp_mock.assert_awaited_once_with(src, dst)
+
+
+class TestRetryPolicy:
+    """Test for anta.device.RetryPolicy."""
+
+    def test_delay(self) -> None:
+        """Test RetryPolicy.delay()."""
+        policy = RetryPolicy(backoff=1, max_backoff=5, jitter=0)
+        assert [policy.delay(attempt) for attempt in range(1, 6)] == [1, 2, 4, 5, 5]
+        policy = RetryPolicy(backoff=1, jitter=0.5)
+        assert all(1 <= policy.delay(2) <= 2 for _ in range(100))
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [
+            pytest.param({"max_attempts": 0}, "'max_attempts' must be a positive integer, got 0", id="max_attempts"),
+            pytest.param({"backoff": -1}, "'backoff' and 'max_backoff' must be positive numbers", id="backoff"),
+            pytest.param({"jitter": 2}, "'jitter' must be between 0 and 1, got 2", id="jitter"),
+        ],
+    )
+    def test__init__invalid(self, kwargs: dict[str, Any], match: str) -> None:
+        """Test anta.device.RetryPolicy with invalid parameters."""
+        with pytest.raises(ValueError, match=match):
+            RetryPolicy(**kwargs)
+
+
+class TestReplayDevice:
+    """Test for anta.device.ReplayDevice."""
+
+    @pytest.fixture
+    def snapshot(self, tmp_path: Path) -> Snapshot:
+        """Return a snapshot of a device."""
+        (tmp_path / "leaf1" / "json").mkdir(parents=True)
+        (tmp_path / "leaf1" / "text").mkdir(parents=True)
+        (tmp_path / "leaf1" / "json" / "show_version.json").write_text(json.dumps({"modelName": "DCS-7280CR3-32P4-F", "uptime": 1000.0}), encoding="UTF-8")
+        (tmp_path / "leaf1" / "json" / "show_clock.json").write_text("not json", encoding="UTF-8")
+        (tmp_path / "leaf1" / "text" / "show_version.log").write_text("Arista DCS-7280CR3-32P4-F", encoding="UTF-8")
+        (tmp_path / "leaf2" / "json").mkdir(parents=True)
+        (tmp_path / "leaf2" / "json" / "show_clock.json").write_text("{}", encoding="UTF-8")
+        return Snapshot(tmp_path)
+
+    async def test_refresh(self, snapshot: Snapshot) -> None:
+        """Test ReplayDevice.refresh() gets the hardware model from the snapshot."""
+        device = ReplayDevice("leaf1", snapshot, tags={"leaf"})
+        await device.refresh()
+        assert (device.is_online, device.established, device.hw_model) == (True, True, "DCS-7280CR3-32P4-F")
+        assert device.tags == {"leaf", "leaf1"}
+        assert device == ReplayDevice("leaf1", snapshot)
+        assert "snapshot=" in repr(device)
+
+        for name, expected in (("leaf2", (True, False, None)), ("spine1", (False, False, None))):
+            device = ReplayDevice(name, snapshot)
+            await device.refresh()
+            assert (device.is_online, device.established, device.hw_model) == expected
+
+    async def test_collect(self, snapshot: Snapshot) -> None:
+        """Test ReplayDevice.collect() serves the command outputs from the snapshot."""
+        device = ReplayDevice("leaf1", snapshot, disable_cache=True)
+        commands = [
+            AntaCommand(command="show version", json_paths=["uptime"]),
+            AntaCommand(command="show version", ofmt="text"),
+            AntaCommand(command="show clock"),
+            AntaCommand(command="show interfaces"),
+        ]
+        await device.collect_commands(commands)
+        assert commands[0].output == {"uptime": 1000.0}
+        assert commands[1].output == "Arista DCS-7280CR3-32P4-F"
+        assert commands[2].errors[0].startswith("Cannot parse the output of 'show clock' in the snapshot")
+        assert commands[3].errors == [f"Command 'show interfaces' with output format 'json' is not in the snapshot {snapshot.path}"]
+
+    async def test_collect_recording(self, tmp_path: Path) -> None:
+        """Test ReplayDevice.collect() replays the outputs of a recording filtered by JSON paths for the same JSON paths only."""
+        routes = {"vrfs": {"default": {"routes": {"10.0.0.0/8": {}}, "allRoutesProgrammedHardware": True}}}
+        path = tmp_path / "recording.jsonl.gz"
+        with Recorder(path) as recorder:
+            recorder.record("leaf1", AntaCommand(command="show ip route", output=routes))
+            recorder.record("leaf1", AntaCommand(command="show ip route", json_paths=["vrfs.default.routes"], output={"vrfs": {"default": {"routes": {}}}}))
+            recorder.record("leaf2", AntaCommand(command="show ip route", json_paths=["vrfs.default.routes"], output={"vrfs": {"default": {"routes": {}}}}))
+        snapshot = Snapshot(path)
+        assert snapshot.devices == {"leaf1", "leaf2"}
+
+        device = ReplayDevice("leaf1", snapshot, disable_cache=True)
+        commands = [
+            AntaCommand(command="show ip route"),
+            AntaCommand(command="show ip route", json_paths=["vrfs.default.routes"]),
+            AntaCommand(command="show ip route", json_paths=["vrfs.default.allRoutesProgrammedHardware"]),
+        ]
+        await device.collect_commands(commands)
+        assert commands[0].output == routes
+        assert commands[1].output == {"vrfs": {"default": {"routes": {}}}}
+        # Selected in the whole output of the command
+        assert commands[2].output == {"vrfs": {"default": {"allRoutesProgrammedHardware": True}}}
+
+        # The whole output of the command is not recorded for leaf2
+        command = AntaCommand(command="show ip route")
+        await ReplayDevice("leaf2", snapshot, disable_cache=True).collect(command)
+        assert command.errors == [f"Command 'show ip route' with output format 'json' is not in the snapshot {path}"]
@@ -0,0 +1,196 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""test anta.distributed.py."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from anta.catalog import AntaCatalog
+from anta.distributed import _connect, coordinate, parse_address, prepare_units, work
+from anta.result_manager import ResultManager
+from anta.result_manager.models import AntaTestStatus
+from anta.runner import main
+
+from .test_models import FakeTest, FakeTestWithTemplate
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from anta.inventory import AntaInventory
+
+CATALOG = AntaCatalog.from_list([(FakeTest, None), (FakeTestWithTemplate, {"interface": "Ethernet1"})])
+
+
+@pytest.mark.parametrize(
+    ("address", "expected"),
+    [
+        pytest.param("unix:/tmp/anta.sock", "/tmp/anta.sock", id="unix"),
+        pytest.param("127.0.0.1:8000", ("127.0.0.1", 8000), id="ipv4"),
+        pytest.param("[::1]:8000", ("::1", 8000), id="ipv6"),
+    ],
+)
+def test_parse_address(address: str, expected: tuple[str, int] | str) -> None:
+    """Test anta.distributed.parse_address."""
+    assert parse_address(address) == expected
+
+
+@pytest.mark.parametrize("address", ["localhost", "localhost:port", ":8000"])
+def test_parse_address_invalid(address: str) -> None:
+    """Test anta.distributed.parse_address with an invalid address."""
+    with pytest.raises(ValueError, match="Invalid coordinator address"):
+        parse_address(address)
+
+
+@pytest.mark.parametrize("inventory", [{"count": 3}], indirect=True)
+def test_prepare_units(inventory: AntaInventory) -> None:
+    """Test that prepare_units partitions the inventory and the catalog in work units."""
+    units = prepare_units(inventory, CATALOG, shard_size=2)
+    assert [unit["devices"] for unit in units] == [["device-0", "device-1"], ["device-2"]]
+    assert [unit["count"] for unit in units] == [4, 2]
+    assert AntaCatalog.from_dict(units[0]["catalog"]).tests == CATALOG.tests
+
+    with pytest.raises(ValueError, match="The shard size must be a positive integer, got 0"):
+        prepare_units(inventory, CATALOG, shard_size=0)
+
+
+@pytest.mark.parametrize("inventory", [{"count": 3}], indirect=True)
+async def test_coordinate(inventory: AntaInventory, tmp_path: Path) -> None:
+    """Test that the results of a distributed run are the same as a single process run."""
+    address = f"unix:{tmp_path / 'anta.sock'}"
+    manager = ResultManager()
+    # Workers retry to connect until the coordinator is listening
+    workers = [asyncio.create_task(work(inventory, address, connect_timeout=5)) for _ in range(2)]
+    await coordinate(manager, inventory, CATALOG, address, shard_size=1)
+    assert sum(await asyncio.gather(*workers)) == 3
+
+    expected = ResultManager()
+    CATALOG.clear_indexes()
+    await main(expected, inventory, CATALOG)
+    assert len(manager) == 6
+    assert sorted(manager.results, key=lambda r: (r.name, r.test)) == sorted(expected.results, key=lambda r: (r.name, r.test))
+    assert manager.status == expected.status
+
+
+@pytest.mark.parametrize("inventory", [{"count": 2}], indirect=True)
+async def test_coordinate_worker_lost(caplog: pytest.LogCaptureFixture, inventory: AntaInventory, tmp_path: Path) -> None:
+    """Test that the work unit of a lost worker is requeued and its results discarded."""
+    caplog.set_level(logging.WARNING)
+    address = f"unix:{tmp_path / 'anta.sock'}"
+    received: list[dict[str, Any]] = []
+
+    async def _lost_worker() -> None:
+        reader, writer = await _connect(address, connect_timeout=5)
+        writer.write(json.dumps({"type": "hello", "token": None}).encode() + b"\n")
+        received.append(json.loads(await reader.readline()))
+        result = {"name": "device-0", "test": "FakeTest", "categories": [], "description": "", "result": "failure"}
+        writer.write(json.dumps({"type": "result", "id": received[0]["id"], "result": result}).encode() + b"\n")
+        await writer.drain()
+        writer.close()
+
+    manager = ResultManager()
+    coordinator = asyncio.create_task(coordinate(manager, inventory, CATALOG, address, shard_size=1))
+    await _lost_worker()
+    assert await work(inventory, address) == 2
+    await coordinator
+
+    assert received[0]["devices"] == ["device-0"]
+    assert f"Work unit {received[0]['id']} of worker unix socket has been requeued" in caplog.text
+    assert len(manager) == 4
+    assert manager.status == "success"
+    assert manager.get_total_results({AntaTestStatus.FAILURE}) == 0
+
+
+@pytest.mark.parametrize("inventory", [{"count": 2}], indirect=True)
+async def test_coordinate_no_worker(caplog: pytest.LogCaptureFixture, inventory: AntaInventory, tmp_path: Path) -> None:
+    """Test that the tests fail with an error result if no worker connects within the worker timeout."""
+    caplog.set_level(logging.ERROR)
+    manager = ResultManager()
+    on_result: list[str] = []
+    await coordinate(manager, inventory, CATALOG, f"unix:{tmp_path / 'anta.sock'}", shard_size=1, worker_timeout=0.1, on_result=lambda r: on_result.append(r.name))
+
+    assert "No worker has made progress for 0.1 seconds, the remaining work units fail" in caplog.text
+    assert len(manager) == 4
+    assert sorted(on_result) == ["device-0", "device-0", "device-1", "device-1"]
+    assert manager.get_total_results({AntaTestStatus.ERROR}) == 4
+    assert {(result.name, result.test) for result in manager.results} == {
+        (device, test) for device in ("device-0", "device-1") for test in ("FakeTest", "FakeTestWithTemplate")
+    }
+    assert all(result.messages == ["No worker has run this test within the worker timeout of 0.1 seconds"] for result in manager.results)
+
+
+@pytest.mark.parametrize("inventory", [{"count": 2}], indirect=True)
+async def test_coordinate_worker_hung(caplog: pytest.LogCaptureFixture, inventory: AntaInventory, tmp_path: Path) -> None:
+    """Test that the work unit of a worker not sending any message within the worker timeout is requeued."""
+    caplog.set_level(logging.WARNING)
+    address = f"unix:{tmp_path / 'anta.sock'}"
+    received: list[dict[str, Any]] = []
+    unit_received = asyncio.Event()
+
+    async def _hung_worker() -> None:
+        reader, writer = await _connect(address, connect_timeout=5)
+        writer.write(json.dumps({"type": "hello", "token": None}).encode() + b"\n")
+        received.append(json.loads(await reader.readline()))
+        unit_received.set()
+        # Wait for the coordinator to close the connection
+        await reader.read()
+        writer.close()
+
+    manager = ResultManager()
+    coordinator = asyncio.create_task(coordinate(manager, inventory, CATALOG, address, shard_size=1, worker_timeout=0.5))
+    hung_worker = asyncio.create_task(_hung_worker())
+    await unit_received.wait()
+    assert await work(inventory, address) == 2
+    await coordinator
+    await hung_worker
+
+    assert f"Work unit {received[0]['id']} of worker unix socket has been requeued" in caplog.text
+    assert len(manager) == 4
+    assert manager.status == "success"
+
+
+@pytest.mark.parametrize("inventory", [{"count": 2}], indirect=True)
+async def test_coordinate_token(caplog: pytest.LogCaptureFixture, inventory: AntaInventory, tmp_path: Path) -> None:
+    """Test that the coordinator rejects the workers without its token."""
+    caplog.set_level(logging.WARNING)
+    address = f"unix:{tmp_path / 'anta.sock'}"
+    manager = ResultManager()
+    coordinator = asyncio.create_task(coordinate(manager, inventory, CATALOG, address, shard_size=1, token="secret"))
+    with pytest.raises(ConnectionError, match="The coordinator has rejected the worker: Invalid token"):
+        await work(inventory, address, connect_timeout=5, token="invalid")
+    assert "Rejected worker unix socket: invalid token" in caplog.text
+    assert await work(inventory, address, token="secret") == 2
+    await coordinator
+
+    assert len(manager) == 4
+    assert manager.status == "success"
+
+
+@pytest.mark.parametrize("inventory", [{"count": 2}], indirect=True)
+async def test_coordinate_tcp_without_token(inventory: AntaInventory) -> None:
+    """Test that the coordinator requires a token to listen on a TCP address."""
+    with pytest.raises(ValueError, match="A token is required to listen for workers on the TCP address '127.0.0.1:8000'"):
+        await coordinate(ResultManager(), inventory, CATALOG, "127.0.0.1:8000", shard_size=1)
+
+
+@pytest.mark.parametrize("inventory", [{"count": 2}], indirect=True)
+async def test_coordinate_missing_results(inventory: AntaInventory, tmp_path: Path) -> None:
+    """Test that the tests without a result from the worker fail with an error result."""
+    address = f"unix:{tmp_path / 'anta.sock'}"
+    manager = ResultManager()
+    coordinator = asyncio.create_task(coordinate(manager, inventory, CATALOG, address, shard_size=1))
+    # The inventory of the worker does not include device-1
+    assert await work(inventory.get_inventory(devices={"device-0"}), address, connect_timeout=5) == 2
+    await coordinator
+
+    assert len(manager) == 4
+    message = "The worker has not returned a result for this test, is the device in the worker inventory?"
+    missing = [result for result in manager.results if result.messages == [message]]
+    assert {(result.name, result.test) for result in missing} == {("device-1", "FakeTest"), ("device-1", "FakeTestWithTemplate")}
+    assert all(result.result == AntaTestStatus.ERROR for result in missing)
@@ -8,19 +8,28 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import pickle
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import wraps
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
+from unittest.mock import patch
 
 import pytest
 
 from anta.decorators import deprecated_test, skip_on_platforms
-from anta.models import AntaCommand, AntaTemplate, AntaTest
+from anta.models import AntaCommand, AntaTemplate, AntaTemplateRenderError, AntaTest, _command_uid, _copy_model
 from anta.result_manager.models import AntaTestStatus
 from tests.units.anta_tests.conftest import build_test_id
 from tests.units.conftest import DEVICE_HW_MODEL
 
 if TYPE_CHECKING:
-    from anta.device import AntaDevice
+    from collections.abc import Callable
+
+    from anta.device import AntaDevice, AsyncEOSDevice
 
 
 class FakeTest(AntaTest):
@@ -81,6 +90,29 @@ class FakeTestWithInput(AntaTest):
         self.result.is_success(self.inputs.string)
 
 
+class FakeTestWaitingForFile(AntaTest):
+    """ANTA test that succeeds if a file is created within a few seconds."""
+
+    categories: ClassVar[list[str]] = []
+    commands: ClassVar[list[AntaCommand | AntaTemplate]] = []
+
+    class Input(AntaTest.Input):
+        """Inputs for FakeTestWaitingForFile test."""
+
+        path: Path
+
+    @AntaTest.anta_test
+    def test(self) -> None:
+        """Test function."""
+        deadline = time.monotonic() + 5
+        while not self.inputs.path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        if self.inputs.path.exists():
+            self.result.is_success()
+        else:
+            self.result.is_failure(f"{self.inputs.path} has not been created")
+
+
 class FakeTestWithTemplate(AntaTest):
     """ANTA test with template that always succeed."""
 
@@ -248,6 +280,30 @@ class SkipOnPlatformTestWithInput(AntaTest):
         self.result.is_success(self.inputs.string)
 
 
+def _add_message(function: Callable[[Any], None]) -> Callable[[Any], None]:
+    """Decorate a test function to add a message to the test result."""
+
+    @wraps(function)
+    def wrapper(self: AntaTest) -> None:
+        function(self)
+        self.result.messages.append("decorated")
+
+    return wrapper
+
+
+class FakeTestWithInnerDecorator(AntaTest):
+    """ANTA test with a decorator applied to the test function before AntaTest.anta_test."""
+
+    categories: ClassVar[list[str]] = []
+    commands: ClassVar[list[AntaCommand | AntaTemplate]] = []
+
+    @AntaTest.anta_test
+    @_add_message
+    def test(self) -> None:
+        """Test function."""
+        self.result.is_success()
+
+
 class DeprecatedTestWithoutNewTest(AntaTest):
     """ANTA test that is deprecated without new test."""
 
@@ -373,7 +429,10 @@ ANTATEST_DATA: list[dict[str, Any]] = [
         "expected": {
             "__init__": {
                 "result": "error",
-                "messages": ["Cannot render template {template='show interface {interface}' version='latest' revision=None ofmt='json' use_cache=True}"],
+                "messages": [
+                    "Cannot render template {template='show interface {interface}' version='latest' revision=None ofmt='json' use_cache=True "
+                    "max_attempts=None timeout=None json_paths=None}"
+                ],
             },
             "test": {"result": "error"},
         },
@@ -603,6 +662,29 @@ class TestAntaTest:
         assert f"<{command}> is blocked for security reason" in test.result.messages
         assert test.instance_commands[0].collected is False
 
+    @pytest.mark.parametrize("command", BLACKLIST_COMMANDS_PARAMS)
+    def test_blacklist_template(self, device: AntaDevice, command: str) -> None:
+        """Test that blacklisted commands rendered from a template are not collected."""
+
+        class FakeTestWithBlacklistTemplate(AntaTest):
+            """Fake Test for blacklist with a template."""
+
+            categories: ClassVar[list[str]] = []
+            commands: ClassVar[list[AntaCommand | AntaTemplate]] = [AntaCommand(command="show version"), AntaTemplate(template="{command}")]
+
+            def render(self, template: AntaTemplate) -> list[AntaCommand]:
+                return [template.render(command="show clock"), template.render(command=command)]
+
+            @AntaTest.anta_test
+            def test(self) -> None:
+                self.result.is_success()
+
+        test = FakeTestWithBlacklistTemplate(device)
+        asyncio.run(test.test())
+        assert test.result.result == AntaTestStatus.ERROR
+        assert test.result.messages == [f"<{command}> is blocked for security reason"]
+        assert not any(command.collected for command in test.instance_commands)
+
     def test_result_overwrite(self, device: AntaDevice) -> None:
         """Test the AntaTest.Input.ResultOverwrite model."""
         test = FakeTest(device, inputs={"result_overwrite": {"categories": ["hardware"], "description": "a description", "custom_field": "a custom field"}})
@@ -612,6 +694,114 @@ class TestAntaTest:
         assert test.result.description == "a description"
         assert test.result.custom_field == "a custom field"
 
+    def test_render_cache(self, device: AntaDevice) -> None:
+        """Test that the templates are rendered once for all the instances sharing the same inputs."""
+        inputs = FakeTestWithTemplate.Input(interface="Ethernet1")
+        with patch.object(FakeTestWithTemplate, "render", autospec=True, side_effect=FakeTestWithTemplate.render) as render:
+            tests = [FakeTestWithTemplate(device, inputs=inputs) for _ in range(3)]
+            assert render.call_count == 1
+            assert [test.instance_commands[0].command for test in tests] == ["show interface Ethernet1"] * 3
+            assert tests[0].instance_commands[0] is not tests[1].instance_commands[0]
+
+            # The rendered commands are reset when the inputs are modified and are not pickled
+            inputs.interface = "Ethernet2"
+            assert FakeTestWithTemplate(device, inputs=inputs).instance_commands[0].command == "show interface Ethernet2"
+            FakeTestWithTemplate(device, inputs=pickle.loads(pickle.dumps(inputs)))  # noqa: S301
+            assert render.call_count == 3
+
+    def test_inputs_hash(self) -> None:
+        """Test that the hash of the inputs is computed once and reset when the inputs are modified."""
+        inputs = FakeTestWithInput.Input(string="a")
+        with patch.object(FakeTestWithInput.Input, "model_dump_json", autospec=True, side_effect=FakeTestWithInput.Input.model_dump_json) as dump:
+            assert hash(inputs) == hash(inputs)
+            assert dump.call_count == 1
+            inputs.string = "b"
+            assert hash(inputs) == hash(FakeTestWithInput.Input(string="b"))
+            assert dump.call_count == 3
+        assert inputs == FakeTestWithInput.Input(string="b")
+        assert inputs.model_dump() == {"result_overwrite": None, "filters": None, "string": "b"}
+
+    @pytest.mark.parametrize("deep", [pytest.param(False, id="shallow"), pytest.param(True, id="deep")])
+    def test_inputs_model_copy(self, device: AntaDevice, *, deep: bool) -> None:
+        """Test that the copies of the inputs updated with model_copy do not keep the hash and the rendered commands of the original inputs."""
+        inputs = FakeTestWithTemplate.Input(interface="Ethernet1")
+        original_hash = hash(inputs)
+        assert FakeTestWithTemplate(device, inputs=inputs).instance_commands[0].command == "show interface Ethernet1"
+
+        updated = inputs.model_copy(update={"interface": "Ethernet2"}, deep=deep)
+        assert hash(updated) != original_hash
+        assert hash(updated) == hash(FakeTestWithTemplate.Input(interface="Ethernet2"))
+        assert updated != inputs
+        assert FakeTestWithTemplate(device, inputs=updated).instance_commands[0].command == "show interface Ethernet2"
+        # The original inputs are not modified
+        assert hash(inputs) == original_hash
+        assert FakeTestWithTemplate(device, inputs=inputs).instance_commands[0].command == "show interface Ethernet1"
+
+    def test_instances_isolation(self, device: AntaDevice) -> None:
+        """Test that the instances of a test do not share their result nor their commands."""
+        overwritten = FakeTestWithFailedCommand(device, inputs={"result_overwrite": {"categories": ["hardware"]}})
+        overwritten.result.is_failure("a message")
+        overwritten.instance_commands[0].output = "output"
+
+        test = FakeTestWithFailedCommand(device)
+        assert test.result.name == device.name
+        assert test.result.test == "FakeTestWithFailedCommand"
+        assert test.result.categories == []
+        assert test.result.result == AntaTestStatus.UNSET
+        assert test.result.messages == []
+        assert test.instance_commands[0].output is None
+        static_command = FakeTestWithFailedCommand.commands[0]
+        assert isinstance(static_command, AntaCommand)
+        assert static_command.output is None
+        assert test.instance_commands[0].errors == ["failed command"]
+
+        # The TestResult of a parent test class is not inherited
+        assert FakeTest(device).result.test == "FakeTest"
+
+        class FakeTestChild(FakeTest):
+            """ANTA test inheriting FakeTest."""
+
+            name = "FakeTestChild"
+
+        assert FakeTestChild(device).result.test == "FakeTestChild"
+
+    @pytest.mark.parametrize(
+        ("test_class", "inputs", "expected"),
+        [
+            pytest.param(FakeTestWithTemplate, {"interface": "Ethernet1"}, {"result": "success", "messages": ["show interface Ethernet1"]}, id="success"),
+            pytest.param(
+                FakeTestWithTemplateBadTest,
+                {"interface": "Ethernet1"},
+                {"result": "error", "messages": ["AttributeError: 'AntaParams' object has no attribute 'wrong_template_param'"]},
+                id="exception",
+            ),
+            pytest.param(
+                SkipOnPlatformTestWithInput,
+                {"string": "test"},
+                {"result": "skipped", "messages": [f"SkipOnPlatformTestWithInput test is not supported on {DEVICE_HW_MODEL}."]},
+                id="skip-on-platforms",
+            ),
+            pytest.param(UnSkipOnPlatformTest, None, {"result": "success", "messages": []}, id="unskip-on-platforms"),
+            pytest.param(FakeTestWithInnerDecorator, None, {"result": "success", "messages": ["decorated"]}, id="inner-decorator"),
+        ],
+    )
+    def test_test_executor(self, async_device: AsyncEOSDevice, test_class: type[AntaTest], inputs: dict[str, Any] | None, expected: dict[str, Any]) -> None:
+        """Test the AntaTest.test method when the test result is evaluated in a process pool."""
+        async_device.hw_model = DEVICE_HW_MODEL
+        test = test_class(async_device, inputs=inputs, eos_data=[{}] * len(test_class.commands))
+        result = test.result
+        # The device is not sent to the executor
+        with ProcessPoolExecutor(max_workers=1) as executor, patch.object(type(async_device), "__getstate__", side_effect=AssertionError("pickled device")):
+            AntaTest.executor = executor
+            try:
+                asyncio.run(test.test())
+            finally:
+                AntaTest.executor = None
+        # The TestResult instance is updated in place
+        assert test.result is result
+        assert result.result == expected["result"]
+        assert result.messages == expected["messages"]
+
 
 class TestAntaComamnd:
     """Test for anta.models.AntaCommand."""
@@ -675,3 +865,49 @@ class TestAntaComamnd:
         with pytest.raises(RuntimeError) as exec_info:
             command.requires_privileges
         assert exec_info.value.args[0] == "Command 'show aaa methods accounting' has not been collected and has not returned an error. Call AntaDevice.collect()."
+
+    def test_uid(self) -> None:
+        """Test that the unique identifier of a command is memoized and follows the changes of the command."""
+        command = AntaCommand(command="show version", revision=1)
+        assert command.uid == hashlib.sha1(b"show version_latest_1_json").hexdigest()  # noqa: S324
+        assert command.uid == AntaCommand(command="show version", revision=1, use_cache=False).uid
+        assert command.uid != AntaCommand(command="show version").uid
+        paths = AntaCommand(command="show version", json_paths=["a", "b"])
+        assert paths.uid == AntaCommand(command="show version", json_paths=["b", "a"]).uid
+
+        # The copies made for the test instances share the memoized identifier
+        with patch("anta.models._command_uid", wraps=_command_uid) as compute:
+            command = AntaCommand(command="show version", revision=1)
+            uid = command.uid
+            assert _copy_model(command).uid is uid
+            assert command.uid is uid
+            assert compute.call_count == 1
+
+        command.ofmt = "text"
+        assert command.uid != uid
+        command.ofmt = "json"
+        assert command.uid == uid
+        assert command.model_copy(update={"command": "show hostname"}).uid == AntaCommand(command="show hostname", revision=1).uid
+        assert command.model_copy(update={"revision": 2}, deep=True).uid == AntaCommand(command="show version", revision=2).uid
+
+    def test_pickle(self) -> None:
+        """Test that a command rendered from a template can be pickled."""
+        command = AntaTemplate(template="show interface {interface}").render(interface="Ethernet1")
+        unpickled = pickle.loads(pickle.dumps(command))  # noqa: S301
+        assert unpickled.command == "show interface Ethernet1"
+        assert unpickled.params.interface == "Ethernet1"
+        assert unpickled.uid == command.uid
+        assert unpickled.template is not None
+        assert unpickled.template.render(interface="Ethernet2").params.interface == "Ethernet2"
+
+    def test_json_paths(self) -> None:
+        """Test that the JSON paths of a template are rendered and change the command uid."""
+        template = AntaTemplate(template="show ip route vrf {vrf}", json_paths=["vrfs.{vrf}.routes"])
+        command = template.render(vrf="default")
+        assert command.json_paths == ["vrfs.default.routes"]
+        assert command.uid != AntaCommand(command="show ip route vrf default").uid
+        assert command.uid == AntaCommand(command="show ip route vrf default", json_paths=["vrfs.default.routes"]).uid
+        with pytest.raises(AntaTemplateRenderError):
+            AntaTemplate(template="show ip route", json_paths=["vrfs.{vrf}.routes"]).render()
+        # The parameters are single keys of the JSON paths
+        assert template.render(vrf="v.1").json_paths == ["vrfs.v\\.1.routes"]
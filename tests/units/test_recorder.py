@@ -0,0 +1,67 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""test anta.recorder.py."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from typing import TYPE_CHECKING, Any
+
+from anta.models import AntaCommand
+from anta.recorder import Recorder
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+OUTPUT = {"mfgName": "Arista", "modelName": "DCS-7280CR3-32P4-F"}
+
+
+def _records(path: Path) -> list[dict[str, Any]]:
+    with gzip.open(path, mode="rt", encoding="UTF-8") as recording:
+        return [json.loads(line) for line in recording]
+
+
+class TestRecorder:
+    """Test for anta.recorder.Recorder."""
+
+    def test_record(self, tmp_path: Path) -> None:
+        """Test that the collected commands are recorded once per device and the recordings are appended to the archive."""
+        path = tmp_path / "recording.jsonl.gz"
+        command = AntaCommand(command="show version", output=OUTPUT)
+        text = AntaCommand(command="show version", ofmt="text", output="Arista DCS-7280CR3-32P4-F")
+        with Recorder(path) as recorder:
+            recorder.record("leaf1", command)
+            recorder.record("leaf1", command)
+            recorder.record("leaf1", text)
+            recorder.record("leaf2", command)
+            recorder.record("leaf2", AntaCommand(command="show clock"))
+        assert recorder.records == 3
+        assert _records(path)[0] == {
+            "device": "leaf1",
+            "uid": command.uid,
+            "command": "show version",
+            "version": "latest",
+            "revision": None,
+            "ofmt": "json",
+            "json_paths": None,
+            "output": OUTPUT,
+        }
+
+        # Not started, the commands are not recorded
+        recorder = Recorder(path)
+        recorder.record("leaf3", command)
+        with recorder:
+            recorder.record("leaf4", command)
+        assert [record["device"] for record in _records(path)] == ["leaf1", "leaf1", "leaf2", "leaf4"]
+
+    def test_max_size(self, tmp_path: Path) -> None:
+        """Test that the commands are not recorded anymore once the archive has reached its maximum size."""
+        path = tmp_path / "recording.jsonl.gz"
+        with Recorder(path, max_size=1) as recorder:
+            for device in ("leaf1", "leaf2", "leaf3"):
+                recorder.record(device, AntaCommand(command="show version", output=OUTPUT))
+        # The gzip header is written with the first record
+        assert (recorder.records, recorder.dropped) == (1, 2)
+        assert [record["device"] for record in _records(path)] == ["leaf1"]
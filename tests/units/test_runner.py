@@ -5,20 +5,45 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import resource
 import sys
+import weakref
 from pathlib import Path
+from typing import TYPE_CHECKING
 from unittest.mock import patch
 
 import pytest
 
 from anta.catalog import AntaCatalog
 from anta.inventory import AntaInventory
+from anta.models import AntaTest
+from anta.recorder import Recorder
 from anta.result_manager import ResultManager
-from anta.runner import adjust_rlimit_nofile, main, prepare_tests
+from anta.runner import (
+    adjust_rlimit_nofile,
+    evaluation_pool,
+    get_coroutines,
+    get_preload_commands,
+    log_tls_statistics,
+    main,
+    prepare_command_plan,
+    prepare_tests,
+    run,
+)
+from anta.tests.software import VerifyEOSVersion
+from anta.tests.system import VerifyMemoryUtilization
+from asynceapi import TLSStatistics
+
+from .test_models import FakeTest, FakeTestWaitingForFile, FakeTestWithMissingTest, FakeTestWithTemplate
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine, Iterator
+    from typing import Any
 
-from .test_models import FakeTest, FakeTestWithMissingTest
+    from anta.device import AntaDevice
+    from anta.result_manager.models import TestResult
 
 DATA_DIR: Path = Path(__file__).parent.parent.resolve() / "data"
 FAKE_CATALOG: AntaCatalog = AntaCatalog.from_list([(FakeTest, None)])
@@ -162,16 +187,30 @@ async def test_dry_run(caplog: pytest.LogCaptureFixture, inventory: AntaInventor
     """Test that when dry_run is True, no tests are run."""
     caplog.set_level(logging.INFO)
     manager = ResultManager()
-    await main(manager, inventory, FAKE_CATALOG, dry_run=True)
+    with patch.object(FakeTest, "__init__", autospec=True, side_effect=FakeTest.__init__) as mocked_init:
+        await main(manager, inventory, FAKE_CATALOG, dry_run=True)
+    mocked_init.assert_not_called()
     assert "Dry-run mode, exiting before running the tests." in caplog.records[-1].message
+    assert any("Total number of selected tests: 1\n" in message for message in caplog.messages)
+    assert any("Total number of commands: 0 (0 unique commands to collect)\n" in message for message in caplog.messages)
+    assert len(manager) == 0
 
+    # The same run without dry-run instantiates the test
+    with patch.object(FakeTest, "__init__", autospec=True, side_effect=FakeTest.__init__) as mocked_init:
+        await main(manager, inventory, FAKE_CATALOG)
+    assert mocked_init.call_count > 0
 
-async def test_cannot_create_test(caplog: pytest.LogCaptureFixture, inventory: AntaInventory) -> None:
+
+@pytest.mark.parametrize("workers", [pytest.param(1, id="single-process"), pytest.param(2, id="workers")])
+async def test_cannot_create_test(caplog: pytest.LogCaptureFixture, inventory: AntaInventory, workers: int) -> None:
     """Test that when an Exception is raised during test instantiation, it is caught and a log is raised."""
     caplog.set_level(logging.CRITICAL)
     manager = ResultManager()
     catalog = AntaCatalog.from_list([(FakeTestWithMissingTest, None)])  # type: ignore[type-abstract]
-    await main(manager, inventory, catalog)
+    with patch("anta.runner.AntaTest.update_progress") as update_progress:
+        await main(manager, inventory, catalog, workers=workers)
+    # The progress bar is updated by the current process
+    update_progress.assert_called_once()
     msg = (
         "There is an error when creating test tests.units.test_models.FakeTestWithMissingTest.\nIf this is not a custom test implementation: "
         "Please reach out to the maintainer team or open an issue on Github: https://github.com/aristanetworks/anta.\nTypeError: "
@@ -182,3 +221,304 @@ async def test_cannot_create_test(caplog: pytest.LogCaptureFixture, inventory: A
         else "Can't instantiate abstract class FakeTestWithMissingTest with abstract method test"
     )
     assert msg in caplog.messages
+
+
+async def test_run_concurrency_limit(device: AntaDevice) -> None:
+    """Test that run() never runs more coroutines than the limit and yields all the results."""
+    limit = 3
+    running = 0
+    max_running = 0
+
+    async def _test(index: int) -> TestResult:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.001 * (index % 4))
+        running -= 1
+        return await FakeTest(device=device, inputs={"result_overwrite": {"custom_field": str(index)}}).test()
+
+    def _coroutines() -> Iterator[Coroutine[Any, Any, TestResult]]:
+        for index in range(20):
+            yield _test(index)
+
+    results = [result async for result in run(_coroutines(), limit=limit)]
+
+    assert max_running == limit
+    assert sorted(int(str(result.custom_field)) for result in results) == list(range(20))
+
+
+async def test_run_invalid_limit() -> None:
+    """Test that run() raises a ValueError when the limit is not a positive integer."""
+    with pytest.raises(ValueError, match="The concurrency limit must be a positive integer, got 0"):
+        await run(iter([]), limit=0).__anext__()
+
+
+async def test_main_live_test_instances(inventory: AntaInventory) -> None:
+    """Test that the tests are instantiated just in time, the number of test instances alive being bounded by the concurrency limit."""
+    live_tests: weakref.WeakSet[AntaTest] = weakref.WeakSet()
+    max_live_tests = 0
+    init = FakeTest.__init__
+
+    def _init(self: FakeTest, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        init(self, *args, **kwargs)
+        live_tests.add(self)
+
+    def _on_result(_: TestResult) -> None:
+        nonlocal max_live_tests
+        max_live_tests = max(max_live_tests, len(live_tests))
+
+    catalog = AntaCatalog.from_list([(FakeTest, {"result_overwrite": {"custom_field": str(i)}}) for i in range(20)])
+    manager = ResultManager()
+    with patch.object(FakeTest, "__init__", _init):
+        await main(manager, inventory, catalog, max_concurrency=2, on_result=_on_result)
+
+    assert len(manager) == 20
+    assert 0 < max_live_tests <= 2
+
+
+@pytest.mark.parametrize("inventory", [{"filename": "test_inventory_with_tags.yml"}], indirect=True)
+async def test_main_max_concurrency(inventory: AntaInventory) -> None:
+    """Test that the results are the same whatever the concurrency limit is."""
+    catalog = AntaCatalog.from_list([(FakeTest, None), (FakeTest, {"result_overwrite": {"description": "overwritten"}})])
+    manager = ResultManager()
+    await main(manager, inventory, catalog)
+    limited_manager = ResultManager()
+    catalog.clear_indexes()
+    await main(limited_manager, inventory, catalog, max_concurrency=1)
+
+    assert len(manager) == 6
+    assert limited_manager.results == manager.results
+
+
+@pytest.mark.parametrize("inventory", [{"count": 3}], indirect=True)
+def test_get_coroutines_round_robin(inventory: AntaInventory) -> None:
+    """Test that get_coroutines interleaves the tests of the different devices."""
+    catalog = AntaCatalog.from_list([(FakeTest, {"result_overwrite": {"custom_field": str(i)}}) for i in range(2)])
+    selected_tests = prepare_tests(inventory=inventory, catalog=catalog, tests=None, tags=None)
+    assert selected_tests is not None
+    manager = ResultManager()
+    for coro in get_coroutines(selected_tests, manager):
+        coro.close()
+
+    assert [result.name for result in manager.results] == ["device-0", "device-1", "device-2"] * 2
+
+
+@pytest.mark.parametrize("inventory", [{"count": 3}], indirect=True)
+def test_prepare_command_plan(inventory: AntaInventory) -> None:
+    """Test that prepare_command_plan counts the total and unique commands of the selected tests."""
+    catalog = AntaCatalog.from_list(
+        [
+            (FakeTestWithTemplate, {"interface": "Ethernet1"}),
+            (FakeTestWithTemplate, {"interface": "Ethernet1", "result_overwrite": {"custom_field": "duplicate"}}),
+            (FakeTestWithTemplate, {"interface": "Ethernet2"}),
+        ]
+    )
+    selected_tests = prepare_tests(inventory=inventory, catalog=catalog, tests=None, tags=None)
+    assert selected_tests is not None
+
+    assert prepare_command_plan(selected_tests) == (9, 6)
+
+
+@pytest.mark.parametrize("inventory", [{"count": 2}], indirect=True)
+async def test_dry_run_command_plan(caplog: pytest.LogCaptureFixture, inventory: AntaInventory) -> None:
+    """Test that the command plan is computed in dry-run mode from the test definitions, without instantiating the tests."""
+    caplog.set_level(logging.INFO)
+    catalog = AntaCatalog.from_list(
+        [
+            (FakeTestWithTemplate, {"interface": "Ethernet1"}),
+            (FakeTestWithTemplate, {"interface": "Ethernet1", "result_overwrite": {"custom_field": "duplicate"}}),
+            (FakeTestWithTemplate, {"interface": "Ethernet2"}),
+        ]
+    )
+    init, render = FakeTestWithTemplate.__init__, FakeTestWithTemplate.render
+    with (
+        patch.object(FakeTestWithTemplate, "__init__", autospec=True, side_effect=init) as mocked_init,
+        patch.object(FakeTestWithTemplate, "render", autospec=True, side_effect=render) as mocked_render,
+    ):
+        await main(ResultManager(), inventory, catalog, dry_run=True)
+    mocked_init.assert_not_called()
+    # The templates are rendered once per test definition
+    assert mocked_render.call_count == 3
+    assert any("Total number of commands: 6 (4 unique commands to collect)\n" in message for message in caplog.messages)
+    # The command plan is not registered on the devices
+    assert all(not device._command_plan for device in inventory.devices)
+
+
+@pytest.mark.parametrize("inventory", [{"count": 2, "disable_cache": True}], indirect=True)
+async def test_main_command_plan(caplog: pytest.LogCaptureFixture, inventory: AntaInventory) -> None:
+    """Test that main collects the commands shared by several tests only once per device, even with caching disabled."""
+    caplog.set_level(logging.INFO)
+    catalog = AntaCatalog.from_list(
+        [
+            (FakeTestWithTemplate, {"interface": "Ethernet1"}),
+            (FakeTestWithTemplate, {"interface": "Ethernet1", "result_overwrite": {"custom_field": "duplicate"}}),
+        ]
+    )
+    manager = ResultManager()
+    with patch("anta.device.AsyncEOSDevice._limited_collect") as collect:
+        await main(manager, inventory, catalog)
+
+    assert collect.call_count == 2
+    assert any("Total number of commands: 4 (2 unique commands to collect)" in message for message in caplog.messages)
+    # The command plan of the devices is removed at the end of the run
+    assert all(not device._command_plan for device in inventory.devices)
+
+
+@pytest.mark.parametrize("inventory", [{"count": 2}], indirect=True)
+async def test_main_recorder(inventory: AntaInventory, tmp_path: Path) -> None:
+    """Test that main records the outputs of the commands collected on the devices."""
+    catalog = AntaCatalog.from_list([(FakeTestWithTemplate, {"interface": "Ethernet1"}), (FakeTestWithTemplate, {"interface": "Ethernet2"})])
+    with (
+        patch("anta.device.AsyncEOSDevice._limited_collect", side_effect=lambda command, **_: setattr(command, "output", {})),
+        Recorder(tmp_path / "recording.jsonl.gz") as recorder,
+    ):
+        await main(ResultManager(), inventory, catalog, recorder=recorder)
+    assert all(device.recorder is recorder for device in inventory.devices)
+    assert recorder.records == 4
+
+
+@pytest.mark.parametrize("inventory", [{"count": 2}], indirect=True)
+async def test_main_recorder_several_runs(inventory: AntaInventory, tmp_path: Path) -> None:
+    """Test that a recorder shared by several runs records the distinct commands of each run."""
+    with (
+        patch("anta.device.AsyncEOSDevice._limited_collect", side_effect=lambda command, **_: setattr(command, "output", {})),
+        Recorder(tmp_path / "recording.jsonl.gz") as recorder,
+    ):
+        await main(ResultManager(), inventory, AntaCatalog.from_list([(FakeTestWithTemplate, {"interface": "Ethernet11"})]), recorder=recorder)
+        await main(ResultManager(), inventory, AntaCatalog.from_list([(FakeTestWithTemplate, {"interface": "Ethernet12"})]), recorder=recorder)
+    assert recorder.records == 4
+
+
+@pytest.mark.parametrize("inventory", [{"count": 2}], indirect=True)
+async def test_main_on_result(inventory: AntaInventory) -> None:
+    """Test that main calls the on_result callback with each completed test result."""
+    catalog = AntaCatalog.from_list([(FakeTest, None)])
+    manager = ResultManager()
+    sync_results: list[TestResult] = []
+    async_results: list[TestResult] = []
+
+    async def _on_result(result: TestResult) -> None:
+        assert result.result == "success"
+        async_results.append(result)
+
+    await main(manager, inventory, catalog, on_result=sync_results.append)
+    assert sorted(result.name for result in sync_results) == ["device-0", "device-1"]
+
+    catalog.clear_indexes()
+    await main(ResultManager(), inventory, catalog, on_result=_on_result)
+    assert len(async_results) == 2
+
+
+async def test_main_on_result_exception(caplog: pytest.LogCaptureFixture, inventory: AntaInventory) -> None:
+    """Test that an exception raised by the on_result callback is logged and does not stop the run."""
+    caplog.set_level(logging.ERROR)
+
+    def _on_result(result: TestResult) -> None:
+        msg = f"Cannot process {result.test}"
+        raise ValueError(msg)
+
+    manager = ResultManager()
+    await main(manager, inventory, FAKE_CATALOG, on_result=_on_result)
+    assert len(manager) == 1
+    assert "Exception raised by the result callback for test FakeTest (on device device-0)" in caplog.text
+
+
+@pytest.mark.parametrize("inventory", [{"count": 2}], indirect=True)
+async def test_main_process_pool(inventory: AntaInventory) -> None:
+    """Test that the results are the same when the test results are evaluated in a process pool."""
+    catalog = AntaCatalog.from_list([(FakeTestWithTemplate, {"interface": "Ethernet1"}), (FakeTestWithTemplate, {"interface": "Ethernet2"})])
+    manager = ResultManager()
+    await main(manager, inventory, catalog)
+    pool_manager = ResultManager()
+    catalog.clear_indexes()
+    await main(pool_manager, inventory, catalog, process_pool_size=2)
+
+    assert AntaTest.executor is None
+    assert len(pool_manager) == 4
+    assert sorted(pool_manager.results, key=lambda r: (r.name, r.messages)) == sorted(manager.results, key=lambda r: (r.name, r.messages))
+
+
+def test_test_executor_invalid_size() -> None:
+    """Test that evaluation_pool raises a ValueError when the process pool size is not a positive integer."""
+    with pytest.raises(ValueError, match="The process pool size must be a positive integer, got 0"), evaluation_pool(0):
+        pass
+
+
+@pytest.mark.parametrize("inventory", [{"count": 3}], indirect=True)
+async def test_main_workers(inventory: AntaInventory) -> None:
+    """Test that the results, their order and the status are the same when the tests are run in worker processes."""
+    catalog = AntaCatalog.from_list([(FakeTest, None), (FakeTestWithTemplate, {"interface": "Ethernet1"}), (FakeTestWithTemplate, {"interface": "Ethernet2"})])
+    manager = ResultManager()
+    await main(manager, inventory, catalog)
+    workers_manager = ResultManager()
+    catalog.clear_indexes()
+    await main(workers_manager, inventory, catalog, workers=2)
+
+    assert len(workers_manager) == 9
+    assert workers_manager.results == manager.results
+    assert workers_manager.status == manager.status == "success"
+    assert workers_manager.device_stats == manager.device_stats
+    assert workers_manager.test_stats == manager.test_stats
+
+
+@pytest.mark.parametrize("inventory", [{"count": 2}], indirect=True)
+async def test_main_workers_on_result(inventory: AntaInventory, tmp_path: Path) -> None:
+    """Test that the results are sent to on_result as soon as a worker reports them, while the other workers are still running."""
+    path = tmp_path / "on_result"
+    catalog = AntaCatalog.from_list(
+        [
+            (FakeTest, {"filters": {"tags": ["device-0"]}}),
+            # Only succeeds if the result of the first worker is received while the second worker is running
+            (FakeTestWaitingForFile, {"path": path, "filters": {"tags": ["device-1"]}}),
+        ]
+    )
+    results: list[TestResult] = []
+
+    def _on_result(result: TestResult) -> None:
+        results.append(result)
+        path.touch()
+
+    manager = ResultManager()
+    await main(manager, inventory, catalog, workers=2, on_result=_on_result)
+
+    assert [(result.name, result.result) for result in results] == [("device-0", "success"), ("device-1", "success")]
+    assert len(manager) == 2
+
+
+@pytest.mark.parametrize(
+    ("workers", "process_pool_size", "record", "expected"),
+    [
+        pytest.param(0, None, False, "The number of workers must be a positive integer, got 0", id="invalid-workers"),
+        pytest.param(2, 2, False, "The tests cannot be run in worker processes when the test results are evaluated in a process pool", id="process-pool"),
+        pytest.param(2, None, True, "The commands collected in worker processes cannot be recorded", id="recorder"),
+    ],
+)
+async def test_main_workers_invalid(inventory: AntaInventory, tmp_path: Path, workers: int, process_pool_size: int | None, record: bool, expected: str) -> None:
+    """Test that main raises a ValueError with an invalid workers configuration."""
+    catalog = AntaCatalog.from_list([(FakeTest, None)])
+    recorder = Recorder(tmp_path / "recording.jsonl.gz") if record else None
+    with pytest.raises(ValueError, match=expected):
+        await main(ResultManager(), inventory, catalog, workers=workers, process_pool_size=process_pool_size, recorder=recorder)
+
+
+def test_log_tls_statistics(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that the TLS statistics are logged only when TLS handshakes have been done."""
+    caplog.set_level(logging.INFO)
+    with patch("anta.runner.shared_ssl_context") as shared_ssl_context:
+        shared_ssl_context.return_value.statistics = TLSStatistics()
+        log_tls_statistics()
+        assert "TLS statistics" not in caplog.text
+        shared_ssl_context.return_value.statistics = TLSStatistics(handshakes=3, resumed=2, handshake_time=0.5)
+        log_tls_statistics()
+    assert "TLS statistics: 3 handshake(s), 2 resumed session(s), 0.500s spent in handshakes" in caplog.text
+
+
+def test_get_preload_commands(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that the preloaded commands are the commands of the selected tests."""
+    catalog = AntaCatalog.from_list(
+        [(VerifyEOSVersion, {"versions": ["4.31.1F"]}), (VerifyMemoryUtilization, None), (FakeTestWithTemplate, {"interface": "Ethernet1"})]
+    )
+    commands = get_preload_commands(catalog, {"show version", "show interface Ethernet1"})
+    assert commands == [VerifyEOSVersion.commands[0]]
+    assert "The following commands are not used by the selected tests and are not preloaded: show interface Ethernet1" in caplog.text
+    assert not get_preload_commands(catalog, {"show version"}, tests={"FakeTestWithTemplate"})
@@ -0,0 +1,70 @@
+# Copyright (c) 2023-2024 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""test anta.snapshot.py."""
+
+from __future__ import annotations
+
+import json
+import pickle
+import shutil
+from pathlib import Path
+
+import pytest
+
+from anta.models import AntaCommand
+from anta.recorder import Recorder
+from anta.snapshot import Snapshot
+
+SHOW_VERSION = {"modelName": "DCS-7280CR3-32P4-F", "version": "4.31.1F"}
+
+
+@pytest.fixture(name="snapshot_dir")
+def snapshot_dir_fixture(tmp_path: Path) -> Path:
+    """Return a directory written like `anta exec snapshot` does."""
+    root = tmp_path / "anta_snapshot"
+    (root / "leaf1" / "json").mkdir(parents=True)
+    (root / "leaf1" / "text").mkdir(parents=True)
+    (root / "leaf1" / "json" / "show_version.json").write_text(json.dumps(SHOW_VERSION), encoding="UTF-8")
+    (root / "leaf1" / "text" / "show_ip_route_vrf_MGMT_0.0.0.0_0.log").write_text("Gateway of last resort", encoding="UTF-8")
+    (root / "README").write_text("not an output", encoding="UTF-8")
+    return root
+
+
+@pytest.mark.parametrize("archive_format", [None, "zip", "gztar"])
+def test_read(snapshot_dir: Path, tmp_path: Path, archive_format: str | None) -> None:
+    """Test that the command outputs are read from the snapshot directory or from an archive of this directory."""
+    path = Path(shutil.make_archive(str(tmp_path / "archive"), archive_format, tmp_path, "anta_snapshot")) if archive_format is not None else snapshot_dir
+    snapshot = Snapshot(path)
+    assert snapshot.devices == {"leaf1"}
+    assert snapshot.read("leaf1", "show version", "json") == json.dumps(SHOW_VERSION)
+    assert snapshot.read("leaf1", "show ip route vrf MGMT 0.0.0.0/0", "text") == "Gateway of last resort"
+    assert snapshot.read("leaf1", "show version", "text") is None
+    assert snapshot.read("leaf2", "show version", "json") is None
+    # The snapshot can be sent to other processes
+    assert pickle.loads(pickle.dumps(snapshot)).read("leaf1", "show version", "json") == json.dumps(SHOW_VERSION)  # noqa: S301
+    # The snapshot can be read again once closed
+    with snapshot:
+        assert snapshot.read("leaf1", "show version", "json") == json.dumps(SHOW_VERSION)
+    assert snapshot._zip is None
+    assert snapshot.read("leaf1", "show version", "json") == json.dumps(SHOW_VERSION)
+    snapshot.close()
+
+
+def test_invalid(snapshot_dir: Path) -> None:
+    """Test that a file which is not an archive is rejected."""
+    with pytest.raises(ValueError, match="README is not a snapshot directory, a ZIP or tar archive of a snapshot directory or a recording"):
+        Snapshot(snapshot_dir / "README")
+
+
+def test_read_recording(tmp_path: Path) -> None:
+    """Test that the command outputs are read from a recording, the last recorded output of a command is kept."""
+    path = tmp_path / "recording.jsonl.gz"
+    for output in ({"version": "4.30.1F"}, SHOW_VERSION):
+        with Recorder(path) as recorder:
+            recorder.record("leaf1", AntaCommand(command="show version", output=output))
+            recorder.record("leaf1", AntaCommand(command="show ip route vrf MGMT 0.0.0.0/0", ofmt="text", output="Gateway of last resort"))
+    snapshot = Snapshot(path)
+    assert snapshot.devices == {"leaf1"}
+    assert json.loads(snapshot.read("leaf1", "show version", "json") or "") == SHOW_VERSION
+    assert snapshot.read("leaf1", "show ip route vrf MGMT 0.0.0.0/0", "text") == "Gateway of last resort"